@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2014 Carlos Jenkins <carlos@jenkins.co.cr>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Speed and memory benchmark of array-backed numeric lists against generic
+lists. NumPy arrays are included if NumPy is installed.
+
+Usage::
+
+   PYTHONPATH=lib python benchmarks/bench_arrays.py [num_elements]
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import sys
+
+from confspec.options import (
+    ConfigListInt, ConfigListFloat, ConfigArrayInt, ConfigArrayFloat,
+    ConfigNDArrayInt, ConfigNDArrayFloat
+)
+from confspec.validation import all_validate_to, in_range
+
+from bench_providers import timed
+from bench_memory import allocated
+
+
+def main(num_elements=100000):
+    ints = '[{}]'.format(', '.join(str(i) for i in range(num_elements)))
+    floats = '[{}]'.format(', '.join(str(i / 7) for i in range(num_elements)))
+    validator = all_validate_to(in_range(0, num_elements))
+
+    benchmarks = [
+        (ConfigListInt, ints),
+        (ConfigArrayInt, ints),
+        (ConfigListFloat, floats),
+        (ConfigArrayFloat, floats),
+    ]
+    try:
+        import numpy  # noqa
+        benchmarks.extend([
+            (ConfigNDArrayInt, ints),
+            (ConfigNDArrayFloat, floats),
+        ])
+    except ImportError:
+        pass
+
+    print('{} elements'.format(num_elements))
+    print('{:<20} {:>12} {:>12} {:>14} {:>12}'.format(
+        'option', 'parse (ms)', 'repr (ms)', 'validate (ms)', 'size (KiB)'
+    ))
+    for factory, value in benchmarks:
+        kwargs = {'base': 10} if value is ints else {}
+        opt = factory(key='key', default=[], **kwargs)
+
+        def parse():
+            opt.value = value
+
+        def represent():
+            repr(opt)
+
+        parse_time = timed(parse)
+        parsed, size = allocated(lambda: opt.parse(value))
+
+        print('{:<20} {:>12.2f} {:>12.2f} {:>14.2f} {:>12.1f}'.format(
+            factory.__name__, parse_time * 1000, timed(represent) * 1000,
+            timed(lambda: validator(parsed)) * 1000, size / 1024
+        ))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
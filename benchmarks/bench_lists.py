@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2014 Carlos Jenkins <carlos@jenkins.co.cr>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Speed benchmark of the parsing of large lists.
+
+Usage::
+
+   PYTHONPATH=lib python benchmarks/bench_lists.py [num_elements]
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import sys
+
+from confspec.options import ConfigListInt, ConfigListString, _split_elements
+
+from bench_providers import timed
+
+
+def main(num_elements=100000):
+    ints = '[{}]'.format(', '.join(str(i) for i in range(num_elements)))
+    strings = repr(['host-{}.example.com'.format(i)
+                    for i in range(num_elements)])
+    quoted = repr(['shard {}, [{}]'.format(i, i % 16)
+                   for i in range(num_elements)])
+
+    print('{} elements'.format(num_elements))
+    print('{:<24} {:>14} {:>14}'.format('list', 'split (ms)', 'parse (ms)'))
+    for name, factory, value in [
+            ('ints', ConfigListInt, ints),
+            ('strings', ConfigListString, strings),
+            ('quoted with commas', ConfigListString, quoted)]:
+        opt = factory(key='key', default=[])
+        inner = value[1:-1]
+
+        def split():
+            for _ in _split_elements(inner):
+                pass
+
+        def parse():
+            opt.value = value
+
+        print('{:<24} {:>14.2f} {:>14.2f}'.format(
+            name, timed(split) * 1000, timed(parse) * 1000
+        ))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2014 Carlos Jenkins <carlos@jenkins.co.cr>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Memory benchmark of specifications and configuration managers.
+
+Usage::
+
+   PYTHONPATH=lib python benchmarks/bench_memory.py [num_options]
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import sys
+import tracemalloc
+
+from confspec.manager import ConfigMg
+
+from bench_providers import make_spec
+
+
+def allocated(func):
+    """
+    Return the object returned by the given function and the memory allocated
+    by it that is still in use.
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = func()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return result, after - before
+
+
+def main(num_options=20000):
+    spec, spec_size = allocated(lambda: make_spec(num_options))
+    cfmg, cfmg_size = allocated(lambda: ConfigMg(spec))
+
+    print('{} options'.format(num_options))
+    print('{:<16} {:>12} {:>16}'.format(
+        'object', 'size (KiB)', 'per option (B)'
+    ))
+    for name, size in [('spec', spec_size), ('manager', cfmg_size)]:
+        print('{:<16} {:>12.1f} {:>16.1f}'.format(
+            name, size / 1024, size / num_options
+        ))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2014 Carlos Jenkins <carlos@jenkins.co.cr>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Speed benchmark of the fast parsing paths of strings, dates and times,
+compared to the general path, on bulk imports of large lists.
+
+Usage::
+
+   PYTHONPATH=lib python benchmarks/bench_parsing.py [num_elements]
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import sys
+import ast
+from datetime import datetime, timedelta
+
+from confspec.options import ConfigList, ConfigString
+from confspec.options import (
+    ConfigListString, ConfigListDateTime, ConfigListDate, ConfigListTime
+)
+
+from bench_providers import timed
+
+
+class GeneralString(ConfigString):
+    """
+    String always unquoted using the general path.
+    """
+    __slots__ = ()
+
+    def parse(self, value):
+        return str(ast.literal_eval(value))
+
+
+class GeneralListString(ConfigList, GeneralString):
+    """
+    List of :class:`GeneralString`.
+    """
+    __slots__ = ('_strict', '_external', '_basedir')
+
+
+def general(cls):
+    """
+    Return a subclass of the given date and time list option that always
+    parses using strptime.
+    """
+    return type('General' + cls.__name__, (cls, ), {
+        '__slots__': (), '_parse_iso': lambda self, value: None,
+    })
+
+
+def main(num_elements=100000):
+    start = datetime(2000, 1, 1)
+    stamps = [start + timedelta(minutes=7 * i) for i in range(num_elements)]
+    strings = repr(['host-{}.example.com'.format(i)
+                    for i in range(num_elements)])
+
+    def dates(tformat):
+        return '[{}]'.format(
+            ', '.join(stamp.strftime(tformat) for stamp in stamps)
+        )
+
+    print('{} elements'.format(num_elements))
+    print('{:<12} {:>14} {:>14} {:>10}'.format(
+        'list', 'general (ms)', 'fast (ms)', 'speedup'
+    ))
+    for name, factory, general_factory, value in [
+            ('strings', ConfigListString, GeneralListString, strings),
+            ('datetimes', ConfigListDateTime, general(ConfigListDateTime),
+             dates('%Y-%m-%dT%H:%M:%S')),
+            ('dates', ConfigListDate, general(ConfigListDate),
+             dates('%Y-%m-%d')),
+            ('times', ConfigListTime, general(ConfigListTime),
+             dates('%H:%M:%S'))]:
+        fast = factory(key='key', default=[])
+        slow = general_factory(key='key', default=[])
+
+        def parse_fast():
+            fast.value = value
+
+        def parse_general():
+            slow.value = value
+
+        parse_general()
+        parse_fast()
+        assert fast.value == slow.value
+
+        general_time = timed(parse_general)
+        fast_time = timed(parse_fast)
+        print('{:<12} {:>14.2f} {:>14.2f} {:>9.1f}x'.format(
+            name, general_time * 1000, fast_time * 1000,
+            general_time / fast_time
+        ))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2014 Carlos Jenkins <carlos@jenkins.co.cr>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Size and speed benchmark of the format providers.
+
+Usage::
+
+   PYTHONPATH=lib python benchmarks/bench_providers.py [num_options]
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import sys
+from timeit import default_timer
+
+from confspec.manager import ConfigMg
+from confspec.options import (
+    ConfigInt, ConfigFloat, ConfigBoolean, ConfigString, ConfigDateTime,
+    ConfigListInt
+)
+
+
+def make_spec(num_options, **kwargs):
+    """
+    Create a synthetic specification with the given number of options,
+    created with the given extra arguments.
+    """
+    factories = [
+        (ConfigInt, 123456),
+        (ConfigFloat, 3.1415),
+        (ConfigBoolean, True),
+        (ConfigString, '"Some value"'),
+        (ConfigDateTime, '2014-09-30T17:40:20'),
+        (ConfigListInt, list(range(10))),
+    ]
+    spec = []
+    for i in range(num_options):
+        cls, default = factories[i % len(factories)]
+        spec.append(cls(
+            key='opt{}'.format(i), default=default,
+            category='cat{}'.format(i // 100), **kwargs
+        ))
+    return spec
+
+
+def timed(func, repeat=5):
+    """
+    Return the best time of calling the given function.
+    """
+    best = None
+    for _ in range(repeat):
+        start = default_timer()
+        func()
+        elapsed = default_timer() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(num_options=10000):
+    cfmg = ConfigMg(make_spec(num_options))
+
+    print('{} options'.format(num_options))
+    print('{:<8} {:>12} {:>12} {:>12}'.format(
+        'format', 'size (B)', 'export (ms)', 'import (ms)'
+    ))
+    for fmt in ['ini', 'json', 'dict', 'binary']:
+        encoded = cfmg.do_export(format=fmt)
+        export_time = timed(lambda: cfmg.do_export(format=fmt))
+        import_time = timed(lambda: cfmg.do_import(encoded, format=fmt))
+        print('{:<8} {:>12} {:>12.1f} {:>12.1f}'.format(
+            fmt, len(encoded), export_time * 1000, import_time * 1000
+        ))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
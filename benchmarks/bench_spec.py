@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2014 Carlos Jenkins <carlos@jenkins.co.cr>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Speed benchmark of the creation of specifications.
+
+Usage::
+
+   PYTHONPATH=lib python benchmarks/bench_spec.py [num_options]
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import sys
+
+from confspec.manager import ConfigMg
+
+from bench_providers import make_spec, timed
+
+
+def main(num_options=20000):
+    print('{} options'.format(num_options))
+    print('{:<32} {:>12}'.format('construction', 'time (ms)'))
+
+    for deferred in [False, True]:
+        mode = 'deferred' if deferred else 'eager'
+
+        def create_spec():
+            return make_spec(num_options, defer_default=deferred)
+
+        def create_manager():
+            ConfigMg(create_spec())
+
+        def validate_manager():
+            ConfigMg(create_spec()).validate_all()
+
+        for name, func in [
+                ('spec', create_spec),
+                ('spec + manager', create_manager),
+                ('spec + validate_all', validate_manager)]:
+            print('{:<32} {:>12.2f}'.format(
+                '{} ({})'.format(name, mode), timed(func) * 1000
+            ))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -17,6 +17,168 @@
 
 from __future__ import absolute_import, division, print_function
 
-from .manager import ConfigMg  # noqa
-from .validation import *  # noqa
-from .options import *  # noqa
+import sys
+from importlib import import_module
+
+
+# Public names of the package and the submodule that defines them. Submodules
+# are imported on first access to any of their names (PEP 562).
+_lazy_attributes = dict(
+    [(name, 'manager') for name in [
+        'ConfigMg',
+    ]] +
+    [(name, 'validation') for name in [
+        'Validator',
+        'Bounds',
+        'Modulo',
+        'Length',
+        'OneOf',
+        'SubsetOf',
+        'SupersetOf',
+        'DisjointFrom',
+        'HasKeys',
+        'AllValidateTo',
+        'AllValuesValidateTo',
+        'HasSubstring',
+        'StartsWith',
+        'EndsWith',
+        'compile_validators',
+        'positive',
+        'negative',
+        'greater_than',
+        'greater_than_eq',
+        'lower_than',
+        'lower_than_eq',
+        'in_range',
+        'multiple_of',
+        'is_even',
+        'is_odd',
+        'is_one_of',
+        'is_subset_of',
+        'is_superset_of',
+        'is_disjoint_from',
+        'has_keys',
+        'all_validate_to',
+        'all_values_validate_to',
+        'empty',
+        'non_empty',
+        'has_substring',
+        'has_substring_igncase',
+        'startswith',
+        'startswith_igncase',
+        'endswith',
+        'endswith_igncase',
+    ]] +
+    [(name, 'spec') for name in [
+        'Spec',
+        'get_manager',
+    ]] +
+    [(name, 'options') for name in [
+        'ConfigOpt',
+        'ConfigString',
+        'ConfigText',
+        'ConfigLine',
+        'ConfigInt',
+        'ConfigDecimal',
+        'ConfigOctal',
+        'ConfigHexadecimal',
+        'ConfigBoolean',
+        'ConfigFloat',
+        'ConfigDateTime',
+        'ConfigDate',
+        'ConfigTime',
+        'ConfigMap',
+        'ConfigClass',
+        'ConfigPath',
+        'ConfigFile',
+        'ConfigDir',
+        'ConfigColor',
+        'ConfigFont',
+        'ConfigList',
+        'ConfigListString',
+        'ConfigListText',
+        'ConfigListLine',
+        'ConfigListInt',
+        'ConfigListDecimal',
+        'ConfigListOctal',
+        'ConfigListHexadecimal',
+        'ConfigListBoolean',
+        'ConfigListFloat',
+        'ConfigListDateTime',
+        'ConfigListDate',
+        'ConfigListTime',
+        'ConfigListMap',
+        'ConfigListClass',
+        'ConfigListPath',
+        'ConfigListFile',
+        'ConfigListDir',
+        'ConfigListColor',
+        'ConfigListFont',
+        'ConfigSet',
+        'ConfigSetString',
+        'ConfigSetText',
+        'ConfigSetLine',
+        'ConfigSetInt',
+        'ConfigSetDecimal',
+        'ConfigSetOctal',
+        'ConfigSetHexadecimal',
+        'ConfigSetFloat',
+        'ConfigSetDateTime',
+        'ConfigSetDate',
+        'ConfigSetTime',
+        'ConfigSetPath',
+        'ConfigSetFile',
+        'ConfigSetDir',
+        'ConfigSetColor',
+        'ConfigDict',
+        'ConfigDictString',
+        'ConfigDictText',
+        'ConfigDictLine',
+        'ConfigDictInt',
+        'ConfigDictDecimal',
+        'ConfigDictOctal',
+        'ConfigDictHexadecimal',
+        'ConfigDictBoolean',
+        'ConfigDictFloat',
+        'ConfigDictDateTime',
+        'ConfigDictDate',
+        'ConfigDictTime',
+        'ConfigDictPath',
+        'ConfigDictFile',
+        'ConfigDictDir',
+        'ConfigDictColor',
+        'ConfigArray',
+        'ConfigArrayInt',
+        'ConfigArrayFloat',
+        'ConfigNDArray',
+        'ConfigNDArrayInt',
+        'ConfigNDArrayFloat',
+        'ConfigNDArrayColor',
+        'ConfigNDArrayFile',
+    ]]
+)
+
+__all__ = sorted(_lazy_attributes)
+
+
+def __getattr__(name):
+    if name in _lazy_attributes:
+        module = import_module('.' + _lazy_attributes[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(
+        'module {!r} has no attribute {!r}'.format(__name__, name)
+    )
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_attributes))
+
+
+# Module __getattr__ requires Python 3.7 (PEP 562)
+if sys.version_info < (3, 7):
+    from .manager import ConfigMg  # noqa
+    from .validation import *  # noqa
+    from .options import *  # noqa
+    from .spec import *  # noqa
@@ -24,24 +24,43 @@ from __future__ import absolute_import, division, print_function
 import logging as log
 from traceback import format_exc
 from os import makedirs
-from os.path import isfile, exists, expanduser, abspath, dirname
+from mmap import mmap as memory_map, ACCESS_READ
+from os.path import isfile, exists, expanduser, abspath, dirname, splitext
+from os.path import getsize
 
-from .providers import providers
+from .providers import providers, FormatProvider
+from .utils import compressions, detect_compression, open_file
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
 
 
 __all__ = ['ConfigMg']
 
 
+# Bytes-like objects imported using FormatProvider.do_import_buffer()
+_buffers = (bytes, bytearray, memoryview, memory_map)
+
+
 class ConfigMg(object):
     """
     Configuration manager object.
 
+    Configuration managers can be pickled with the specification and its
+    current state, for example to send them to worker processes or to cache
+    them, as long as the validators, cleaners and other arguments of the
+    options can be pickled. Listeners are not pickled.
+
     :param spec: List of instances of subclasses of
      :class:`confspec.options.ConfigOpt`.
 
     :param files: A list of paths to configuration files. Files are read in the
      given order. The last file is considered the user file. Example:
-     ``['/etc/myapp.conf', '~/.myapp/myapp.conf']``
+     ``['/etc/myapp.conf', '~/.myapp/myapp.conf']``. Files can be compressed
+     using any of the formats in :data:`confspec.utils.compressions`, see
+     :meth:`file_compression`.
 
     :param format: The format to export to and import from. Supported formats
      are given by :attr:`ConfigMg.supported_formats`.
@@ -74,6 +93,44 @@ class ConfigMg(object):
      parse error) or when notifying a listener about a option change, among
      others. This feature can be enabled or disabled at any time using
      :meth:`enable_safe`.
+
+    :param bool stream: Import the files in the file stack incrementally from
+     the open file instead of reading them into memory first. Only format
+     providers that implement
+     :meth:`confspec.providers.FormatProvider.do_import_stream` take advantage
+     of this, others read the whole file anyway.
+
+    :param bool autodetect: Detect the format of each file in the file stack
+     instead of using ``format`` for all of them. ``format`` is then used only
+     for files whose format cannot be detected, and as the default format of
+     :meth:`do_import` and :meth:`do_export`. See :meth:`file_format`.
+
+    :param bool mmap: Import the uncompressed files in the file stack from a
+     read-only memory map of the file instead of reading and decoding them
+     into a string first (files are then assumed to be UTF-8 encoded). Format
+     providers that implement
+     :meth:`confspec.providers.FormatProvider.do_import_buffer` scan the
+     memory map in place, others copy it anyway. Takes precedence over
+     ``stream``.
+
+    :param categories: Handle only the given categories of the specification.
+     Format providers skip the other categories when importing, without
+     parsing or validating their options, and only the given categories are
+     exported, and getting or setting their keys raises
+     :py:exc:`KeyError`. As saving would drop the other categories from the
+     user file, a configuration manager handling only part of the
+     specification doesn't create files nor write them back, and
+     :meth:`save` fails. See also :meth:`load`.
+    :type categories: list or None
+
+    :param bool lazy: Enable lazy mode. In lazy mode :meth:`do_import` only
+     checks the category and key of each value found, and stores its string
+     representation in the option (see :meth:`ConfigOpt.defer
+     <confspec.options.ConfigOpt.defer>`). The value is parsed and validated
+     on first access, so a configuration that fails to validate is reported
+     by :meth:`get` instead of when loading. Values of keys with listeners are
+     parsed right away when notification is enabled. Use
+     :meth:`validate_all` to parse and validate all pending values at once.
     """
 
     supported_formats = providers.keys()
@@ -81,16 +138,25 @@ class ConfigMg(object):
     Supported format to export configuration held by the configuration manager.
     """
 
+    _sniff_size = 512
+
     def __init__(
             self, spec,
             files=tuple(), format='ini', create=True, load=True,
-            notify=False, writeback=True, safe=True, **kwargs):
+            notify=False, writeback=True, safe=True, stream=False,
+            autodetect=False, mmap=False, categories=None, lazy=False,
+            **kwargs):
 
         # Save kwargs
         self._kwargs = kwargs
 
-        # Register spec and check uniqueness
+        # Register spec and check keys
         self._spec = spec
+        for option in spec:
+            if option.key is None:
+                raise AttributeError(
+                    'Option {} has no key.'.format(type(option).__name__)
+                )
         self._keys = {s.key: s for s in spec}
         if len(self._keys) != len(spec):
             raise AttributeError('Keys are not unique.')
@@ -110,18 +176,46 @@ class ConfigMg(object):
         self._notify = notify
         self._writeback = writeback
         self._safe = safe
-
-        # Create map of listeners
+        self._stream = stream
+        self._autodetect = autodetect
+        self._mmap = mmap
+        self._lazy = lazy
+        self._deferring = False
+        self._importing = None
+        self._foreign = set()
+        self._file_formats = {}
+        self._file_compressions = {}
+
+        # Create maps of listeners
         self._listeners = {}
+        self._delta_listeners = {}
 
         # Create categories map
+        spec_categories = frozenset(s.category for s in self._spec)
+        if categories is None:
+            categories = spec_categories
+        categories = frozenset(categories)
+        unknown = categories - spec_categories
+        if unknown:
+            raise AttributeError(
+                'Unknown categories {}.'.format(sorted(unknown))
+            )
+
         self._categories = {}
         for s in self._spec:
+            if s.category not in categories:
+                continue
             if s.category in self._categories:
                 self._categories[s.category].append(s)
             else:
                 self._categories[s.category] = [s]
 
+        # Categories of the specification skipped when importing
+        self._skipped = spec_categories - categories
+        self._partial = bool(self._skipped)
+        if self._partial:
+            self._writeback = False
+
         # Create proxy
         self._proxy = ConfigProxy(self)
 
@@ -141,7 +235,7 @@ class ConfigMg(object):
         Enable automatic writeback to file when current configuration changes.
         See :class:`ConfigMg`.
         """
-        self._writeback = enable
+        self._writeback = enable and not self._partial
 
     def enable_safe(self, enable):
         """
@@ -149,7 +243,7 @@ class ConfigMg(object):
         """
         self._safe = enable
 
-    def register_listener(self, func, key):
+    def register_listener(self, func, key, delta=False):
         """
         Register a listener for given key.
 
@@ -158,29 +252,46 @@ class ConfigMg(object):
         ::
 
            listener(key, old_value, value)
+
+        Delta listeners are given the elements added to and removed from a
+        list option instead, with the following signature:
+
+        ::
+
+           listener(key, added, removed)
+
+        When the value is set as a whole, as with :meth:`set`, ``added`` is
+        the new value and ``removed`` the old one. See :meth:`extend` and
+        :meth:`remove`.
+
+        :param bool delta: Register a delta listener.
         """
         if func is None or \
                 not hasattr(func, '__call__') or \
                 key not in self._keys:
             return False
 
-        if key not in self._listeners:
-            self._listeners[key] = []
+        registry = self._delta_listeners if delta else self._listeners
+        if key not in registry:
+            registry[key] = []
 
-        listeners = self._listeners[key]
+        listeners = registry[key]
         if func not in listeners:
             listeners.append(func)
             return True
         return False
 
-    def unregister_listener(self, func, key):
+    def unregister_listener(self, func, key, delta=False):
         """
         Unregister a listener previously registered for the given key.
+
+        :param bool delta: Unregister a delta listener.
         """
-        if key not in self._listeners:
+        registry = self._delta_listeners if delta else self._listeners
+        if key not in registry:
             return False
 
-        listeners = self._listeners[key]
+        listeners = registry[key]
         if func in listeners:
             del listeners[listeners.index(func)]
             return True
@@ -193,20 +304,53 @@ class ConfigMg(object):
         """
         if len(self._files) > 0:
             try:
-                with open(self._files[-1], 'w') as f:
-                    f.write(self.do_export(format=self._format))
+                if self._partial:
+                    raise Exception(
+                        'Cannot save a partial configuration, categories '
+                        '{} are not handled.'.format(sorted(self._skipped))
+                    )
+                self._detach_foreign()
+                for option in self._keys.values():
+                    option.flush()
+                fn = self._files[-1]
+                format = self.file_format(fn)
+                with self._open(fn, self._mode('w', format)) as f:
+                    f.write(self.do_export(format=format))
             except Exception as e:
                 if not self._safe:
                     raise e
                 else:
                     log.error(format_exc())
 
-    def load(self):
+    def load(self, categories=None):
         """
         Import all files in the file stack.
+
+        :param categories: Import only the given categories, skipping the
+         others as described in :class:`ConfigMg`. If ``None`` (the default)
+         all the categories handled by the configuration manager are
+         imported.
+        :type categories: list or None
+        """
+        skipped = self._skipped
+        if categories is not None:
+            self._skipped = skipped.union(
+                frozenset(self._categories) - frozenset(categories)
+            )
+
+        try:
+            self._load()
+        finally:
+            self._skipped = skipped
+
+    def _load(self):
+        """
+        Import all files in the file stack, see :meth:`load`.
         """
         for fn in self._files:
             try:
+                format = self.file_format(fn)
+
                 # Ignore non-regular files
                 if exists(fn) and not isfile(fn):
                     raise Exception(
@@ -215,29 +359,173 @@ class ConfigMg(object):
 
                 # Create file if requested and file doesn't exists
                 if not exists(fn) and self._create:
+                    if self._partial:
+                        continue
                     directory = dirname(fn)
                     if not exists(directory):
                         makedirs(directory)
-                    with open(fn, 'w') as f:
-                        f.write(self.do_export())
+                    if fn == self._files[-1]:
+                        self._detach_foreign()
+                    with self._open(fn, self._mode('w', format)) as f:
+                        f.write(self.do_export(format=format))
+                    continue
+
+                self._importing = fn
+
+                # Import memory-mapped file
+                if self._mmap and self.file_compression(fn) is None \
+                        and getsize(fn) > 0:
+                    self._import_mmap(fn, format)
                     continue
 
                 # Import file (if exists, if not, fail - raise)
-                with open(fn, 'r') as f:
-                    self.do_import(f.read())
+                with self._open(fn, self._mode('r', format)) as f:
+                    if self._stream:
+                        self.do_import(f, format=format)
+                    else:
+                        self.do_import(f.read(), format=format)
 
             except Exception as e:
                 if not self._safe:
                     raise e
                 else:
                     log.error(format_exc())
+            finally:
+                self._importing = None
+
+    def _track_reference(self, key):
+        """
+        Record whether the value of the given key references a side file
+        from a file of the file stack other than the user file, the last one.
+        Those side files are never written, see :meth:`_detach_foreign`.
+        """
+        importing = self._importing
+        if importing is not None and importing != self._files[-1] and \
+                getattr(self._keys[key], '_referenced', None) is not None:
+            self._foreign.add(key)
+        else:
+            self._foreign.discard(key)
+
+    def _detach_foreign(self):
+        """
+        Detach the lists read from side files referenced by files of the file
+        stack other than the user file, so they are written in place to the
+        user file instead of rewriting side files that belong to other files.
+        See :meth:`ConfigList.detach <confspec.options.ConfigList.detach>`.
+        """
+        while self._foreign:
+            self._keys[self._foreign.pop()].detach()
+
+    def file_format(self, fn):
+        """
+        Return the format of the given file.
+
+        If ``autodetect`` is disabled this is always the format specified in
+        the constructor. If enabled, the format is detected from the file name
+        extension (see :attr:`FormatProvider.extensions
+        <confspec.providers.FormatProvider.extensions>`) or, if unknown, by
+        sniffing the first bytes of the file (see :meth:`FormatProvider.sniff
+        <confspec.providers.FormatProvider.sniff>`). If the format cannot be
+        detected, the format specified in the constructor is used. The result
+        is cached per file.
+
+        :param str fn: Path to the file.
+        :rtype: The name of the format.
+        """
+        if not self._autodetect:
+            return self._format
+
+        if fn not in self._file_formats:
+            self._file_formats[fn] = self._detect_format(fn)
+        return self._file_formats[fn]
+
+    def _detect_format(self, fn):
+        """
+        Detect the format of the given file, see :meth:`file_format`.
+        """
+        # Detect by extension, ignoring the compression extension
+        root, extension = splitext(fn)
+        extension = extension.lower()
+        compression = self.file_compression(fn)
+        if compression is not None and \
+                extension in compressions[compression][0]:
+            extension = splitext(root)[1].lower()
+        if extension:
+            for name, provider in sorted(providers.items()):
+                if extension in provider.extensions:
+                    return name
+
+        # Detect by content
+        if isfile(fn):
+            with self._open(fn, 'rb') as f:
+                head = f.read(self._sniff_size)
+            for name, provider in sorted(providers.items()):
+                if provider.sniff(head):
+                    return name
+
+        return self._format
+
+    def file_compression(self, fn):
+        """
+        Return the compression format of the given file.
+
+        The compression is detected from the file name extension or, if the
+        file exists, from its magic bytes. See
+        :func:`confspec.utils.detect_compression`. The result is cached per
+        file.
+
+        :param str fn: Path to the file.
+        :rtype: The name of the compression format, or ``None`` if the file is
+         not compressed.
+        """
+        if fn not in self._file_compressions:
+            self._file_compressions[fn] = detect_compression(fn)
+        return self._file_compressions[fn]
+
+    def _open(self, fn, mode):
+        """
+        Open a file of the file stack, compressing or decompressing it if
+        required.
+        """
+        return open_file(fn, mode, self.file_compression(fn))
+
+    def _mode(self, mode, format=None):
+        """
+        Return the mode to open a file with for the given format.
+        """
+        if format is None:
+            format = self._format
+
+        if providers[format].binary:
+            return mode + 'b'
+        return mode
+
+    def _import_mmap(self, fn, format):
+        """
+        Import a file from a read-only memory map of it.
+        """
+        with open(fn, 'rb') as f:
+            buf = memory_map(f.fileno(), 0, access=ACCESS_READ)
+        try:
+            self.do_import(buf, format=format)
+        finally:
+            try:
+                buf.close()
+            except BufferError:
+                # A view of the map is still referenced (by a traceback, for
+                # example). It will be unmapped when garbage collected.
+                pass
 
     def do_import(self, conf, format=None):
         """
         Import and validate a configuration written in a standard format.
 
-        :param str conf: A string with a configuration encoded in the specified
-         format.
+        :param conf: A string with a configuration encoded in the specified
+         format, a file-like object to import it from using
+         :meth:`confspec.providers.FormatProvider.do_import_stream` or a
+         bytes-like object to import it from using
+         :meth:`confspec.providers.FormatProvider.do_import_buffer`.
+        :type conf: str, file or bytes
         :param format: See :attr:`ConfigMg.supported_formats`.
          If ``None`` (the default) the format specified in the constructor is
          used.
@@ -249,10 +537,52 @@ class ConfigMg(object):
         # Disable write back
         writeback = self._writeback
         self._writeback = False
+        self._deferring = self._lazy
 
         # Try to import
         try:
-            providers[format].do_import(self, conf)
+            if isinstance(conf, _buffers):
+                providers[format].do_import_buffer(self, conf)
+            elif hasattr(conf, 'read'):
+                providers[format].do_import_stream(self, conf)
+            else:
+                providers[format].do_import(self, conf)
+        finally:
+            # Restore writeback setting
+            self._writeback = writeback
+            self._deferring = False
+
+    def import_mapping(self, mapping):
+        """
+        Import and validate a configuration held in a native Python mapping.
+
+        The mapping must have the same structure the ``dict`` format provider
+        uses, that is, a mapping of categories to mappings of keys to values.
+        Unlike :meth:`do_import`, values are native Python objects and are set
+        without a string round trip using :meth:`ConfigOpt.coerce
+        <confspec.options.ConfigOpt.coerce>`:
+
+        .. code:: python
+
+           confmg.import_mapping({'net': {'port': 8080, 'host': 'localhost'}})
+
+        :param mapping: A mapping of categories to mappings of keys to values.
+        :type mapping: dict
+        """
+        if not isinstance(mapping, Mapping):
+            msg = 'Cannot import <{}> as mapping.'.format(type(mapping))
+            if not self._safe:
+                raise TypeError(msg)
+            log.error(msg)
+            return
+
+        # Disable write back
+        writeback = self._writeback
+        self._writeback = False
+
+        # Try to import
+        try:
+            FormatProvider._import_categories(self, mapping, native=True)
         finally:
             # Restore writeback setting
             self._writeback = writeback
@@ -266,45 +596,247 @@ class ConfigMg(object):
          used.
         :type format: str or None
         :rtype: A string with the configuration encoded in the specified
-         format.
+         format (``bytes`` for binary formats).
         """
         if format is None:
             format = self._format
 
         return providers[format].do_export(self)
 
+    def _option(self, key):
+        """
+        Return the option of the given key, failing for keys of the categories
+        not handled by this configuration manager.
+        """
+        option = self._keys[key]
+        if self._partial and option.category not in self._categories:
+            raise KeyError(
+                'Key "{}" belongs to category "{}", not handled by this '
+                'configuration manager.'.format(key, option.category)
+            )
+        return option
+
     def get(self, key):
         """
         Get the value of a config key.
+
+        In lazy mode, a value pending to be parsed and validated that fails to
+        do so raises an exception, or, in safe mode, is logged and the previous
+        value is returned.
+        """
+        option = self._option(key)
+        try:
+            return option.value
+        except Exception as e:
+            if not self._safe:
+                raise e
+            log.error(format_exc())
+        return option.value
+
+    def validate_all(self):
+        """
+        Parse and validate all values pending to be parsed and validated in
+        lazy mode. See :class:`ConfigMg`.
+
+        :rtype: ``True`` if all values are valid, ``False`` otherwise (in safe
+         mode, as otherwise the first error is raised).
+        """
+        valid = True
+        for option in self._spec:
+            try:
+                option._resolve()
+            except Exception as e:
+                if not self._safe:
+                    raise e
+                log.error(format_exc())
+                valid = False
+        return valid
+
+    def reload(self):
+        """
+        Read again the parts of the values stored outside of the configuration
+        files that changed since they were read, as the files mapped by
+        :class:`ConfigNDArrayFile <confspec.options.ConfigNDArrayFile>`. See
+        :meth:`ConfigOpt.reload <confspec.options.ConfigOpt.reload>`.
+        Listeners of the options whose value changed are notified, without
+        writing back the configuration, as it didn't change.
+
+        :rtype: ``True`` if all values could be read again, ``False``
+         otherwise (in safe mode, as otherwise the first error is raised).
         """
-        return self._keys[key].value
+        valid = True
+        for options in self._categories.values():
+            for option in options:
+                try:
+                    old_value = option.value
+                    if option.reload():
+                        self._changed(
+                            option.key, old_value, option.value, None,
+                            old_value, writeback=False
+                        )
+                except Exception as e:
+                    if not self._safe:
+                        raise e
+                    log.error(format_exc())
+                    valid = False
+        return valid
 
     def set(self, key, value):
         """
         Validate and set a config key.
         """
+        self._set(key, value)
+
+    def _set(self, key, value, native=False):
+        """
+        Validate and set a config key, parsing the value from its string
+        representation or coercing it from a native value.
+        """
+        option = self._option(key)
+        listened = self._notify and (
+            self._listeners.get(key) or self._delta_listeners.get(key)
+        )
+
+        # Relative paths in imported values are relative to their file
+        base = None
+        if self._importing is not None:
+            base = dirname(abspath(self._importing))
+
+        # Defer parsing and validation of imported values in lazy mode
+        if self._deferring and not native and not listened:
+            option.defer(value, base)
+            self._track_reference(key)
+            return
+
         # Get old value and compare
-        old_value = self.get(key)
-        if value == old_value:
+        try:
+            old_value = option.value
+        except Exception:
+            # The pending value is invalid, but it is being replaced anyway
+            log.error(format_exc())
+            old_value = option.value
+
+        # Values that cannot be compared, as NumPy arrays, are always set
+        try:
+            unchanged = bool(value == old_value)
+        except ValueError:
+            unchanged = False
+        if unchanged:
             return
 
         # Set and validate new value
-        self._keys[key].value = value
+        if native:
+            option._assign(option.coerce(value))
+        else:
+            option._set_raw(value, base)
+        self._track_reference(key)
+
+        # References to side files are read on first access, unless there are
+        # listeners to notify with the list they hold
+        if listened and option._pending:
+            value = option.value
+
+        self._changed(key, old_value, value, None, old_value)
+
+    def append(self, key, element):
+        """
+        Append a native element to the list option with the given key, see
+        :meth:`extend`.
+        """
+        self.extend(key, [element])
+
+    def extend(self, key, elements):
+        """
+        Append native elements to the list option with the given key.
+
+        Only the new elements are parsed and validated, see
+        :meth:`ConfigList.extend <confspec.options.ConfigList.extend>`.
+        Listeners are notified with the old and new lists, and delta listeners
+        with the elements added.
+        """
+        option = self._option(key)
+        old_value = option.value
+        added = option.extend(elements)
+        if len(added):
+            self._changed(
+                key, old_value, option.value, added, option.coerce([])
+            )
+
+    def remove(self, key, element):
+        """
+        Remove the first occurrence of a native element from the list option
+        with the given key.
 
+        See :meth:`ConfigList.remove <confspec.options.ConfigList.remove>`.
+        Listeners are notified with the old and new lists, and delta listeners
+        with the element removed.
+        """
+        option = self._option(key)
+        old_value = option.value
+        removed = option.remove(element)
+        self._changed(
+            key, old_value, option.value, option.coerce([]), removed
+        )
+
+    def _changed(
+            self, key, old_value, value, added, removed, writeback=True):
+        """
+        Write back and notify listeners of a change of a config key, given
+        the elements added and removed for delta listeners. If ``added`` is
+        ``None``, the new value of the option is used.
+        """
         # Writeback if enabled
-        if self._writeback:
+        if writeback and self._writeback:
             self.save()
 
+        if not self._notify:
+            return
+
         # Notify all listeners of the change
-        if self._notify:
-            for listener in self._listeners[key]:
-                try:
-                    listener(key, old_value, value)
-                except Exception as e:
-                    if not self._safe:
-                        raise e
-                    else:
-                        log.error(format_exc())
+        calls = [
+            (listener, (key, old_value, value))
+            for listener in self._listeners.get(key, [])
+        ]
+        delta_listeners = self._delta_listeners.get(key, [])
+        if delta_listeners:
+            if added is None:
+                added = self._keys[key].value
+            calls.extend(
+                (listener, (key, added, removed))
+                for listener in delta_listeners
+            )
+
+        for listener, args in calls:
+            try:
+                listener(*args)
+            except Exception as e:
+                if not self._safe:
+                    raise e
+                else:
+                    log.error(format_exc())
+
+    def __getstate__(self):
+        """
+        Return the state of the configuration manager to be pickled.
+
+        The state includes the specification, with the current values of the
+        options, the file stack and the flags. Listeners are not included.
+        """
+        state = self.__dict__.copy()
+        del state['_listeners']
+        del state['_delta_listeners']
+        del state['_proxy']
+        return state
+
+    def __setstate__(self, state):
+        """
+        Restore the state of an unpickled configuration manager, without
+        listeners.
+        """
+        self.__dict__.update(state)
+        self._listeners = {}
+        self._delta_listeners = {}
+        self._proxy = ConfigProxy(self)
 
     def get_proxy(self):
         """
@@ -25,18 +25,65 @@ import re
 import ast
 import keyword
 import logging as log
+from array import array
+from binascii import hexlify, unhexlify
 from datetime import datetime, date, time
-from os.path import exists, isfile, isdir, abspath
-from inspect import isclass
+from os import stat
+from os.path import exists, isfile, isdir, abspath, getsize, join
+
+try:
+    from sys import intern
+except ImportError:
+    pass
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+from .utils import first_line, LRUCache, FrozenDict
+from .utils import stat_cache, cached_exists, cached_isfile, cached_isdir
+from .utils import detect_compression, open_file
+from .tables import Table, DictTable
+from .validation import compile_validators, AllValidateTo
+
+
+_key_regex = re.compile(r'[_A-Za-z][_a-zA-Z0-9]*$')
+
+# Quoted string without escapes or line breaks, whose value is its content
+_simple_string = re.compile(
+    r'(?:\'[^\'\\\r\n\x00]*\'|"[^"\\\r\n\x00]*")\Z'
+)
+
+# Marker of options without a deferred representation pending to be parsed
+_resolved = object()
 
-from .utils import first_line
+
+# Names of the slots of each option class, see _slot_names()
+_slot_names_cache = {}
+
+
+def _slot_names(cls):
+    """
+    Return the names of the slots of a class and its bases.
+    """
+    cache = _slot_names_cache
+    if cls not in cache:
+        cache[cls] = tuple(
+            name
+            for base in reversed(cls.__mro__)
+            for name in base.__dict__.get('__slots__', ())
+        )
+    return cache[cls]
 
 
 class ConfigOpt(object):
     """
     Base configuration option ``{Key : Value}`` object.
 
-    :param str key: Key of the configuration.
+    :param str key: Key of the configuration. Can be left unset (``None``) to
+     be set later, as :class:`confspec.spec.Spec` does with the name of the
+     attribute.
     :param default: Default value of the configuration. This value is treated
      like any other value and thus is parsed and validated prior to set it.
     :param validator: An optional validator function or a list of validator
@@ -48,25 +95,61 @@ class ConfigOpt(object):
 
     :type validator: function or list of functions
     :param str category: The category of the configuration option.
+    :param int cache_size: Size of the cache of parsed and validated values,
+     keyed by the raw value. When enabled, setting the value to a raw value
+     seen recently skips parsing and validation. The cache is cleared when
+     the validator changes. Ignored by options that are not
+     :attr:`cacheable`. ``0`` (the default) disables the cache.
+    :param bool defer_default: Defer parsing and validation of the default
+     value until the value is first accessed, as with :meth:`defer`, instead
+     of doing it in the constructor. This speeds up the creation of large
+     specifications, at the cost of reporting invalid defaults later, on
+     first access or on :meth:`ConfigMg.validate_all()
+     <confspec.manager.ConfigMg.validate_all>`.
+    """
+
+    __slots__ = (
+        '_key', '_value', '_raw', 'category', '_comment', '_validator',
+        '_check', '_cache', '_kwargs'
+    )
+
+    cacheable = True
+    """
+    Whether the result of parsing and validating a raw value depends only on
+    the raw value and the configuration of the option, and is immutable, and
+    thus can be cached and shared. See ``cache_size``.
     """
 
+    # Memoized validated categories, as many options share the same ones
+    _valid_categories = {}
+
     def __init__(
             self, key=None, default=None, validator=None,
-            category='general', comment='', **kwargs):
+            category='general', comment='', cache_size=0,
+            defer_default=False, **kwargs):
 
         # Private attributes
         self._key = None
         self._value = None
-        self.category = self._valid_key(category)
-        self.comment = comment.strip()
+        self._raw = _resolved
+        self._cache = None
+        if cache_size > 0 and self.cacheable:
+            self._cache = LRUCache(cache_size)
+        self.category = self._valid_category(category)
+        self.comment = comment
 
         # Validate and set attributes
         self.validator = validator
-        self.key = key
-        self.value = default
+        if key is not None:
+            self.key = key
+        if defer_default:
+            self.defer(default)
+        else:
+            self.value = default
 
-        # Save kwargs
-        self._kwargs = kwargs
+        # Save kwargs, if any
+        if kwargs:
+            self._kwargs = kwargs
 
         super(ConfigOpt, self).__init__()
 
@@ -79,11 +162,22 @@ class ConfigOpt(object):
         new_key = new_key.strip()
         if not new_key:
             raise ValueError('String must not be empty.')
-        if not re.match('[_A-Za-z][_a-zA-Z0-9]*$', new_key) or \
-                keyword.iskeyword(new_key):
+        if not _key_regex.match(new_key) or keyword.iskeyword(new_key):
             raise ValueError('Invalid key name.')
         return new_key
 
+    def _valid_category(self, category):
+        """
+        Validate a category like a key, memoizing the result.
+        """
+        valid_categories = ConfigOpt._valid_categories
+        if isinstance(category, str) and category in valid_categories:
+            return valid_categories[category]
+
+        valid = intern(self._valid_key(category))
+        valid_categories[category] = valid
+        return valid
+
     @property
     def key(self):
         """
@@ -97,35 +191,170 @@ class ConfigOpt(object):
             raise AttributeError('Cannot change key once set.')
         self._key = self._valid_key(new_key)
 
+    @property
+    def comment(self):
+        """
+        Comment describing this configuration option. Empty comments are not
+        stored.
+        """
+        try:
+            return self._comment
+        except AttributeError:
+            return ''
+
+    @comment.setter
+    def comment(self, comment):
+        comment = comment.strip()
+        if comment:
+            self._comment = comment
+        elif hasattr(self, '_comment'):
+            object.__delattr__(self, '_comment')
+
     @property
     def value(self):
         """
         Value (internal representation) associated to this configuration
         option.
         """
-        return self._value
+        return self._resolve()
 
     @value.setter
     def value(self, raw):
-        parsed = self.parse(raw)
-        if self.validator is not None:
-
-            # Asume list of callables
-            validators = self.validator
-            # Check if callable (pre 1.4)
-            if hasattr(self.validator, '__call__'):
-                validators = [self.validator]
-
-            for validator in validators:
-                if not validator(parsed):
-                    raise ValueError(
-                        '[{}] cannot accept <{}>. '
-                        'Could not be validated.'.format(
-                            self._key, parsed
-                        )
-                    )
+        self._set_raw(raw)
+
+    def _set_raw(self, raw, base=None):
+        """
+        Parse, validate and set a raw value, as setting :attr:`value` does.
+
+        :param raw: The raw value.
+        :param str base: The directory relative paths in the raw value are
+         relative to, see :meth:`defer`.
+        """
+        self._parse_assign(raw)
+
+    def _parse_assign(self, raw):
+        """
+        Parse, validate and set a raw value, using the cache if enabled.
+        """
+        cache = self._cache
+        if cache is None:
+            self._assign(self.parse(raw))
+            return
+
+        # Unhashable raw values are not cached
+        try:
+            key = (type(raw), raw)
+            parsed = cache.get(key, _resolved)
+        except TypeError:
+            self._assign(self.parse(raw))
+            return
+
+        if parsed is _resolved:
+            self._assign(self.parse(raw))
+            cache[key] = self._value
+            return
+
+        self._value = parsed
+        self._raw = _resolved
+
+    @property
+    def validator(self):
+        """
+        Validator function or tuple of validator functions of this
+        configuration option. Setting it compiles the validators into a single
+        check (see :func:`confspec.validation.compile_validators`) and clears
+        the cache. A list of validators is stored as a tuple, so it cannot be
+        changed in place without compiling it again; set a new list instead.
+        """
+        return self._validator
+
+    @validator.setter
+    def validator(self, validator):
+        if isinstance(validator, list):
+            validator = tuple(validator)
+        self._validator = validator
+        self._check = self._compile_validator(validator)
+        self.clear_cache()
+
+    def _compile_validator(self, validator):
+        """
+        Compile the given validators into the check used to validate new
+        values, see :func:`confspec.validation.compile_validators`.
+        """
+        return compile_validators(validator)
+
+    def cache_info(self):
+        """
+        Return the statistics of the cache of this configuration option.
+
+        :rtype: A :data:`confspec.utils.CacheInfo`, or ``None`` if the cache
+         is disabled.
+        """
+        if self._cache is None:
+            return None
+        return self._cache.info()
+
+    def clear_cache(self):
+        """
+        Clear the cache of this configuration option, if enabled.
+
+        The cache is cleared automatically when the validator changes. Clear
+        it if anything else the parsing depends on changes.
+        """
+        if self._cache is not None:
+            self._cache = LRUCache(self._cache.maxsize)
+
+    def defer(self, raw, base=None):
+        """
+        Store a string representation of the configuration option to be parsed
+        and validated on first access to the value, instead of right away.
+
+        A deferred representation that fails to parse or validate raises the
+        error on first access, and the previous value is kept. Setting the
+        value discards any deferred representation.
+
+        :param str raw: A string representation of the configuration option.
+        :param str base: The directory relative paths in the representation
+         are relative to, usually the directory of the configuration file it
+         was imported from. If ``None``, they are relative to the current
+         working directory. Ignored by options without paths to side files.
+        """
+        self._raw = raw
+
+    @property
+    def _pending(self):
+        """
+        Whether a deferred representation is pending to be parsed.
+        """
+        return self._raw is not _resolved
+
+    def _resolve(self):
+        """
+        Parse and validate the deferred representation, if any, and return the
+        internal representation of this configuration option.
+        """
+        raw = self._raw
+        if raw is not _resolved:
+            self._raw = _resolved
+            self._parse_assign(raw)
+        return self._value
+
+    def _assign(self, parsed):
+        """
+        Validate and set the internal representation of this configuration
+        option.
+        """
+        check = self._check
+        if check is not None and not check(parsed):
+            raise ValueError(
+                '[{}] cannot accept <{}>. '
+                'Could not be validated.'.format(
+                    self._key, parsed
+                )
+            )
 
         self._value = parsed
+        self._raw = _resolved
 
     def parse(self, value):
         """
@@ -141,6 +370,34 @@ class ConfigOpt(object):
         """
         raise NotImplementedError()
 
+    def _prefetch(self, values):
+        """
+        Prepare for parsing or coercing many values at once.
+
+        Collection options call this function with all their elements before
+        parsing them one by one, so subclasses can batch expensive work, see
+        :meth:`ConfigPath._prefetch`. By default does nothing.
+
+        :param list values: Values about to be parsed or coerced.
+        """
+        pass
+
+    def coerce(self, value):
+        """
+        Convert an already typed value to the internal representation of the
+        configuration option.
+
+        This is used to set values coming from native Python objects instead
+        of from a string representation, see
+        :meth:`confspec.manager.ConfigMg.import_mapping`. By default
+        :meth:`parse` is used, so subclasses only need to override this
+        function when their parser cannot tell apart a native value from a
+        string representation.
+
+        :param value: A native value of the configuration option.
+        """
+        return self.parse(value)
+
     def repr(self, value):
         """
         Abstract function that must transform the internal representation of
@@ -153,11 +410,79 @@ class ConfigOpt(object):
         """
         raise NotImplementedError()
 
+    def _export(self):
+        """
+        Return the representation of the configuration option to be exported
+        by the format providers, see :meth:`repr`.
+        """
+        return self.repr(self._resolve())
+
+    def flush(self):
+        """
+        Write any part of the configuration option that is stored outside of
+        the configuration file. Called by :meth:`ConfigMg.save()
+        <confspec.manager.ConfigMg.save>` before the configuration file is
+        written. Does nothing by default.
+        """
+        pass
+
+    def reload(self):
+        """
+        Read again any part of the configuration option that is stored
+        outside of the configuration file, if it changed. Called by
+        :meth:`ConfigMg.reload() <confspec.manager.ConfigMg.reload>`. Does
+        nothing by default.
+
+        :rtype: ``True`` if the value changed, ``False`` otherwise.
+        """
+        return False
+
     def __delattr__(self, name):
         raise TypeError('Cannot delete configuration keys.')
 
+    def __getstate__(self):
+        """
+        Return the state of the configuration option to be pickled.
+
+        The compiled validator is left out, as it is compiled again from the
+        validator when unpickled.
+        """
+        state = {}
+        for name in _slot_names(type(self)):
+            if hasattr(self, name):
+                state[name] = getattr(self, name)
+        if getattr(self, '__dict__', None):
+            state.update(self.__dict__)
+
+        del state['_check']
+        if state['_raw'] is _resolved:
+            del state['_raw']
+        return state
+
+    def __setstate__(self, state):
+        """
+        Restore the state of an unpickled configuration option.
+        """
+        self._raw = _resolved
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+        self._check = self._compile_validator(self._validator)
+
+    def __copy__(self):
+        """
+        Return a copy of the configuration option, with its own cache and
+        compiled validator, as :py:mod:`pickle` would.
+        """
+        state = self.__getstate__()
+        if state['_cache'] is not None:
+            state['_cache'] = LRUCache(state['_cache'].maxsize)
+
+        clone = type(self).__new__(type(self))
+        clone.__setstate__(state)
+        return clone
+
     def __repr__(self):
-        return str(self.repr(self._value))
+        return str(self._export())
 
     def __str__(self):
         return repr(self)
@@ -186,6 +511,8 @@ class ConfigString(ConfigOpt):
     :type cleaner: function or None
     """
 
+    __slots__ = ('_cleaner',)
+
     def __init__(self, cleaner=None, **kwargs):
         self._cleaner = cleaner
         super(ConfigString, self).__init__(**kwargs)
@@ -193,13 +520,31 @@ class ConfigString(ConfigOpt):
     def parse(self, value):
         """
         Override of :meth:`ConfigOpt.parse` that interprets value to string.
+
+        Simple quoted strings are unquoted directly, everything else is
+        interpreted using :py:func:`ast.literal_eval`.
         """
-        value = ast.literal_eval(value)
+        if isinstance(value, str) and _simple_string.match(value):
+            value = value[1:-1]
+        else:
+            value = ast.literal_eval(value)
 
         if self._cleaner is not None:
             return self._cleaner(str(value))
         return str(value)
 
+    def coerce(self, value):
+        """
+        Override of :meth:`ConfigOpt.coerce` that takes native strings as they
+        are, without unquoting them.
+        """
+        if not isinstance(value, str):
+            return ConfigString.parse(self, value)
+
+        if self._cleaner is not None:
+            return self._cleaner(value)
+        return value
+
     def repr(self, value):
         """
         Override of :meth:`ConfigOpt.repr` that returns the quoted
@@ -223,6 +568,8 @@ class ConfigText(ConfigOpt):
     :type cleaner: function or None
     """
 
+    __slots__ = ('_cleaner',)
+
     def __init__(self, cleaner=None, **kwargs):
         self._cleaner = cleaner
         super(ConfigText, self).__init__(**kwargs)
@@ -257,6 +604,8 @@ class ConfigLine(ConfigText):
     :type cleaner: function or None
     """
 
+    __slots__ = ()
+
     def __init__(self, cleaner=first_line, **kwargs):
         super(ConfigLine, self).__init__(cleaner=cleaner, **kwargs)
 
@@ -278,6 +627,8 @@ class ConfigInt(ConfigOpt):
      internal integer.
     """
 
+    __slots__ = ('_base', '_sformat')
+
     def __init__(self, base=0, sformat=None, **kwargs):
         self._base = base
         self._sformat = sformat
@@ -319,6 +670,8 @@ class ConfigDecimal(ConfigInt):
        :parts: 1
     """
 
+    __slots__ = ()
+
     def __init__(self, base=10, **kwargs):
         kwargs['base'] = base
         super(ConfigDecimal, self).__init__(**kwargs)
@@ -336,6 +689,8 @@ class ConfigOctal(ConfigInt):
        :parts: 1
     """
 
+    __slots__ = ()
+
     def __init__(self, base=8, sformat='0{:o}', **kwargs):
         kwargs['base'] = base
         kwargs['sformat'] = sformat
@@ -354,6 +709,8 @@ class ConfigHexadecimal(ConfigInt):
        :parts: 1
     """
 
+    __slots__ = ()
+
     def __init__(self, base=16, sformat='0x{:x}', **kwargs):
         kwargs['base'] = base
         kwargs['sformat'] = sformat
@@ -370,6 +727,8 @@ class ConfigBoolean(ConfigOpt):
        :parts: 1
     """
 
+    __slots__ = ()
+
     def __init__(self, **kwargs):
         super(ConfigBoolean, self).__init__(**kwargs)
 
@@ -416,6 +775,8 @@ class ConfigFloat(ConfigOpt):
      internal float.
     """
 
+    __slots__ = ('_sformat',)
+
     def __init__(self, sformat=None, **kwargs):
         self._sformat = sformat
         super(ConfigFloat, self).__init__(**kwargs)
@@ -463,10 +824,38 @@ class ConfigDateTime(ConfigOpt):
      :py:meth:`datetime.datetime.strptime` to parse given time strings.
     """
 
+    __slots__ = ('_tformat',)
+
+    # Default format, the shape of the values in that format and the type
+    # whose fromisoformat parses them much faster than strptime
+    _iso = (
+        '%Y-%m-%dT%H:%M:%S',
+        re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2}T[0-9]{2}:[0-9]{2}:[0-9]{2}\Z'),
+        datetime,
+    )
+
     def __init__(self, tformat='%Y-%m-%dT%H:%M:%S', **kwargs):
         self._tformat = tformat
         super(ConfigDateTime, self).__init__(**kwargs)
 
+    def _parse_iso(self, value):
+        """
+        Fast path of :meth:`parse` for values in the default ISO 8601
+        format, using ``fromisoformat`` instead of
+        :py:meth:`datetime.datetime.strptime`.
+
+        :rtype: The parsed value or ``None`` if the fast path does not apply.
+        """
+        tformat, shape, cls = self._iso
+        if self._tformat != tformat or not isinstance(value, str) or \
+                shape.match(value) is None:
+            return None
+        try:
+            return cls.fromisoformat(value)
+        except (AttributeError, ValueError):
+            # Python < 3.7, or an invalid value that strptime will report
+            return None
+
     def parse(self, value):
         """
         Override of :meth:`ConfigOpt.parse` that converts value to a
@@ -474,7 +863,10 @@ class ConfigDateTime(ConfigOpt):
         """
         if isinstance(value, datetime):
             return value
-        return datetime.strptime(value, self._tformat)
+        parsed = self._parse_iso(value)
+        if parsed is None:
+            parsed = datetime.strptime(value, self._tformat)
+        return parsed
 
     def repr(self, value):
         """
@@ -500,6 +892,10 @@ class ConfigDate(ConfigDateTime):
      :py:meth:`datetime.datetime.strptime` to parse given time strings.
     """
 
+    __slots__ = ()
+
+    _iso = ('%Y-%m-%d', re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2}\Z'), date)
+
     def __init__(self, tformat='%Y-%m-%d', **kwargs):
         super(ConfigDate, self).__init__(tformat=tformat, **kwargs)
 
@@ -510,8 +906,10 @@ class ConfigDate(ConfigDateTime):
         """
         if isinstance(value, date):
             return value
-        dt = super(ConfigDate, self).parse(value)
-        return dt.date()
+        parsed = self._parse_iso(value)
+        if parsed is None:
+            parsed = datetime.strptime(value, self._tformat).date()
+        return parsed
 
 
 class ConfigTime(ConfigDateTime):
@@ -530,6 +928,10 @@ class ConfigTime(ConfigDateTime):
      :py:meth:`datetime.datetime.strptime` to parse given time strings.
     """
 
+    __slots__ = ()
+
+    _iso = ('%H:%M:%S', re.compile(r'[0-9]{2}:[0-9]{2}:[0-9]{2}\Z'), time)
+
     def __init__(self, tformat='%H:%M:%S', **kwargs):
         super(ConfigTime, self).__init__(tformat=tformat, **kwargs)
 
@@ -540,8 +942,10 @@ class ConfigTime(ConfigDateTime):
         """
         if isinstance(value, time):
             return value
-        dt = super(ConfigTime, self).parse(value)
-        return dt.time()
+        parsed = self._parse_iso(value)
+        if parsed is None:
+            parsed = datetime.strptime(value, self._tformat).time()
+        return parsed
 
 
 # -----------------------------------------------------------------------------
@@ -558,28 +962,59 @@ class ConfigMap(ConfigOpt):
     Internal representation of the object is a Python tuple of
     ``(key , value)``.
 
+    The table can be a dictionary or any :class:`confspec.tables.Table`. The
+    later also allow to set the option from the values of the table, see
+    :meth:`coerce`, and to keep large tables outside the process, see
+    :class:`confspec.tables.SortedFileTable` and
+    :class:`confspec.tables.SQLiteTable`.
+
     .. inheritance-diagram:: ConfigMap
        :parts: 1
 
     :param dict table: Mapping dictionary to lookup keys.
     """
 
+    __slots__ = ('_table',)
+
+    # The table can change without notice
+    cacheable = False
+
     def __init__(self, table, **kwargs):
         self._table = table
         super(ConfigMap, self).__init__(**kwargs)
 
     @ConfigOpt.value.getter
     def value(self):
-        return self._value[1]
+        return self._resolve()[1]
 
     def parse(self, value):
         """
         Override of :meth:`ConfigOpt.parse` that lookups the given key and, if
         found, returns it's associated value.
         """
-        if value in self._table:
+        try:
             return (value, self._table[value])
-        raise ValueError('Cannot parse <{}>. Unknown key.'.format(value))
+        except KeyError:
+            raise ValueError('Cannot parse <{}>. Unknown key.'.format(value))
+
+    def coerce(self, value):
+        """
+        Override of :meth:`ConfigOpt.coerce` that also accepts a value of the
+        table if the table is a :class:`confspec.tables.Table`, using
+        :meth:`confspec.tables.Table.key_of` to find its key.
+        """
+        try:
+            return ConfigMap.parse(self, value)
+        except (ValueError, TypeError) as e:
+            if not isinstance(self._table, Table):
+                raise e
+        try:
+            key = self._table.key_of(value)
+        except KeyError:
+            raise ValueError(
+                'Cannot coerce <{}>. Unknown key or value.'.format(value)
+            )
+        return (key, self._table[key])
 
     def repr(self, value):
         """
@@ -588,12 +1023,14 @@ class ConfigMap(ConfigOpt):
         """
         tkey, tvalue = value
 
-        if tkey not in self._table:
+        try:
+            current = self._table[tkey]
+        except KeyError:
             raise ValueError(
                 'Cannot find representation of <{}>. Unknown key.'.format(tkey)
             )
 
-        if tvalue != self._table[tkey]:
+        if current is not tvalue and current != tvalue:
             raise ValueError((
                 'Value mismatch for key <{}>. '
                 'Value changed or map changed?'
@@ -609,7 +1046,8 @@ class ConfigClass(ConfigMap):
     Use this configuration when you want to store a class name in the
     configuration and be able to retrive the Class in Software. This
     configuration option uses :class:`ConfigMap` to lookup between class name
-    and the class itself.
+    and the class itself, so the option can also be set natively from the
+    class.
 
     Internal representation of the object is a Python tuple of
     ``(class_name , class)``.
@@ -620,11 +1058,11 @@ class ConfigClass(ConfigMap):
     :param list classes: List of Python classes.
     """
 
+    __slots__ = ()
+
     def __init__(self, classes, **kwargs):
-        table = {}
-        for c in classes:
-            table[c.__name__] = c
-        super(ConfigClass, self).__init__(self, table=table, **kwargs)
+        table = DictTable((c.__name__, c) for c in classes)
+        super(ConfigClass, self).__init__(table=table, **kwargs)
 
 
 # -----------------------------------------------------------------------------
@@ -644,14 +1082,48 @@ class ConfigPath(ConfigOpt):
     .. inheritance-diagram:: ConfigPath
        :parts: 1
 
+    For slow file systems, the checkers :func:`confspec.utils.cached_exists`,
+    :func:`confspec.utils.cached_isfile` and
+    :func:`confspec.utils.cached_isdir` share
+    :data:`confspec.utils.stat_cache`, so repeated checks of an existing path
+    are served from memory for a few seconds. With them, collections of paths
+    check all their elements concurrently, see :meth:`_prefetch`, and
+    setting a ``timeout`` in the stat cache makes a check that hangs, for
+    example on an unresponsive network mount, fail instead of stalling.
+
     :param function checker: Aditional checker function to be used by the
      parser. By default :py:func:`os.path.exists` is used.
     """
 
+    __slots__ = ('_checker',)
+
+    # Validity depends on the file system
+    cacheable = False
+
     def __init__(self, checker=exists, **kwargs):
         self._checker = checker
         super(ConfigPath, self).__init__(**kwargs)
 
+    def _verify(self, value):
+        """
+        Apply ``checker`` to the given path, turning file system errors, like
+        timeouts, into parsing errors.
+        """
+        try:
+            return self._checker(value)
+        except EnvironmentError as e:
+            raise ValueError('Cannot verify <{}>. {}.'.format(value, e))
+
+    def _prefetch(self, values):
+        """
+        Override of :meth:`ConfigOpt._prefetch` that stats all the given paths
+        concurrently when using a cached checker.
+        """
+        if self._checker in (cached_exists, cached_isfile, cached_isdir):
+            stat_cache.prefetch(
+                abspath(value) for value in values if isinstance(value, str)
+            )
+
     def parse(self, value):
         """
         Override of :meth:`ConfigOpt.parse` that apply
@@ -659,7 +1131,7 @@ class ConfigPath(ConfigOpt):
         value.
         """
         value = abspath(value)
-        if self._checker is not None and self._checker(value):
+        if self._checker is not None and self._verify(value):
             return value
         raise ValueError('Cannot verify <{}>. Not found.'.format(value))
 
@@ -688,6 +1160,8 @@ class ConfigFile(ConfigPath):
      parser. By default :py:func:`os.path.isfile` is used.
     """
 
+    __slots__ = ()
+
     def __init__(self, checker=isfile, **kwargs):
         super(ConfigFile, self).__init__(checker=checker, **kwargs)
 
@@ -709,6 +1183,8 @@ class ConfigDir(ConfigPath):
      parser. By default :py:func:`os.path.isdir` is used.
     """
 
+    __slots__ = ()
+
     def __init__(self, checker=isdir, **kwargs):
         super(ConfigDir, self).__init__(checker=checker, **kwargs)
 
@@ -727,6 +1203,8 @@ class ConfigColor(ConfigOpt):
        :parts: 1
     """
 
+    __slots__ = ()
+
     def parse(self, value):
         """
         Override of :meth:`ConfigOpt.parse` that converts CSS-like color
@@ -748,6 +1226,20 @@ class ConfigColor(ConfigOpt):
         ))
         return (r, g, b)
 
+    def coerce(self, value):
+        """
+        Override of :meth:`ConfigOpt.coerce` that also accepts a sequence of 3
+        ``int``.
+        """
+        if isinstance(value, (tuple, list)):
+            if len(value) != 3 or not all(
+                    type(c) is int and 0 <= c <= 255 for c in value):
+                raise ValueError(
+                    'Color <{}> is not a RGB tuple.'.format(value)
+                )
+            return tuple(value)
+        return ConfigColor.parse(self, value)
+
     def repr(self, value):
         """
         Override of :meth:`ConfigOpt.repr` that returns a RGB color encoded
@@ -769,6 +1261,11 @@ class ConfigFont(ConfigOpt):
        :parts: 1
     """
 
+    __slots__ = ()
+
+    # Font descriptions are mutable
+    cacheable = False
+
     fonts = []
     """
     List of system font names.
@@ -822,6 +1319,93 @@ class ConfigFont(ConfigOpt):
 # Collection ConfigOpt's
 # -----------------------------------------------------------------------------
 
+# Regular expressions to split a list into elements. An element is matched
+# in one step unless it has brackets, which are then matched by tokens.
+_list_element = re.compile(
+    r'(?:"[^"\\]*(?:\\.[^"\\]*)*"|\'[^\'\\]*(?:\\.[^\'\\]*)*\''
+    r'|[^,"\'\[\](){}]+)*'
+)
+_list_tokens = re.compile(
+    r'"[^"\\]*(?:\\.[^"\\]*)*"|\'[^\'\\]*(?:\\.[^\'\\]*)*\''
+    r'|[\[\](){}]|,'
+)
+_list_special = re.compile(r'["\'\[\](){}]')
+_list_closing = {']': '[', ')': '(', '}': '{'}
+
+
+class _DeltaCheck(object):
+    """
+    Compiled validator of a list that also keeps apart the validators of its
+    elements, see :meth:`ConfigList._check_delta`.
+    """
+
+    __slots__ = ('check', 'elements', 'whole')
+
+    def __init__(self, validators):
+        if hasattr(validators, '__call__'):
+            validators = [validators]
+        self.check = compile_validators(validators)
+        self.elements = compile_validators([
+            v for v in validators if isinstance(v, AllValidateTo)
+        ])
+        self.whole = compile_validators([
+            v for v in validators if not isinstance(v, AllValidateTo)
+        ])
+
+    def __call__(self, value):
+        return self.check(value)
+
+
+def _split_elements(value):
+    """
+    Split the string representation of the elements of a list, without the
+    enclosing brackets, at the commas that are not quoted nor nested in
+    brackets. Elements are yielded as they are found, stripped.
+    """
+    # Fast path for lists without quotes nor brackets
+    if _list_special.search(value) is None:
+        for element in value.split(','):
+            yield element.strip()
+        return
+
+    size = len(value)
+    pos = 0
+    while True:
+        end = _list_element.match(value, pos).end()
+        if end < size and value[end] != ',':
+            end = _nested_element_end(value, end)
+        yield value[pos:end].strip()
+        if end >= size:
+            return
+        pos = end + 1
+
+
+def _nested_element_end(value, pos):
+    """
+    Return the position of the comma that ends the element of a list that
+    has brackets, or the end of the string, scanning from the given position.
+    """
+    nesting = []
+    for match in _list_tokens.finditer(value, pos):
+        token = match.group()
+        if token == ',':
+            if not nesting:
+                return match.start()
+        elif token in _list_closing:
+            if not nesting or nesting.pop() != _list_closing[token]:
+                raise ValueError(
+                    'Unbalanced <{}> in list <{}>.'.format(token, value)
+                )
+        elif token in '[({':
+            nesting.append(token)
+
+    if nesting:
+        raise ValueError(
+            'Unbalanced <{}> in list <{}>.'.format(nesting[-1], value)
+        )
+    return len(value)
+
+
 class ConfigList(ConfigOpt):
     """
     Base mix-in class that allows to define lists of configuration options.
@@ -840,37 +1424,83 @@ class ConfigList(ConfigOpt):
     .. inheritance-diagram:: ConfigList
        :parts: 1
 
+    The elements of large lists can be kept in a side file, one element
+    representation per line, by setting the value of the option to a
+    reference ``@path/to/file`` instead of to a list. References are always
+    deferred (see :meth:`ConfigOpt.defer`), so the side file is read
+    streaming its lines through the element parser on first access to the
+    value, or by :meth:`ConfigMg.validate_all()
+    <confspec.manager.ConfigMg.validate_all>`, and a side file that fails to
+    parse or validate keeps the previous list and reference. The reference is
+    exported in place of the list and the side file is only rewritten by
+    :meth:`flush` if the list was changed with :meth:`append`, :meth:`extend`
+    or :meth:`remove` since it was read or written. Setting the value to a
+    list stops referencing the side file, see also :meth:`detach`. Note that
+    changes made in place to the list are not detected. Relative paths are
+    relative to the directory of the configuration file the reference was
+    imported from, or to the current working directory otherwise, and
+    compressed side files are supported (see
+    :func:`confspec.utils.open_file`).
+
+    Elements can be added and removed with :meth:`append`, :meth:`extend`
+    and :meth:`remove`, that parse and validate only the changed elements.
+
     :param bool strict: If strict is True all elements in the list must parse
      and validate. If False, unparseable / unvalidated elements are silently
      ignored.
     """
 
+    __slots__ = ()
+
+    # Lists are mutable
+    cacheable = False
+
     def __init__(self, strict=True, **kwargs):
 
         self._strict = strict
+        self._external = None
+        self._basedir = None
 
-        # Find element parsing and representation provider
-        self._provider = None
-        for p in self.__class__.__bases__:
-            if p != ConfigList and issubclass(p, ConfigOpt):
-                self._provider = p
-                break
+        # Find element parsing and representation provider, once per class
+        cls = type(self)
+        if '_provider' not in cls.__dict__:
+            cls._provider = cls._find_provider()
 
         super(ConfigList, self).__init__(**kwargs)
 
-    def _parse_elements(self, elements):
+    @classmethod
+    def _find_provider(cls):
+        """
+        Find the first :class:`ConfigOpt` based-parent that is not a list in
+        the class parents (method resolution order).
+        """
+        for p in cls.__mro__:
+            if not issubclass(p, ConfigList) and issubclass(p, ConfigOpt):
+                return p
+        return None
+
+    def _parse_elements(self, elements, native=False):
         """
         Parse given elements using current parsing provider.
 
         :param list elements: List of elements to parse.
+        :param bool native: Elements are native values and thus must be
+         coerced instead of parsed. See :meth:`ConfigOpt.coerce`.
         :rtype: A list of parsed elements. Note that this function take into
          account the ``strict`` flag and thus, if disabled, the lenght of the
          returned list could be less than the lenght of the given one.
         """
+        parser = self._provider.parse
+        if native and self._provider.coerce != ConfigOpt.coerce:
+            parser = self._provider.coerce
+        if self._provider._prefetch != ConfigOpt._prefetch:
+            elements = list(elements)
+            self._provider._prefetch(self, elements)
+
         result = []
         for e in elements:
             try:
-                parsed = self._provider.parse(self, e)
+                parsed = parser(self, e)
                 result.append(parsed)
             except Exception as e:
                 if self._strict:
@@ -899,9 +1529,265 @@ class ConfigList(ConfigOpt):
         if not value:
             return []
 
-        fragments = [v.strip() for v in value.split(',')]
+        return self._parse_fragments(_split_elements(value))
+
+    def _parse_fragments(self, fragments):
+        """
+        Parse the given string representations of the elements into the
+        internal representation of the list.
+
+        :param fragments: An iterable of the string representations of the
+         elements.
+        """
         return self._parse_elements(fragments)
 
+    @staticmethod
+    def _reference(raw):
+        """
+        Return the reference to a side file in the given raw value, or
+        ``None`` if it is not a reference.
+        """
+        if isinstance(raw, str):
+            raw = raw.strip()
+            if raw[:1] == '@':
+                return raw
+        return None
+
+    @staticmethod
+    def _reference_path(reference, base=None):
+        """
+        Return the absolute path of the side file of the given reference,
+        relative to the given directory if not absolute.
+        """
+        return abspath(join(base or '', reference[1:].strip()))
+
+    @property
+    def _referenced(self):
+        """
+        The reference to the side file the list is or will be read from, or
+        ``None``.
+        """
+        raw = self._raw
+        if raw is not _resolved:
+            return self._reference(raw)
+        external = self._external
+        if external is None:
+            return None
+        return external[0]
+
+    # The value is the list itself, even for lists of mapping options
+    value = ConfigOpt.value
+
+    def _set_raw(self, raw, base=None):
+        """
+        Override of :meth:`ConfigOpt._set_raw` that defers references to side
+        files.
+        """
+        if self._reference(raw) is not None:
+            self.defer(raw, base)
+            return
+        super(ConfigList, self)._set_raw(raw, base)
+
+    def defer(self, raw, base=None):
+        """
+        Override of :meth:`ConfigOpt.defer` that records the directory
+        relative references to side files are relative to.
+        """
+        self._basedir = base
+        super(ConfigList, self).defer(raw, base)
+
+    def _assign(self, parsed):
+        """
+        Override of :meth:`ConfigOpt._assign` that stops referencing the side
+        file, if any, as the list is replaced.
+        """
+        super(ConfigList, self)._assign(parsed)
+        self._external = None
+
+    def _parse_assign(self, raw):
+        """
+        Override of :meth:`ConfigOpt._parse_assign` that reads the elements of
+        referenced side files.
+        """
+        reference = self._reference(raw)
+        if reference is None:
+            super(ConfigList, self)._parse_assign(raw)
+            self._external = None
+            return
+
+        path = self._reference_path(reference, self._basedir)
+        with open_file(path, 'r', detect_compression(path)) as lines:
+            parsed = self._parse_fragments(
+                line.rstrip('\r\n') for line in lines if line.strip()
+            )
+        self._assign(parsed)
+        self._external = (reference, path, self._value)
+
+    def _export(self):
+        """
+        Override of :meth:`ConfigOpt._export` that exports the reference to
+        the side file, if any, without reading it.
+        """
+        reference = self._referenced
+        if reference is None:
+            return super(ConfigList, self)._export()
+        return reference
+
+    def detach(self):
+        """
+        Stop referencing the side file, if any, reading it if required, so the
+        list is exported in place and the side file is not written anymore.
+        """
+        if self._referenced is not None:
+            self._resolve()
+            self._external = None
+
+    def flush(self):
+        """
+        Override of :meth:`ConfigOpt.flush` that writes the side file, if the
+        value changed since it was read or written.
+        """
+        # Side files pending to be read are unchanged
+        if self._external is None or \
+                self._reference(self._raw) is not None:
+            return
+
+        value = self._resolve()
+        external = self._external
+        if external is None:
+            return
+        reference, path, synced = external
+        if value is synced:
+            return
+
+        with open_file(path, 'w', detect_compression(path)) as f:
+            for element in self.repr(value):
+                f.write('{}\n'.format(element))
+        self._external = (reference, path, value)
+
+    def _concat(self, value, elements):
+        """
+        Return a new list with the given elements appended to the given
+        internal representation of the list.
+        """
+        return value + elements
+
+    def _without(self, value, element):
+        """
+        Return a new list without the first occurrence of the given element
+        in the given internal representation of the list.
+        """
+        index = value.index(element)
+        return value[:index] + value[index + 1:]
+
+    def _compile_validator(self, validator):
+        """
+        Override of :meth:`ConfigOpt._compile_validator` that also splits the
+        validators of the elements from the validators of the whole list, so
+        :meth:`_check_delta` does not have to do it on every change.
+        """
+        if validator is None:
+            return None
+        check = _DeltaCheck(validator)
+        if check.check is None:
+            return None
+        return check
+
+    def _check_delta(self, value, added=None):
+        """
+        Validate a new internal representation of the list, given the
+        elements added to the previous one, if any.
+        """
+        check = self._check
+        if check is None:
+            return
+        element_check = check.elements
+        list_check = check.whole
+
+        if added is not None and element_check is not None and \
+                not element_check(added):
+            invalid = added
+        elif list_check is not None and not list_check(value):
+            invalid = value
+        else:
+            return
+
+        raise ValueError(
+            '[{}] cannot accept <{}>. '
+            'Could not be validated.'.format(
+                self._key, invalid
+            )
+        )
+
+    def append(self, element):
+        """
+        Append a native element to the list, see :meth:`extend`.
+
+        :param element: A native value of the element.
+        :rtype: The elements added, as returned by :meth:`extend`.
+        """
+        return self.extend([element])
+
+    def extend(self, elements):
+        """
+        Append native elements to the list, parsing and validating only the
+        new elements. Validators created by :func:`all_validate_to
+        <confspec.validation.all_validate_to>` only check the new elements,
+        any other validator checks the whole list.
+
+        The list is not changed in place, the value of the option is replaced
+        by a new list. Copying the list is still linear on its length, but
+        much faster than parsing and validating all its elements.
+
+        :param elements: An iterable of native values of the elements.
+        :rtype: The elements added, in the internal representation of the
+         list. Note that if ``strict`` is disabled, invalid elements are not
+         added.
+        """
+        value = self._resolve()
+        added = self.coerce(list(elements))
+        new = self._concat(value, added)
+        self._check_delta(new, added)
+
+        self._value = new
+        self._raw = _resolved
+        return added
+
+    def remove(self, element):
+        """
+        Remove the first occurrence of a native element from the list.
+
+        As with :meth:`extend`, the value of the option is replaced by a new
+        list and only validators that check the whole list are used.
+
+        :param element: A native value of the element.
+        :rtype: The elements removed, in the internal representation of the
+         list.
+        """
+        value = self._resolve()
+        removed = self.coerce([element])
+        if not len(removed):
+            raise ValueError('Cannot parse <{}>.'.format(element))
+        try:
+            new = self._without(value, next(iter(removed)))
+        except ValueError:
+            raise ValueError('<{}> is not in [{}].'.format(element, self._key))
+        self._check_delta(new)
+
+        self._value = new
+        self._raw = _resolved
+        return removed
+
+    def coerce(self, value):
+        """
+        Override of :meth:`ConfigOpt.coerce` that coerces each element of a
+        native sequence using whatever :class:`ConfigOpt` based-parent is found
+        in current class parents (bases).
+        """
+        if isinstance(value, (list, tuple)):
+            return self._parse_elements(value, native=True)
+        return self.parse(value)
+
     def repr(self, value):
         """
         Override of :meth:`ConfigOpt.repr` that returns a list of element
@@ -914,7 +1800,9 @@ class ConfigList(ConfigOpt):
         ))
 
     def __repr__(self):
-        elem_repr = self.repr(self._value)
+        elem_repr = self._export()
+        if self._referenced is not None:
+            return elem_repr
         return '[{}]'.format(
             ', '.join(
                 list(map(str, elem_repr))
@@ -929,7 +1817,7 @@ class ConfigListString(ConfigList, ConfigString):
     .. inheritance-diagram:: ConfigListString
        :parts: 1
     """
-    pass
+    __slots__ = ('_strict', '_external', '_basedir')
 
 
 class ConfigListText(ConfigList, ConfigText):
@@ -939,7 +1827,7 @@ class ConfigListText(ConfigList, ConfigText):
     .. inheritance-diagram:: ConfigListText
        :parts: 1
     """
-    pass
+    __slots__ = ('_strict', '_external', '_basedir')
 
 
 class ConfigListLine(ConfigList, ConfigLine):
@@ -949,7 +1837,7 @@ class ConfigListLine(ConfigList, ConfigLine):
     .. inheritance-diagram:: ConfigListLine
        :parts: 1
     """
-    pass
+    __slots__ = ('_strict', '_external', '_basedir')
 
 
 class ConfigListInt(ConfigList, ConfigInt):
@@ -959,7 +1847,7 @@ class ConfigListInt(ConfigList, ConfigInt):
     .. inheritance-diagram:: ConfigListInt
        :parts: 1
     """
-    pass
+    __slots__ = ('_strict', '_external', '_basedir')
 
 
 class ConfigListDecimal(ConfigList, ConfigDecimal):
@@ -969,7 +1857,7 @@ class ConfigListDecimal(ConfigList, ConfigDecimal):
     .. inheritance-diagram:: ConfigListDecimal
        :parts: 1
     """
-    pass
+    __slots__ = ('_strict', '_external', '_basedir')
 
 
 class ConfigListOctal(ConfigList, ConfigOctal):
@@ -979,7 +1867,7 @@ class ConfigListOctal(ConfigList, ConfigOctal):
     .. inheritance-diagram:: ConfigListOctal
        :parts: 1
     """
-    pass
+    __slots__ = ('_strict', '_external', '_basedir')
 
 
 class ConfigListHexadecimal(ConfigList, ConfigHexadecimal):
@@ -989,7 +1877,7 @@ class ConfigListHexadecimal(ConfigList, ConfigHexadecimal):
     .. inheritance-diagram:: ConfigListHexadecimal
        :parts: 1
     """
-    pass
+    __slots__ = ('_strict', '_external', '_basedir')
 
 
 class ConfigListBoolean(ConfigList, ConfigBoolean):
@@ -999,7 +1887,7 @@ class ConfigListBoolean(ConfigList, ConfigBoolean):
     .. inheritance-diagram:: ConfigListBoolean
        :parts: 1
     """
-    pass
+    __slots__ = ('_strict', '_external', '_basedir')
 
 
 class ConfigListFloat(ConfigList, ConfigFloat):
@@ -1009,7 +1897,7 @@ class ConfigListFloat(ConfigList, ConfigFloat):
     .. inheritance-diagram:: ConfigListFloat
        :parts: 1
     """
-    pass
+    __slots__ = ('_strict', '_external', '_basedir')
 
 
 class ConfigListDateTime(ConfigList, ConfigDateTime):
@@ -1019,7 +1907,7 @@ class ConfigListDateTime(ConfigList, ConfigDateTime):
     .. inheritance-diagram:: ConfigListDateTime
        :parts: 1
     """
-    pass
+    __slots__ = ('_strict', '_external', '_basedir')
 
 
 class ConfigListDate(ConfigList, ConfigDate):
@@ -1029,7 +1917,7 @@ class ConfigListDate(ConfigList, ConfigDate):
     .. inheritance-diagram:: ConfigListDate
        :parts: 1
     """
-    pass
+    __slots__ = ('_strict', '_external', '_basedir')
 
 
 class ConfigListTime(ConfigList, ConfigTime):
@@ -1039,7 +1927,7 @@ class ConfigListTime(ConfigList, ConfigTime):
     .. inheritance-diagram:: ConfigListTime
        :parts: 1
     """
-    pass
+    __slots__ = ('_strict', '_external', '_basedir')
 
 
 class ConfigListMap(ConfigList, ConfigMap):
@@ -1049,7 +1937,7 @@ class ConfigListMap(ConfigList, ConfigMap):
     .. inheritance-diagram:: ConfigListMap
        :parts: 1
     """
-    pass
+    __slots__ = ('_strict', '_external', '_basedir')
 
 
 class ConfigListClass(ConfigList, ConfigClass):
@@ -1059,7 +1947,7 @@ class ConfigListClass(ConfigList, ConfigClass):
     .. inheritance-diagram:: ConfigListClass
        :parts: 1
     """
-    pass
+    __slots__ = ('_strict', '_external', '_basedir')
 
 
 class ConfigListPath(ConfigList, ConfigPath):
@@ -1069,7 +1957,7 @@ class ConfigListPath(ConfigList, ConfigPath):
     .. inheritance-diagram:: ConfigListPath
        :parts: 1
     """
-    pass
+    __slots__ = ('_strict', '_external', '_basedir')
 
 
 class ConfigListFile(ConfigList, ConfigFile):
@@ -1079,7 +1967,7 @@ class ConfigListFile(ConfigList, ConfigFile):
     .. inheritance-diagram:: ConfigListFile
        :parts: 1
     """
-    pass
+    __slots__ = ('_strict', '_external', '_basedir')
 
 
 class ConfigListDir(ConfigList, ConfigDir):
@@ -1089,7 +1977,7 @@ class ConfigListDir(ConfigList, ConfigDir):
     .. inheritance-diagram:: ConfigListDir
        :parts: 1
     """
-    pass
+    __slots__ = ('_strict', '_external', '_basedir')
 
 
 class ConfigListColor(ConfigList, ConfigColor):
@@ -1099,7 +1987,7 @@ class ConfigListColor(ConfigList, ConfigColor):
     .. inheritance-diagram:: ConfigListColor
        :parts: 1
     """
-    pass
+    __slots__ = ('_strict', '_external', '_basedir')
 
 
 class ConfigListFont(ConfigList, ConfigFont):
@@ -1109,11 +1997,1152 @@ class ConfigListFont(ConfigList, ConfigFont):
     .. inheritance-diagram:: ConfigListFont
        :parts: 1
     """
-    pass
+    __slots__ = ('_strict', '_external', '_basedir')
+
+
+# -----------------------------------------------------------------------------
+# Set ConfigOpt's
+# -----------------------------------------------------------------------------
+
+class ConfigSet(ConfigList):
+    """
+    Base mix-in class that allows to define sets of configuration options.
+
+    Internal representation of the object is a Python ``frozenset``, so
+    membership checks take constant time. Elements are parsed and represented
+    as in :class:`ConfigList`, and sets are represented as lists, sorted if
+    the elements can be ordered, so they are supported by all format
+    providers. Side files and :meth:`extend` and :meth:`remove` are
+    supported as well.
+
+    Please note that this class is an abstract class and cannot be used by
+    itself. To make a configuration option of type set of another atomic
+    configuration option do:
+
+    .. code:: python
+
+       class ConfigSetMine(ConfigSet, ConfigMine):
+            pass
+
+    .. inheritance-diagram:: ConfigSet
+       :parts: 1
+
+    :param bool strict: See :class:`ConfigList`.
+    """
+
+    __slots__ = ()
+
+    cacheable = True
+
+    def parse(self, value):
+        """
+        Override of :meth:`ConfigList.parse` that parses a set.
+        """
+        if isinstance(value, (set, frozenset)):
+            return self.coerce(value)
+        return frozenset(super(ConfigSet, self).parse(value))
+
+    def _parse_fragments(self, fragments):
+        """
+        Override of :meth:`ConfigList._parse_fragments` that parses a set.
+        """
+        return frozenset(self._parse_elements(fragments))
+
+    def coerce(self, value):
+        """
+        Override of :meth:`ConfigList.coerce` that also accepts native sets.
+        """
+        if isinstance(value, (list, tuple, set, frozenset)):
+            return frozenset(self._parse_elements(value, native=True))
+        return self.parse(value)
+
+    def repr(self, value):
+        """
+        Override of :meth:`ConfigList.repr` that represents the elements
+        sorted, if they can be ordered.
+        """
+        try:
+            value = sorted(value)
+        except TypeError:
+            pass
+        return super(ConfigSet, self).repr(value)
+
+    def _without(self, value, element):
+        """
+        Override of :meth:`ConfigList._without` that removes the element
+        from the set.
+        """
+        if element not in value:
+            raise ValueError('Element not found.')
+        return value - frozenset((element, ))
+
+    def extend(self, elements):
+        """
+        Override of :meth:`ConfigList.extend` that adds the elements to the
+        set.
+
+        :rtype: The elements added that were not in the set.
+        """
+        value = self._resolve()
+        added = self.coerce(list(elements)) - value
+        new = value | added
+        self._check_delta(new, added)
+
+        self._value = new
+        self._raw = _resolved
+        return added
+
+
+class ConfigSetString(ConfigSet, ConfigString):
+    """
+    Set of :class:`ConfigString` configuration option.
+
+    .. inheritance-diagram:: ConfigSetString
+       :parts: 1
+    """
+    __slots__ = ('_strict', '_external', '_basedir')
+
+
+class ConfigSetText(ConfigSet, ConfigText):
+    """
+    Set of :class:`ConfigText` configuration option.
+
+    .. inheritance-diagram:: ConfigSetText
+       :parts: 1
+    """
+    __slots__ = ('_strict', '_external', '_basedir')
+
+
+class ConfigSetLine(ConfigSet, ConfigLine):
+    """
+    Set of :class:`ConfigLine` configuration option.
+
+    .. inheritance-diagram:: ConfigSetLine
+       :parts: 1
+    """
+    __slots__ = ('_strict', '_external', '_basedir')
+
+
+class ConfigSetInt(ConfigSet, ConfigInt):
+    """
+    Set of :class:`ConfigInt` configuration option.
+
+    .. inheritance-diagram:: ConfigSetInt
+       :parts: 1
+    """
+    __slots__ = ('_strict', '_external', '_basedir')
+
+
+class ConfigSetDecimal(ConfigSet, ConfigDecimal):
+    """
+    Set of :class:`ConfigDecimal` configuration option.
+
+    .. inheritance-diagram:: ConfigSetDecimal
+       :parts: 1
+    """
+    __slots__ = ('_strict', '_external', '_basedir')
+
+
+class ConfigSetOctal(ConfigSet, ConfigOctal):
+    """
+    Set of :class:`ConfigOctal` configuration option.
+
+    .. inheritance-diagram:: ConfigSetOctal
+       :parts: 1
+    """
+    __slots__ = ('_strict', '_external', '_basedir')
+
+
+class ConfigSetHexadecimal(ConfigSet, ConfigHexadecimal):
+    """
+    Set of :class:`ConfigHexadecimal` configuration option.
+
+    .. inheritance-diagram:: ConfigSetHexadecimal
+       :parts: 1
+    """
+    __slots__ = ('_strict', '_external', '_basedir')
+
+
+class ConfigSetFloat(ConfigSet, ConfigFloat):
+    """
+    Set of :class:`ConfigFloat` configuration option.
+
+    .. inheritance-diagram:: ConfigSetFloat
+       :parts: 1
+    """
+    __slots__ = ('_strict', '_external', '_basedir')
+
+
+class ConfigSetDateTime(ConfigSet, ConfigDateTime):
+    """
+    Set of :class:`ConfigDateTime` configuration option.
+
+    .. inheritance-diagram:: ConfigSetDateTime
+       :parts: 1
+    """
+    __slots__ = ('_strict', '_external', '_basedir')
+
+
+class ConfigSetDate(ConfigSet, ConfigDate):
+    """
+    Set of :class:`ConfigDate` configuration option.
+
+    .. inheritance-diagram:: ConfigSetDate
+       :parts: 1
+    """
+    __slots__ = ('_strict', '_external', '_basedir')
+
+
+class ConfigSetTime(ConfigSet, ConfigTime):
+    """
+    Set of :class:`ConfigTime` configuration option.
+
+    .. inheritance-diagram:: ConfigSetTime
+       :parts: 1
+    """
+    __slots__ = ('_strict', '_external', '_basedir')
+
+
+class ConfigSetPath(ConfigSet, ConfigPath):
+    """
+    Set of :class:`ConfigPath` configuration option.
+
+    .. inheritance-diagram:: ConfigSetPath
+       :parts: 1
+    """
+    __slots__ = ('_strict', '_external', '_basedir')
+
+
+class ConfigSetFile(ConfigSet, ConfigFile):
+    """
+    Set of :class:`ConfigFile` configuration option.
+
+    .. inheritance-diagram:: ConfigSetFile
+       :parts: 1
+    """
+    __slots__ = ('_strict', '_external', '_basedir')
+
+
+class ConfigSetDir(ConfigSet, ConfigDir):
+    """
+    Set of :class:`ConfigDir` configuration option.
+
+    .. inheritance-diagram:: ConfigSetDir
+       :parts: 1
+    """
+    __slots__ = ('_strict', '_external', '_basedir')
+
+
+class ConfigSetColor(ConfigSet, ConfigColor):
+    """
+    Set of :class:`ConfigColor` configuration option.
+
+    .. inheritance-diagram:: ConfigSetColor
+       :parts: 1
+    """
+    __slots__ = ('_strict', '_external', '_basedir')
+
+
+# -----------------------------------------------------------------------------
+# Dictionary ConfigOpt's
+# -----------------------------------------------------------------------------
+
+_dict_item = re.compile(
+    r"""\s*('[^'\\]*(?:\\.[^'\\]*)*'|"[^"\\]*(?:\\.[^"\\]*)*"|[^:]*?)"""
+    r'\s*:(.*)$',
+    re.DOTALL
+)
+
+
+class ConfigDict(ConfigOpt):
+    """
+    Base mix-in class that allows to define mappings of keys to
+    configuration options.
+
+    Internal representation of the object is a read-only dictionary (see
+    :class:`confspec.utils.FrozenDict`), so lookups take constant time.
+    Values are parsed and represented by whatever :class:`ConfigOpt`
+    based-parent is found in current class parents (bases), as the elements
+    of :class:`ConfigList`. Keys are strings, converted by ``key_type``.
+
+    Mappings are represented as ``{'key': value, ...}``, with quoted keys
+    (quotes are optional when parsing keys without colons) and the values
+    represented as elements of lists. Format providers that support
+    mappings, as JSON, export them as such.
+
+    Please note that this class is an abstract class and cannot be used by
+    itself. To make a configuration option of type mapping to another atomic
+    configuration option do:
+
+    .. code:: python
+
+       class ConfigDictMine(ConfigDict, ConfigMine):
+            pass
+
+    .. inheritance-diagram:: ConfigDict
+       :parts: 1
+
+    :param function key_type: Function that converts the string keys to the
+     keys of the mapping, for example :py:func:`int`. Keys are converted
+     back to strings with :py:func:`str`.
+    :param bool strict: If strict is True all items in the mapping must parse
+     and validate. If False, unparseable / unvalidated items are silently
+     ignored.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, key_type=str, strict=True, **kwargs):
+
+        self._key_type = key_type
+        self._strict = strict
+
+        # Find value parsing and representation provider, once per class
+        cls = type(self)
+        if '_provider' not in cls.__dict__:
+            cls._provider = cls._find_provider()
+
+        super(ConfigDict, self).__init__(**kwargs)
+
+    @classmethod
+    def _find_provider(cls):
+        """
+        Find the first :class:`ConfigOpt` based-parent that is not a mapping
+        in the class parents (method resolution order).
+        """
+        for p in cls.__mro__:
+            if not issubclass(p, ConfigDict) and issubclass(p, ConfigOpt):
+                return p
+        return None
+
+    def _parse_items(self, items, native=False):
+        """
+        Parse given items using current parsing provider.
+
+        :param items: Iterable of ``(key, value)`` tuples to parse.
+        :param bool native: Values are native values and thus must be
+         coerced instead of parsed. See :meth:`ConfigOpt.coerce`.
+        :rtype: A :class:`confspec.utils.FrozenDict`. Note that this function
+         take into account the ``strict`` flag.
+        """
+        parser = self._provider.parse
+        if native and self._provider.coerce != ConfigOpt.coerce:
+            parser = self._provider.coerce
+        key_type = self._key_type
+        if self._provider._prefetch != ConfigOpt._prefetch:
+            items = list(items)
+            self._provider._prefetch(self, [value for _, value in items])
+
+        result = {}
+        for key, value in items:
+            try:
+                result[key_type(key)] = parser(self, value)
+            except Exception as e:
+                if self._strict:
+                    raise e
+                log.error('Cannot parse/validate item <{}>.'.format(e))
+        return FrozenDict(result)
+
+    @staticmethod
+    def _split_item(fragment):
+        """
+        Split the string representation of an item into its key and the
+        string representation of its value.
+        """
+        match = _dict_item.match(fragment)
+        if match is None:
+            raise ValueError('Cannot parse <{}> as item.'.format(fragment))
+
+        key, value = match.groups()
+        if key[:1] in ('"', "'"):
+            key = ast.literal_eval(key)
+        return key, value.strip()
+
+    def parse(self, value):
+        """
+        Override of :meth:`ConfigOpt.parse` that parses a mapping of
+        arbitrary values which in turn are parsed by whatever
+        :class:`ConfigOpt` based-parent is found in current class parents
+        (bases).
+        """
+        if isinstance(value, Mapping):
+            return self._parse_items(value.items())
+
+        # Parse mapping
+        value = value.strip()
+        if (value[:1], value[-1:]) != ('{', '}'):
+            raise ValueError('Cannot parse <{}> as mapping.'.format(value))
+
+        # Check if empty mapping
+        value = value[1:-1].strip()
+        if not value:
+            return FrozenDict()
+
+        return self._parse_items(
+            self._split_item(fragment)
+            for fragment in _split_elements(value)
+        )
+
+    def coerce(self, value):
+        """
+        Override of :meth:`ConfigOpt.coerce` that coerces each value of a
+        native mapping using whatever :class:`ConfigOpt` based-parent is found
+        in current class parents (bases).
+        """
+        if isinstance(value, Mapping):
+            return self._parse_items(value.items(), native=True)
+        return self.parse(value)
+
+    def repr(self, value):
+        """
+        Override of :meth:`ConfigOpt.repr` that returns a ``dict`` of string
+        keys to values represented using whatever :class:`ConfigOpt`
+        based-parent is found in current class parents (bases).
+        """
+        provider_repr = self._provider.repr
+        return {
+            str(key): provider_repr(self, item) for key, item in value.items()
+        }
+
+    def __repr__(self):
+        return '{{{}}}'.format(', '.join(
+            '{!r}: {}'.format(key, item)
+            for key, item in sorted(self._export().items())
+        ))
+
+
+class ConfigDictString(ConfigDict, ConfigString):
+    """
+    Mapping of :class:`ConfigString` configuration option.
+
+    .. inheritance-diagram:: ConfigDictString
+       :parts: 1
+    """
+    __slots__ = ('_strict', '_key_type')
+
+
+class ConfigDictText(ConfigDict, ConfigText):
+    """
+    Mapping of :class:`ConfigText` configuration option.
+
+    .. inheritance-diagram:: ConfigDictText
+       :parts: 1
+    """
+    __slots__ = ('_strict', '_key_type')
+
+
+class ConfigDictLine(ConfigDict, ConfigLine):
+    """
+    Mapping of :class:`ConfigLine` configuration option.
+
+    .. inheritance-diagram:: ConfigDictLine
+       :parts: 1
+    """
+    __slots__ = ('_strict', '_key_type')
+
+
+class ConfigDictInt(ConfigDict, ConfigInt):
+    """
+    Mapping of :class:`ConfigInt` configuration option.
+
+    .. inheritance-diagram:: ConfigDictInt
+       :parts: 1
+    """
+    __slots__ = ('_strict', '_key_type')
+
+
+class ConfigDictDecimal(ConfigDict, ConfigDecimal):
+    """
+    Mapping of :class:`ConfigDecimal` configuration option.
+
+    .. inheritance-diagram:: ConfigDictDecimal
+       :parts: 1
+    """
+    __slots__ = ('_strict', '_key_type')
+
+
+class ConfigDictOctal(ConfigDict, ConfigOctal):
+    """
+    Mapping of :class:`ConfigOctal` configuration option.
+
+    .. inheritance-diagram:: ConfigDictOctal
+       :parts: 1
+    """
+    __slots__ = ('_strict', '_key_type')
+
+
+class ConfigDictHexadecimal(ConfigDict, ConfigHexadecimal):
+    """
+    Mapping of :class:`ConfigHexadecimal` configuration option.
+
+    .. inheritance-diagram:: ConfigDictHexadecimal
+       :parts: 1
+    """
+    __slots__ = ('_strict', '_key_type')
+
+
+class ConfigDictBoolean(ConfigDict, ConfigBoolean):
+    """
+    Mapping of :class:`ConfigBoolean` configuration option.
+
+    .. inheritance-diagram:: ConfigDictBoolean
+       :parts: 1
+    """
+    __slots__ = ('_strict', '_key_type')
+
+
+class ConfigDictFloat(ConfigDict, ConfigFloat):
+    """
+    Mapping of :class:`ConfigFloat` configuration option.
+
+    .. inheritance-diagram:: ConfigDictFloat
+       :parts: 1
+    """
+    __slots__ = ('_strict', '_key_type')
+
+
+class ConfigDictDateTime(ConfigDict, ConfigDateTime):
+    """
+    Mapping of :class:`ConfigDateTime` configuration option.
+
+    .. inheritance-diagram:: ConfigDictDateTime
+       :parts: 1
+    """
+    __slots__ = ('_strict', '_key_type')
+
+
+class ConfigDictDate(ConfigDict, ConfigDate):
+    """
+    Mapping of :class:`ConfigDate` configuration option.
+
+    .. inheritance-diagram:: ConfigDictDate
+       :parts: 1
+    """
+    __slots__ = ('_strict', '_key_type')
+
+
+class ConfigDictTime(ConfigDict, ConfigTime):
+    """
+    Mapping of :class:`ConfigTime` configuration option.
+
+    .. inheritance-diagram:: ConfigDictTime
+       :parts: 1
+    """
+    __slots__ = ('_strict', '_key_type')
+
+
+class ConfigDictPath(ConfigDict, ConfigPath):
+    """
+    Mapping of :class:`ConfigPath` configuration option.
+
+    .. inheritance-diagram:: ConfigDictPath
+       :parts: 1
+    """
+    __slots__ = ('_strict', '_key_type')
+
+
+class ConfigDictFile(ConfigDict, ConfigFile):
+    """
+    Mapping of :class:`ConfigFile` configuration option.
+
+    .. inheritance-diagram:: ConfigDictFile
+       :parts: 1
+    """
+    __slots__ = ('_strict', '_key_type')
+
+
+class ConfigDictDir(ConfigDict, ConfigDir):
+    """
+    Mapping of :class:`ConfigDir` configuration option.
+
+    .. inheritance-diagram:: ConfigDictDir
+       :parts: 1
+    """
+    __slots__ = ('_strict', '_key_type')
+
+
+class ConfigDictColor(ConfigDict, ConfigColor):
+    """
+    Mapping of :class:`ConfigColor` configuration option.
+
+    .. inheritance-diagram:: ConfigDictColor
+       :parts: 1
+    """
+    __slots__ = ('_strict', '_key_type')
+
+
+# -----------------------------------------------------------------------------
+# Array ConfigOpt's
+# -----------------------------------------------------------------------------
+
+# Integers that int() parses differently with base 0 than with base 10, those
+# with a radix prefix or leading zeros, one per line
+_radix_prefixed = re.compile(r'^\s*[+-]?0\S', re.M)
+
+
+def _bulk_radix(base, fragments):
+    """
+    Return the radix to convert the given string representations of integers
+    with, given the ``base`` of the option: ``10`` if they are all plain
+    decimal integers, even if ``base`` is ``0``.
+    """
+    if base == 0 and _radix_prefixed.search('\n'.join(fragments)) is None:
+        return 10
+    return base
+
+
+class ConfigArray(ConfigList):
+    """
+    Base mix-in class that allows to define compact lists of numbers.
+
+    Internal representation of the object is a Python
+    :py:class:`array.array`, that stores the numbers unboxed. Lists are parsed
+    and represented in bulk instead of one element at a time, falling back to
+    the element parser of the class parents (bases) only for elements the
+    bulk parser doesn't understand. Array options are compatible with
+    :class:`ConfigList` options in all formats.
+
+    Please note that this class is an abstract class and cannot be used by
+    itself, see :class:`ConfigArrayInt` and :class:`ConfigArrayFloat`.
+
+    .. inheritance-diagram:: ConfigArray
+       :parts: 1
+
+    :param str typecode: The type code of the array, see :py:mod:`array`. If
+     ``None``, :attr:`default_typecode` is used.
+    :param bool strict: See :class:`ConfigList`.
+    """
+
+    __slots__ = ()
+
+    default_typecode = None
+    """Default type code of the array."""
+
+    def __init__(self, typecode=None, **kwargs):
+        self._typecode = typecode or self.default_typecode
+        super(ConfigArray, self).__init__(**kwargs)
+
+    def _parse_bulk(self, fragments):
+        """
+        Parse a list of string representations of numbers at once, without
+        validation of each element. Must be implemented by subclasses.
+
+        :param list fragments: String representations of the numbers.
+        :rtype: An iterable of numbers.
+        """
+        raise NotImplementedError()
+
+    def _to_array(self, elements):
+        """
+        Create an array with the given numbers.
+        """
+        try:
+            return array(self._typecode, elements)
+        except OverflowError as e:
+            raise ValueError(e)
+
+    def parse(self, value):
+        """
+        Override of :meth:`ConfigList.parse` that parses a list of numbers
+        into an array.
+        """
+        if not isinstance(value, str):
+            return self.coerce(value)
+
+        # Parse list
+        value = value.strip()
+        if (value[:1], value[-1:]) != ('[', ']'):
+            raise ValueError('Cannot parse <{}> as list.'.format(value))
+
+        # Check if empty list
+        value = value[1:-1].strip()
+        if not value:
+            return self._to_array([])
+
+        return self._parse_fragments(value.split(','))
+
+    def _parse_fragments(self, fragments):
+        """
+        Override of :meth:`ConfigList._parse_fragments` that parses all the
+        elements at once.
+        """
+        # Parse elements one at a time only if the bulk parser fails, to
+        # report or skip (if not strict) the invalid ones
+        fragments = list(fragments)
+        try:
+            return self._to_array(self._parse_bulk(fragments))
+        except (TypeError, ValueError, OverflowError):
+            pass
+        return self._to_array(self._parse_elements(fragments))
+
+    def coerce(self, value):
+        """
+        Override of :meth:`ConfigList.coerce` that copies a native sequence of
+        numbers into an array.
+        """
+        if isinstance(value, str):
+            return self.parse(value)
+
+        try:
+            return self._to_array(value)
+        except (TypeError, ValueError):
+            return self._to_array(self._parse_elements(value, native=True))
+
+    def repr(self, value):
+        """
+        Override of :meth:`ConfigList.repr` that represents all elements of
+        the array at once.
+        """
+        if self._sformat is None:
+            return value.tolist()
+        return [self._sformat.format(element) for element in value.tolist()]
+
+    def __repr__(self):
+        elem_repr = self._export()
+        if self._sformat is None or self._referenced is not None:
+            return str(elem_repr)
+        return '[{}]'.format(', '.join(elem_repr))
+
+
+class ConfigArrayInt(ConfigArray, ConfigInt):
+    """
+    Array of :class:`ConfigInt` configuration option.
+
+    The default type code is ``'q'``, signed 64 bits integers. Lists of
+    plain decimal integers are converted at once, lists with radix prefixes
+    one element at a time.
+
+    .. inheritance-diagram:: ConfigArrayInt
+       :parts: 1
+    """
+
+    __slots__ = ('_strict', '_typecode', '_external', '_basedir')
+
+    default_typecode = 'q'
+
+    def _parse_bulk(self, fragments):
+        """
+        Override of :meth:`ConfigArray._parse_bulk` that parses integers using
+        the radix specified by ``base``.
+        """
+        base = _bulk_radix(self._base, fragments)
+        if base == 10:
+            return map(int, fragments)
+        return [int(fragment, base) for fragment in fragments]
+
+
+class ConfigArrayFloat(ConfigArray, ConfigFloat):
+    """
+    Array of :class:`ConfigFloat` configuration option.
+
+    The default type code is ``'d'``, double precision floats.
+
+    .. inheritance-diagram:: ConfigArrayFloat
+       :parts: 1
+    """
+
+    __slots__ = ('_strict', '_typecode', '_external', '_basedir')
+
+    default_typecode = 'd'
+
+    def _parse_bulk(self, fragments):
+        """
+        Override of :meth:`ConfigArray._parse_bulk` that parses floats,
+        formatted according to ``sformat`` if defined.
+        """
+        if self._sformat is None:
+            return map(float, fragments)
+        return [ConfigFloat.parse(self, fragment) for fragment in fragments]
+
+
+# -----------------------------------------------------------------------------
+# NumPy array ConfigOpt's
+# -----------------------------------------------------------------------------
+
+class ConfigNDArray(ConfigArray):
+    """
+    Base mix-in class that allows to define lists of numbers stored in NumPy
+    arrays.
+
+    Internal representation of the object is a ``numpy.ndarray``, parsed with
+    vectorized conversions where possible. NumPy is lazy-loaded, if you do
+    not plan to use these configuration options you do not require to have
+    NumPy. The validators created by :func:`in_range
+    <confspec.validation.in_range>`, :func:`positive
+    <confspec.validation.positive>`, :func:`multiple_of
+    <confspec.validation.multiple_of>` and the other bounds and modulo
+    validators check whole arrays at once when used with
+    :func:`all_validate_to <confspec.validation.all_validate_to>`.
+
+    Please note that this class is an abstract class and cannot be used by
+    itself, see :class:`ConfigNDArrayInt`, :class:`ConfigNDArrayFloat` and
+    :class:`ConfigNDArrayColor`.
+
+    .. inheritance-diagram:: ConfigNDArray
+       :parts: 1
+
+    :param dtype: The data type of the array elements, anything accepted by
+     ``numpy.dtype``. If ``None``, :attr:`default_dtype` is used.
+    :param bool strict: See :class:`ConfigList`.
+    """
+
+    __slots__ = ()
+
+    default_dtype = None
+    """Default data type of the array elements."""
+
+    def __init__(self, dtype=None, **kwargs):
+
+        # Lazy load dependencies
+        import numpy
+
+        super(ConfigNDArray, self).__init__(
+            typecode=numpy.dtype(dtype or self.default_dtype), **kwargs
+        )
+
+    def _to_array(self, elements):
+        """
+        Create an array with the given numbers, checking that integers fit
+        the data type of the array.
+        """
+        import numpy
+
+        values = numpy.asarray(elements)
+        if values.size and values.dtype.kind not in 'biuf':
+            raise ValueError(
+                'Cannot store <{}> values in an array of numbers.'.format(
+                    values.dtype
+                )
+            )
+
+        result = values.astype(self._typecode)
+        if result.dtype.kind in 'iu' and \
+                not numpy.array_equal(result, values):
+            raise ValueError(
+                'Numbers out of range of <{}>.'.format(result.dtype)
+            )
+        return result
+
+    def _concat(self, value, elements):
+        """
+        Override of :meth:`ConfigList._concat` that concatenates the arrays.
+        """
+        import numpy
+        return numpy.concatenate((value, elements))
+
+    def _without(self, value, element):
+        """
+        Override of :meth:`ConfigList._without` that compares whole rows.
+        """
+        import numpy
+
+        matches = numpy.flatnonzero(
+            (value == element).reshape(len(value), -1).all(axis=1)
+        )
+        if not len(matches):
+            raise ValueError('Element not found.')
+        return numpy.delete(value, matches[0], axis=0)
+
+
+class ConfigNDArrayInt(ConfigNDArray, ConfigInt):
+    """
+    NumPy array of :class:`ConfigInt` configuration option.
+
+    The default data type is ``int64``. Lists of plain decimal integers are
+    converted at once, lists with radix prefixes one element at a time.
+
+    .. inheritance-diagram:: ConfigNDArrayInt
+       :parts: 1
+    """
+
+    __slots__ = ('_strict', '_typecode', '_external', '_basedir')
+
+    default_dtype = 'int64'
+
+    def _parse_bulk(self, fragments):
+        """
+        Override of :meth:`ConfigArray._parse_bulk` that parses integers using
+        the radix specified by ``base``.
+        """
+        import numpy
+
+        base = _bulk_radix(self._base, fragments)
+        if base == 10:
+            return numpy.array(fragments, dtype=numpy.int64)
+        return [int(fragment, base) for fragment in fragments]
+
+
+class ConfigNDArrayFloat(ConfigNDArray, ConfigFloat):
+    """
+    NumPy array of :class:`ConfigFloat` configuration option.
+
+    The default data type is ``float64``.
+
+    .. inheritance-diagram:: ConfigNDArrayFloat
+       :parts: 1
+    """
+
+    __slots__ = ('_strict', '_typecode', '_external', '_basedir')
+
+    default_dtype = 'float64'
+
+    def _parse_bulk(self, fragments):
+        """
+        Override of :meth:`ConfigArray._parse_bulk` that parses floats,
+        formatted according to ``sformat`` if defined.
+        """
+        import numpy
+
+        if self._sformat is None:
+            return numpy.array(fragments, dtype=numpy.float64)
+        return [ConfigFloat.parse(self, fragment) for fragment in fragments]
+
+
+class ConfigNDArrayColor(ConfigNDArray, ConfigColor):
+    """
+    NumPy array of :class:`ConfigColor` configuration option.
+
+    Colors are stored as the rows of an array of shape ``(N, 3)`` and data
+    type ``uint8``.
+
+    .. inheritance-diagram:: ConfigNDArrayColor
+       :parts: 1
+    """
+
+    __slots__ = ('_strict', '_typecode', '_external', '_basedir')
+
+    default_dtype = 'uint8'
+
+    def _parse_bulk(self, fragments):
+        """
+        Override of :meth:`ConfigArray._parse_bulk` that decodes the
+        hexadecimal digits of all colors at once.
+        """
+        import numpy
+
+        digits = [fragment.strip() for fragment in fragments]
+        digits = [
+            color[1:] if color[:1] == '#' else color for color in digits
+        ]
+        if any(len(color) != 6 for color in digits):
+            raise ValueError('Colors must be in #RRGGBB format.')
+        return numpy.frombuffer(
+            unhexlify(''.join(digits)), dtype=numpy.uint8
+        ).reshape(-1, 3)
+
+    def _to_array(self, elements):
+        """
+        Override of :meth:`ConfigNDArray._to_array` that checks that the
+        array is a list of RGB colors.
+        """
+        result = super(ConfigNDArrayColor, self)._to_array(elements)
+        if not result.size:
+            return result.reshape(0, 3)
+        if result.ndim != 2 or result.shape[1] != 3:
+            raise ValueError('Colors must be RGB tuples.')
+        return result
+
+    def repr(self, value):
+        """
+        Override of :meth:`ConfigArray.repr` that encodes the hexadecimal
+        digits of all colors at once.
+        """
+        digits = hexlify(value.astype('uint8').tobytes())
+        digits = digits.decode('ascii').upper()
+        return ['#' + digits[i:i + 6] for i in range(0, len(digits), 6)]
+
+    def __repr__(self):
+        return ConfigList.__repr__(self)
+
+
+def _file_stamp(path):
+    """
+    Return a stamp of the file at the given path that changes when the file
+    is modified or replaced.
+    """
+    st = stat(path)
+    return (st.st_ino, st.st_size, st.st_mtime)
+
+
+class ConfigNDArrayFile(ConfigFile):
+    """
+    Configuration option of type NumPy array stored in a file.
+
+    Use this configuration when you want to keep a large table or matrix
+    alongside the configuration. The configuration value is the path to a
+    ``.npy`` file, or to a raw binary file of the given ``dtype`` for any
+    other extension, and the value of the option is a read-only
+    ``numpy.memmap`` of the file. Mapped files are shared by all processes
+    through the page cache instead of each process loading its own copy.
+
+    The file is mapped when the value is set. Use :meth:`reload`, or
+    :meth:`ConfigMg.reload() <confspec.manager.ConfigMg.reload>` to notify
+    the listeners, to map it again if it changed (it was modified or
+    replaced) since then.
+
+    Internal representation of the object is a Python tuple of
+    ``(path, stamp, array)``. Validators are given the array. When pickled,
+    only the path is kept and the file is mapped again on first access.
+    NumPy is lazy-loaded.
+
+    .. inheritance-diagram:: ConfigNDArrayFile
+       :parts: 1
+
+    :param dtype: The data type of the array elements, anything accepted by
+     ``numpy.dtype``. Required for raw binary files. If ``None``, ``.npy``
+     files of any data type are accepted.
+    :param tuple shape: The shape of the array. An axis of size ``None``
+     accepts any size, for raw binary files at most one axis can be
+     ``None`` and its size is computed from the size of the file. If
+     ``None``, ``.npy`` files of any shape are accepted and raw binary files
+     are mapped as one-dimensional arrays.
+    """
+
+    __slots__ = ('_dtype', '_shape')
+
+    def __init__(self, dtype=None, shape=None, **kwargs):
+
+        # Lazy load dependencies
+        import numpy
+
+        self._dtype = None if dtype is None else numpy.dtype(dtype)
+        self._shape = None if shape is None else tuple(shape)
+        super(ConfigNDArrayFile, self).__init__(**kwargs)
+
+    @ConfigOpt.value.getter
+    def value(self):
+        return self._resolve()[2]
+
+    def reload(self):
+        """
+        Override of :meth:`ConfigOpt.reload` that maps the file again if it
+        changed since it was mapped. If the changed file fails to map or
+        validate, the error is raised and the previous array is kept. If the
+        file was removed, the previous array is kept too, as the mapping is
+        still valid.
+        """
+        path, stamp, array = self._resolve()
+        try:
+            current = _file_stamp(path)
+        except OSError:
+            return False
+        if current == stamp:
+            return False
+
+        self._assign(self.parse(path))
+        return True
+
+    def _raw_shape(self, path):
+        """
+        Compute the shape of the raw binary file at the given path.
+        """
+        shape = self._shape
+        if shape is None:
+            return None
+
+        if shape.count(None) > 1:
+            raise ValueError(
+                'Shape <{}> of raw file <{}> is ambiguous.'.format(
+                    shape, path
+                )
+            )
+
+        known = self._dtype.itemsize
+        for size in shape:
+            if size is not None:
+                known *= size
+
+        items, remainder = divmod(getsize(path), known) if known else (0, 1)
+        if remainder or (None not in shape and items != 1):
+            raise ValueError(
+                'Size of raw file <{}> does not match shape <{}>.'.format(
+                    path, shape
+                )
+            )
+        return tuple(items if size is None else size for size in shape)
+
+    def _map(self, path):
+        """
+        Map the file at the given path and check its data type and shape.
+        """
+        import numpy
+
+        if path.endswith('.npy'):
+            array = numpy.load(path, mmap_mode='r')
+        elif self._dtype is None:
+            raise ValueError(
+                'Cannot map raw file <{}> without a dtype.'.format(path)
+            )
+        else:
+            array = numpy.memmap(
+                path, dtype=self._dtype, mode='r',
+                shape=self._raw_shape(path)
+            )
+
+        if self._dtype is not None and array.dtype != self._dtype:
+            raise ValueError(
+                'Array in <{}> is of type <{}>, expected <{}>.'.format(
+                    path, array.dtype, self._dtype
+                )
+            )
+
+        shape = self._shape
+        if shape is not None and (
+                len(array.shape) != len(shape) or any(
+                    size is not None and size != actual
+                    for size, actual in zip(shape, array.shape))):
+            raise ValueError(
+                'Array in <{}> is of shape <{}>, expected <{}>.'.format(
+                    path, array.shape, shape
+                )
+            )
+        return array
+
+    def parse(self, value):
+        """
+        Override of :meth:`ConfigFile.parse` that maps the file at the given
+        path.
+        """
+        path = super(ConfigNDArrayFile, self).parse(value)
+        stamp = _file_stamp(path)
+        return (path, stamp, self._map(path))
+
+    def _assign(self, parsed):
+        """
+        Override of :meth:`ConfigOpt._assign` that validates the array.
+        """
+        check = self._check
+        if check is not None and not check(parsed[2]):
+            raise ValueError(
+                '[{}] cannot accept <{}>. '
+                'Could not be validated.'.format(
+                    self._key, parsed[0]
+                )
+            )
+
+        self._value = parsed
+        self._raw = _resolved
+
+    def repr(self, value):
+        """
+        Override of :meth:`ConfigFile.repr` that returns the path of the file.
+        """
+        return value[0]
+
+    def __getstate__(self):
+        """
+        Override of :meth:`ConfigOpt.__getstate__` that leaves the array out,
+        keeping only the path to map the file again.
+        """
+        state = super(ConfigNDArrayFile, self).__getstate__()
+        if '_raw' not in state:
+            state['_raw'] = self._value[0]
+        state['_value'] = None
+        return state
 
 
 # Export ConfigOpt subclasses only
 __all__ = [
     key for key, value in dict(locals()).items()
-    if isclass(value) and issubclass(value, ConfigOpt)
+    if isinstance(value, type) and issubclass(value, ConfigOpt)
 ]
@@ -21,11 +21,155 @@ Module for import/export format providers.
 
 from __future__ import absolute_import, division, print_function
 
+import sys
+import logging as log
+from traceback import format_exc
+from importlib import import_module
 
-__all__ = ['providers', 'FormatProvider']
+try:
+    from collections.abc import Mapping, MutableMapping
+except ImportError:
+    from collections import Mapping, MutableMapping
 
 
-providers = {}
+__all__ = ['providers', 'FormatProvider', 'ProviderRegistry']
+
+
+class ProviderRegistry(MutableMapping):
+    """
+    Registry of format providers by format name.
+
+    Format providers can be registered as classes or lazily, as a
+    ``'module:ClassName'`` string. Lazily registered providers are imported
+    the first time they are requested. Third party format providers are
+    discovered from the ``confspec.providers`` entry point group, for example,
+    in a ``setup.py``:
+
+    .. code:: python
+
+       entry_points={
+           'confspec.providers': [
+               'yaml = mypackage.yaml:YAMLFormatProvider',
+           ],
+       }
+
+    Entry points are only looked up when a format is not found among the
+    registered ones, or when all formats are listed.
+
+    :param dict lazy: Mapping of format names to ``'module:ClassName'``
+     strings.
+    """
+
+    entry_point_group = 'confspec.providers'
+    """Entry point group used to discover third party format providers."""
+
+    def __init__(self, lazy=None):
+        # Note: the 'dict' builtin is shadowed by the submodule of this package
+        self._providers = {}
+        self._lazy = {}
+        self._lazy.update(lazy or {})
+        self._discovered = False
+
+    def register(self, name, target):
+        """
+        Lazily register a format provider.
+
+        :param str name: Name of the format.
+        :param str target: Location of the format provider class as a
+         ``'module:ClassName'`` string.
+        """
+        self._providers.pop(name, None)
+        self._lazy[name] = target
+
+    def _discover(self):
+        """
+        Register the format providers declared as entry points, if not done
+        already. Already registered formats take precedence.
+        """
+        if self._discovered:
+            return
+        self._discovered = True
+
+        try:
+            from importlib.metadata import entry_points
+        except ImportError:
+            try:
+                from pkg_resources import iter_entry_points
+            except ImportError:
+                return
+            points = iter_entry_points(self.entry_point_group)
+        else:
+            points = entry_points()
+            if hasattr(points, 'select'):
+                points = points.select(group=self.entry_point_group)
+            else:
+                points = points.get(self.entry_point_group, [])
+
+        for point in points:
+            if point.name not in self:
+                self._lazy[point.name] = point
+
+    def _load(self, name):
+        """
+        Import a lazily registered format provider.
+        """
+        target = self._lazy[name]
+
+        if isinstance(target, str):
+            module, attr = target.split(':')
+            provider = getattr(import_module(module), attr)
+        else:
+            provider = target.load()
+
+        # Modules may register their providers themselves on import
+        if name in self._lazy:
+            del self._lazy[name]
+            self._providers[name] = provider
+        return self._providers[name]
+
+    def __getitem__(self, name):
+        if name in self._providers:
+            return self._providers[name]
+        if name not in self._lazy:
+            self._discover()
+        if name not in self._lazy:
+            raise KeyError(name)
+        return self._load(name)
+
+    def __setitem__(self, name, provider):
+        self._lazy.pop(name, None)
+        self._providers[name] = provider
+
+    def __delitem__(self, name):
+        if name in self._providers:
+            del self._providers[name]
+        else:
+            del self._lazy[name]
+
+    def __contains__(self, name):
+        if name in self._providers or name in self._lazy:
+            return True
+        self._discover()
+        return name in self._lazy
+
+    def __iter__(self):
+        self._discover()
+        return iter(sorted(set(self._providers) | set(self._lazy)))
+
+    def __len__(self):
+        self._discover()
+        return len(set(self._providers) | set(self._lazy))
+
+    def __repr__(self):
+        return '{}({})'.format(type(self).__name__, list(self))
+
+
+providers = ProviderRegistry({
+    'ini': __name__ + '.ini:INIFormatProvider',
+    'json': __name__ + '.json:JSONFormatProvider',
+    'dict': __name__ + '.dict:DictFormatProvider',
+    'binary': __name__ + '.binary:BinaryFormatProvider',
+})
 
 
 class FormatProvider(object):
@@ -34,6 +178,33 @@ class FormatProvider(object):
     Format providers allow to import and export in a particular format.
     """
 
+    binary = False
+    """
+    If ``True``, the format is a binary format. Strings given to
+    :meth:`do_import` and returned by :meth:`do_export` are then ``bytes`` and
+    files are read and written in binary mode.
+    """
+
+    extensions = ()
+    """
+    File name extensions (lowercase, including the leading dot) of files
+    encoded in the format provided by this object.
+    """
+
+    @classmethod
+    def sniff(cls, head):
+        """
+        Guess if the given first bytes of a file are encoded in the format
+        provided by this object.
+
+        Subclasses should override this function to allow the detection of the
+        format of files with unknown extensions.
+
+        :param bytes head: The first bytes of a file.
+        :rtype: ``True`` if the bytes look like this format.
+        """
+        return False
+
     @classmethod
     def do_import(cls, cfmg, string):
         """
@@ -49,6 +220,42 @@ class FormatProvider(object):
         """
         raise NotImplementedError()
 
+    @classmethod
+    def do_import_stream(cls, cfmg, stream):
+        """
+        Interpret a file-like object encoded in the format provided by this
+        object and import the configuration within.
+
+        By default, the whole stream is read and passed to :meth:`do_import`.
+        Subclasses able to import incrementally may override this function.
+
+        :param ConfigMg cfmg: The Config Manager object handling the
+         configuration specification. See :class:`confspec.manager.ConfigMg`.
+        :param stream: A file-like object with a ``read()`` method.
+        """
+        cls.do_import(cfmg, stream.read())
+
+    @classmethod
+    def do_import_buffer(cls, cfmg, buf):
+        """
+        Interpret a bytes-like buffer encoded in the format provided by this
+        object and import the configuration within.
+
+        This is used to import memory-mapped files. By default, the whole
+        buffer is copied (and decoded as UTF-8 for non binary formats) and
+        passed to :meth:`do_import`. Subclasses able to scan the buffer in
+        place may override this function.
+
+        :param ConfigMg cfmg: The Config Manager object handling the
+         configuration specification. See :class:`confspec.manager.ConfigMg`.
+        :param buf: A bytes-like object, like ``bytes``, ``bytearray``,
+         :py:class:`memoryview` or :py:class:`mmap.mmap`.
+        """
+        string = bytes(buf[:])
+        if not cls.binary:
+            string = string.decode('utf-8')
+        cls.do_import(cfmg, string)
+
     @classmethod
     def do_export(cls, cfmg):
         """
@@ -64,7 +271,103 @@ class FormatProvider(object):
         """
         raise NotImplementedError()
 
+    @classmethod
+    def _import_categories(cls, cfmg, as_dict, native=False):
+        """
+        Import a dictionary of categories to dictionaries of options.
+
+        :param bool native: Values are native Python objects instead of
+         string representations. See :meth:`ConfigMg.import_mapping
+         <confspec.manager.ConfigMg.import_mapping>`.
+        """
+        for category, options in as_dict.items():
+            cls._import_category(cfmg, category, options, native=native)
+
+    @classmethod
+    def _import_category(cls, cfmg, category, options, native=False):
+        """
+        Import a dictionary of options that belong to the given category.
+        """
+        keys = cfmg._keys
+        categories = cfmg._categories
+
+        # Skip the categories not requested silently
+        if category in cfmg._skipped:
+            return
+
+        # Check datatype
+        if not isinstance(options, Mapping):
+            if not cfmg._safe:
+                raise SyntaxError(
+                    'Malformed category "{}".'.format(category)
+                )
+            log.error(
+                'Ignoring malformed category "{}".'.format(category)
+            )
+            return
+
+        # Consider only the categories included in the specification
+        if category not in categories:
+            log.error(
+                'Ignoring unknown category "{}".'.format(category)
+            )
+            return
+
+        # Iterate options
+        for key, value in options.items():
+
+            # Consider only known keys
+            if key not in keys:
+                log.error('Ignoring unknown key "{}".'.format(key))
+                continue
+
+            # Check if key belongs to the category we are in
+            if keys[key].category != category:
+                msg = (
+                    'Key "{}" should belong to category "{}", '
+                    'found in "{}" instead.'.format(
+                        key, keys[key].category, category
+                    )
+                )
+                if not cfmg._safe:
+                    raise SyntaxError(msg)
+                log.error(msg)
+                continue
+
+            # Everything ok, try to set the value of the option
+            try:
+                cfmg._set(key, value, native=native)
+            except Exception as e:
+                if not cfmg._safe:
+                    raise e
+                log.error(format_exc())
+
+
+# Import built-in format providers on demand
+_lazy_attributes = {
+    'INIFormatProvider': 'ini',
+    'JSONFormatProvider': 'json',
+    'DictFormatProvider': 'dict',
+    'BinaryFormatProvider': 'binary',
+}
+
+
+def __getattr__(name):
+    if name in _lazy_attributes:
+        module = import_module('.' + _lazy_attributes[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(
+        'module {!r} has no attribute {!r}'.format(__name__, name)
+    )
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_attributes))
+
 
-from .ini import *  # noqa
-from .json import *  # noqa
-from .dict import *  # noqa
+# Module __getattr__ requires Python 3.7 (PEP 562)
+if sys.version_info < (3, 7):
+    from .ini import *  # noqa
+    from .json import *  # noqa
+    from .dict import *  # noqa
+    from .binary import *  # noqa
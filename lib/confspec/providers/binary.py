@@ -0,0 +1,462 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2014 Carlos Jenkins <carlos@jenkins.co.cr>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Compact binary format provider for confspec.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import logging as log
+from traceback import format_exc
+from hashlib import sha1
+from struct import Struct
+from datetime import datetime, date, time, timedelta, tzinfo
+
+try:
+    from datetime import timezone
+except ImportError:
+    timezone = None
+
+from . import FormatProvider, providers
+from ..options import (
+    ConfigList, ConfigBoolean, ConfigInt, ConfigFloat, ConfigDateTime,
+    ConfigDate, ConfigTime, ConfigColor, ConfigString, ConfigText, ConfigPath,
+    ConfigNDArrayFile, ConfigDict
+)
+
+
+__all__ = ['BinaryFormatProvider']
+
+
+# -----------------------------------------------------------------------------
+# Value codecs
+# -----------------------------------------------------------------------------
+# A codec is a pair of functions (write, read):
+#
+#   write(out, value) appends the encoded value to the bytearray ``out``.
+#   read(buf, pos) decodes a value from ``buf`` at ``pos`` and returns
+#   ``(value, new_pos)``.
+
+_double = Struct('<d')
+_datetime = Struct('<HBBBBBI')
+_date = Struct('<HBB')
+_time = Struct('<BBBI')
+_color = Struct('<BBB')
+
+
+def _write_varint(out, num):
+    while num > 0x7F:
+        out.append((num & 0x7F) | 0x80)
+        num >>= 7
+    out.append(num)
+
+
+def _read_varint(buf, pos):
+    num = 0
+    shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        num |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return num, pos
+        shift += 7
+
+
+def _write_int(out, num):
+    # Zigzag encoding, so small negative numbers are small too
+    _write_varint(out, num * 2 if num >= 0 else -num * 2 - 1)
+
+
+def _read_int(buf, pos):
+    num, pos = _read_varint(buf, pos)
+    return (num >> 1) if not num & 1 else -((num + 1) >> 1), pos
+
+
+def _write_bool(out, value):
+    out.append(1 if value else 0)
+
+
+def _read_bool(buf, pos):
+    return buf[pos] != 0, pos + 1
+
+
+def _write_float(out, value):
+    out.extend(_double.pack(value))
+
+
+def _read_float(buf, pos):
+    return _double.unpack_from(buf, pos)[0], pos + _double.size
+
+
+def _write_str(out, value):
+    encoded = value.encode('utf-8')
+    _write_varint(out, len(encoded))
+    out.extend(encoded)
+
+
+def _read_str(buf, pos):
+    size, pos = _read_varint(buf, pos)
+    end = pos + size
+    if end > len(buf):
+        raise ValueError('Truncated string.')
+    return bytes(buf[pos:end]).decode('utf-8'), end
+
+
+class _FixedOffset(tzinfo):
+    """
+    Timezone with a fixed offset from UTC, for Python versions without
+    :py:class:`datetime.timezone`.
+    """
+
+    def __init__(self, offset):
+        self._offset = offset
+
+    def utcoffset(self, dt):
+        return self._offset
+
+    def dst(self, dt):
+        return timedelta(0)
+
+    def tzname(self, dt):
+        return None
+
+    def __reduce__(self):
+        return type(self), (self._offset, )
+
+
+def _write_offset(out, value):
+    """
+    Write the UTC offset of a datetime or time, in microseconds, preceded by
+    a flag that tells if the value is aware.
+    """
+    offset = value.utcoffset()
+    if offset is None:
+        _write_varint(out, 0)
+        return
+    _write_varint(out, 1)
+    _write_int(
+        out,
+        (offset.days * 86400 + offset.seconds) * 1000000 + offset.microseconds
+    )
+
+
+def _read_offset(buf, pos):
+    """
+    Read the timezone written by :func:`_write_offset`, or ``None`` for naive
+    values.
+    """
+    aware, pos = _read_varint(buf, pos)
+    if not aware:
+        return None, pos
+    offset, pos = _read_int(buf, pos)
+    offset = timedelta(microseconds=offset)
+    if timezone is None:
+        return _FixedOffset(offset), pos
+    return timezone(offset), pos
+
+
+def _write_datetime(out, value):
+    out.extend(_datetime.pack(
+        value.year, value.month, value.day,
+        value.hour, value.minute, value.second, value.microsecond
+    ))
+    _write_offset(out, value)
+
+
+def _read_datetime(buf, pos):
+    fields = _datetime.unpack_from(buf, pos)
+    tz, pos = _read_offset(buf, pos + _datetime.size)
+    return datetime(*fields, tzinfo=tz), pos
+
+
+def _write_date(out, value):
+    out.extend(_date.pack(value.year, value.month, value.day))
+
+
+def _read_date(buf, pos):
+    return date(*_date.unpack_from(buf, pos)), pos + _date.size
+
+
+def _write_time(out, value):
+    out.extend(_time.pack(
+        value.hour, value.minute, value.second, value.microsecond
+    ))
+    _write_offset(out, value)
+
+
+def _read_time(buf, pos):
+    fields = _time.unpack_from(buf, pos)
+    tz, pos = _read_offset(buf, pos + _time.size)
+    return time(*fields, tzinfo=tz), pos
+
+
+def _write_color(out, value):
+    out.extend(_color.pack(*value))
+
+
+def _read_color(buf, pos):
+    return _color.unpack_from(buf, pos), pos + _color.size
+
+
+# Order matters, subclasses must be listed before their parents. Classes
+# without a codec are encoded as their string representation.
+_element_codecs = [
+    (ConfigDict, None),
+    (ConfigBoolean, (_write_bool, _read_bool)),
+    (ConfigInt, (_write_int, _read_int)),
+    (ConfigFloat, (_write_float, _read_float)),
+    (ConfigDate, (_write_date, _read_date)),
+    (ConfigTime, (_write_time, _read_time)),
+    (ConfigDateTime, (_write_datetime, _read_datetime)),
+    (ConfigColor, (_write_color, _read_color)),
+    (ConfigString, (_write_str, _read_str)),
+    (ConfigText, (_write_str, _read_str)),
+    (ConfigNDArrayFile, None),
+    (ConfigPath, (_write_str, _read_str)),
+]
+
+
+def _list_codec(element_codec):
+    write_element, read_element = element_codec
+
+    def write(out, value):
+        _write_varint(out, len(value))
+        for element in value:
+            write_element(out, element)
+
+    def read(buf, pos):
+        size, pos = _read_varint(buf, pos)
+        elements = []
+        for _ in range(size):
+            element, pos = read_element(buf, pos)
+            elements.append(element)
+        return elements, pos
+
+    return write, read
+
+
+def _codec_for_class(cls):
+    """
+    Find the native codec of a :class:`ConfigOpt` subclass, or ``None`` if its
+    values cannot be encoded natively.
+    """
+    if issubclass(cls, ConfigList):
+        element_codec = _codec_for_class(cls._find_provider())
+        if element_codec is None:
+            return None
+        return _list_codec(element_codec)
+
+    for base, codec in _element_codecs:
+        if issubclass(cls, base):
+            return codec
+    return None
+
+
+class BinaryFormatProvider(FormatProvider):
+    """
+    Compact binary format provider.
+
+    This format is meant to ship configuration between processes sharing the
+    same specification, not to be edited by humans. The encoded configuration
+    starts with a header that includes a fingerprint of the specification and
+    is followed by one length-prefixed record per option.
+
+    Values of the basic datatypes, time, color and file system options, and
+    lists of them, are encoded natively according to their type and are set
+    directly, without going through :meth:`ConfigOpt.parse
+    <confspec.options.ConfigOpt.parse>`. Values of any other option are
+    encoded as their string representation, as the INI format provider does.
+
+    Aware datetimes and times are encoded with their offset from UTC and
+    decoded with a timezone of that fixed offset, so the names and daylight
+    saving rules of their timezones are not kept.
+    """
+
+    binary = True
+
+    magic = b'CSPB\x02'
+    """Magic bytes (and format version) that start the encoded string."""
+
+    extensions = ('.bin', )
+
+    _codecs = {}
+
+    @classmethod
+    def sniff(cls, head):
+        """
+        Detect the magic bytes at the beginning.
+
+        See :meth:`FormatProvider.sniff`.
+        """
+        return head.startswith(cls.magic)
+
+    @classmethod
+    def fingerprint(cls, cfmg):
+        """
+        Compute the fingerprint of the specification handled by the given
+        configuration manager.
+
+        :param ConfigMg cfmg: The Config Manager object handling the
+         configuration specification. See :class:`confspec.manager.ConfigMg`.
+        :rtype: An 8 bytes ``bytes`` object.
+        """
+        signature = '\n'.join(
+            '{} {} {}'.format(opt.key, opt.category, type(opt).__name__)
+            for opt in sorted(cfmg._spec)
+        )
+        return sha1(signature.encode('utf-8')).digest()[:8]
+
+    @classmethod
+    def _codec(cls, option):
+        """
+        Return the ``(native, write, read)`` codec for the given option.
+        """
+        option_cls = type(option)
+        if option_cls not in cls._codecs:
+            codec = _codec_for_class(option_cls)
+            if codec is None:
+                cls._codecs[option_cls] = (False, _write_str, _read_str)
+            else:
+                cls._codecs[option_cls] = (True, ) + codec
+        return cls._codecs[option_cls]
+
+    @classmethod
+    def do_import(cls, cfmg, string):
+        """
+        Binary decoder implementation.
+
+        See :meth:`FormatProvider.do_import`.
+
+        :param string: The bytes with the encoded configuration, or any other
+         bytes-like object.
+        :type string: bytes
+        """
+        skipped = cfmg._skipped
+        options = sorted(cfmg._spec)
+        header = len(cls.magic) + 8
+
+        # Check header
+        try:
+            buf = memoryview(string)
+            if bytes(buf[:len(cls.magic)]) != cls.magic:
+                raise ValueError('Not a binary configuration.')
+            num_records, pos = _read_varint(buf, header)
+        except Exception as e:
+            if not cfmg._safe:
+                raise e
+            log.error(format_exc())
+            return
+
+        if bytes(buf[len(cls.magic):header]) != cls.fingerprint(cfmg):
+            msg = 'Binary configuration belongs to another specification.'
+            if not cfmg._safe:
+                raise SyntaxError(msg)
+            log.error(msg)
+            return
+
+        # Iterate records
+        for _ in range(num_records):
+            try:
+                index, pos = _read_varint(buf, pos)
+                size, pos = _read_varint(buf, pos)
+            except Exception as e:
+                if not cfmg._safe:
+                    raise e
+                log.error(format_exc())
+                return
+
+            start, pos = pos, pos + size
+            if pos > len(buf) or index >= len(options):
+                msg = 'Malformed record for option #{}.'.format(index)
+                if not cfmg._safe:
+                    raise ValueError(msg)
+                log.error(msg)
+                return
+
+            option = options[index]
+
+            # Skip the categories not requested
+            if option.category in skipped:
+                continue
+
+            # Everything ok, try to set the value of the option
+            try:
+                native, write, read = cls._codec(option)
+                value, end = read(buf[:pos], start)
+                if end != pos:
+                    raise ValueError(
+                        'Malformed record for option "{}".'.format(
+                            option.key
+                        )
+                    )
+                cfmg._set(option.key, value, native=native)
+            except Exception as e:
+                if not cfmg._safe:
+                    raise e
+                log.error(format_exc())
+
+    @classmethod
+    def do_import_buffer(cls, cfmg, buf):
+        """
+        Binary decoder implementation over a bytes-like buffer. Records are
+        decoded in place, the buffer is never copied.
+
+        See :meth:`FormatProvider.do_import_buffer`.
+        """
+        cls.do_import(cfmg, buf)
+
+    @classmethod
+    def do_export(cls, cfmg):
+        """
+        Binary encoder implementation.
+
+        See :meth:`FormatProvider.do_export`.
+
+        :rtype: A ``bytes`` object with the encoded configuration.
+        """
+        categories = cfmg._categories
+
+        output = bytearray(cls.magic)
+        output.extend(cls.fingerprint(cfmg))
+
+        records = bytearray()
+        num_records = 0
+        record = bytearray()
+
+        for index, option in enumerate(sorted(cfmg._spec)):
+            if option.category not in categories:
+                continue
+
+            native, write, read = cls._codec(option)
+            del record[:]
+            if native:
+                write(record, option._resolve())
+            else:
+                write(record, str(repr(option)))
+
+            _write_varint(records, index)
+            _write_varint(records, len(record))
+            records.extend(record)
+            num_records += 1
+
+        _write_varint(output, num_records)
+        output.extend(records)
+        return bytes(output)
+
+providers['binary'] = BinaryFormatProvider
@@ -24,6 +24,8 @@ from __future__ import absolute_import, division, print_function
 import logging as log
 from traceback import format_exc
 from pprint import pformat
+from ast import literal_eval
+from re import compile as regex
 
 from . import FormatProvider, providers
 
@@ -35,10 +37,27 @@ class DictFormatProvider(FormatProvider):
     """
     Python dictionary format provider.
 
-    .. warning:: This provider uses :py:func:`eval` function.
-       Use with care.
+    This provider uses Python's :py:func:`ast.literal_eval` function, so only
+    Python literals (strings, numbers, booleans, lists, dictionaries, etc) are
+    accepted.
+
+    To import configuration already held in a Python dictionary use
+    :meth:`confspec.manager.ConfigMg.import_mapping` instead.
     """
 
+    extensions = ('.dict', )
+
+    _compiled_sniff_regex = regex(br"\s*{\s*'")
+
+    @classmethod
+    def sniff(cls, head):
+        """
+        Detect a dictionary with a single quoted key at the beginning.
+
+        See :meth:`FormatProvider.sniff`.
+        """
+        return cls._compiled_sniff_regex.match(head) is not None
+
     @classmethod
     def do_import(cls, cfmg, string):
         """
@@ -47,12 +66,9 @@ class DictFormatProvider(FormatProvider):
         See :meth:`FormatProvider.do_import`.
         """
 
-        keys = cfmg._keys
-        categories = cfmg._categories
-
         # Evaluate string
         try:
-            as_dict = eval(string)
+            as_dict = literal_eval(string)
         except Exception as e:
             if not cfmg._safe:
                 raise e
@@ -68,54 +84,7 @@ class DictFormatProvider(FormatProvider):
             return
 
         # Iterate categories
-        for category, options in as_dict.items():
-
-            # Check datatype
-            if type(options) != dict:
-                if not cfmg._safe:
-                    raise SyntaxError(
-                        'Malformed category "{}".'.format(category)
-                    )
-                log.error(
-                    'Ignoring malformed category "{}".'.format(category)
-                )
-                continue
-
-            # Consider only the categories included in the specification
-            if category not in categories:
-                log.error(
-                    'Ignoring unknown category "{}".'.format(category)
-                )
-                continue
-
-            # Iterate options
-            for key, value in options.items():
-
-                # Consider only known keys
-                if key not in keys:
-                    log.error('Ignoring unknown key "{}".'.format(key))
-                    continue
-
-                # Check if key belongs to the category we are in
-                if keys[key].category != category:
-                    msg = (
-                        'Key "{}" should belong to category "{}", '
-                        'found in "{}" instead.'.format(
-                            key, keys[key].category, category
-                        )
-                    )
-                    if not cfmg._safe:
-                        raise SyntaxError(msg)
-                    log.error(msg)
-                    continue
-
-                # Everything ok, try to set the value of the option
-                try:
-                    cfmg.set(key, value)
-                except Exception as e:
-                    if not cfmg._safe:
-                        raise e
-                    log.error(format_exc())
+        cls._import_categories(cfmg, as_dict)
 
     @classmethod
     def do_export(cls, cfmg):
@@ -132,7 +101,7 @@ class DictFormatProvider(FormatProvider):
         # FIXME: Add support for comments?
         as_dict = {
             cat: {
-                opt.key: opt.repr(opt._value) for opt in categories[cat]
+                opt.key: opt._export() for opt in categories[cat]
             } for cat in categories
         }
 
@@ -46,6 +46,30 @@ class INIFormatProvider(FormatProvider):
     """Regular expression that matches properties."""
     _compiled_property_regex = regex(property_regex)
 
+    # Regular expressions used to match lines in place in bytes buffers
+    _compiled_bspace_regex = regex(br'[ \t\r\f\v]*')
+    _compiled_bsection_regex = regex(br'\[ *(?P<section>\w+) *]\s*$')
+    _compiled_bproperty_regex = regex(
+        br'(?P<key>\w+) *= *(?P<value>.*\S)\s*$'
+    )
+
+    # Regular expressions that find the line of the next section
+    _compiled_next_section_regex = regex(r'(?m)^[ \t\r\f\v]*\[')
+    _compiled_bnext_section_regex = regex(br'(?m)^[ \t\r\f\v]*\[')
+
+    extensions = ('.ini', '.conf', '.cfg')
+
+    _compiled_sniff_regex = regex(br'\s*(?:[\[;]|\w+ *=)')
+
+    @classmethod
+    def sniff(cls, head):
+        """
+        Detect a section, a comment or a property at the beginning.
+
+        See :meth:`FormatProvider.sniff`.
+        """
+        return cls._compiled_sniff_regex.match(head) is not None
+
     @classmethod
     def do_import(cls, cfmg, string):
         """
@@ -53,12 +77,18 @@ class INIFormatProvider(FormatProvider):
 
         See :meth:`FormatProvider.do_import`.
         """
-        keys = cfmg._keys
-        categories = cfmg._categories
         section = 'general'
+        pos = 0
+        size = len(string)
+        lnum = 0
 
-        for lnum, line in enumerate(string.split('\n'), 1):
-            line = line.strip()
+        while pos < size:
+            lnum += 1
+            end = string.find('\n', pos)
+            if end < 0:
+                end = size
+            line = string[pos:end].strip()
+            pos = end + 1
 
             # Ignore comments and empty lines
             if not line or line.startswith(';'):
@@ -68,6 +98,13 @@ class INIFormatProvider(FormatProvider):
             match = cls._compiled_section_regex.match(line)
             if match:
                 section = match.group('section')
+
+                # Jump to the next section if not requested
+                if section in cfmg._skipped:
+                    pos, lnum = cls._next_section(
+                        cls._compiled_next_section_regex, string, '\n', pos,
+                        lnum
+                    )
                 continue
 
             # Parse a property
@@ -84,33 +121,124 @@ class INIFormatProvider(FormatProvider):
                 )
                 continue
 
-            key = match.group('key')
+            cls._import_property(
+                cfmg, section, match.group('key'), match.group('value')
+            )
+
+    @classmethod
+    def do_import_buffer(cls, cfmg, buf):
+        """
+        INI parser implementation over a bytes-like buffer.
+
+        Lines are matched in place in the buffer. Only the sections, keys and
+        values of the properties that are actually imported are decoded.
+
+        See :meth:`FormatProvider.do_import_buffer`.
+        """
+        if isinstance(buf, memoryview):
+            buf = buf.tobytes()
+
+        section = 'general'
+        pos = 0
+        size = len(buf)
+        lnum = 0
 
-            # Consider only the sections and keys in the specification
-            if section not in categories or key not in keys:
-                log.error('Ignoring "{}" in [{}].'.format(key, section))
+        while pos < size:
+            lnum += 1
+            start = cls._compiled_bspace_regex.match(buf, pos).end()
+            end = buf.find(b'\n', pos)
+            if end < 0:
+                end = size
+            pos = end + 1
+
+            # Ignore comments and empty lines
+            if start >= end or buf[start:start + 1] == b';':
                 continue
 
-            # Check if key belongs to the section we are in
-            if keys[key].category != section:
-                msg = (
-                    'Property "{}" should belong to section "[{}]", '
-                    'found in "[{}]" instead.'.format(
-                        key, keys[key].category, section
+            # Change section we are if a new section is found
+            match = cls._compiled_bsection_regex.match(buf, start, end)
+            if match:
+                section = match.group('section').decode('ascii')
+
+                # Jump to the next section if not requested
+                if section in cfmg._skipped:
+                    pos, lnum = cls._next_section(
+                        cls._compiled_bnext_section_regex, buf, b'\n', pos,
+                        lnum
                     )
-                )
-                if not cfmg._safe:
-                    raise SyntaxError(msg)
-                log.error(msg)
                 continue
 
-            # Everything ok, try to set the value of the property
-            try:
-                cfmg.set(key, match.group('value').strip())
-            except Exception as e:
+            # Parse a property
+            match = cls._compiled_bproperty_regex.match(buf, start, end)
+            if not match:
+                line = buf[start:end].decode('utf-8', 'replace').strip()
                 if not cfmg._safe:
-                    raise e
-                log.error(format_exc())
+                    raise SyntaxError(
+                        'Cannot parse line {} : "{}".'.format(lnum, line)
+                    )
+                log.error(
+                    'Parse error, ignoring line {} "{}".'.format(
+                        lnum, line
+                    )
+                )
+                continue
+
+            cls._import_property(
+                cfmg, section, match.group('key').decode('ascii'),
+                match.group('value')
+            )
+
+    @staticmethod
+    def _next_section(next_section_regex, string, newline, pos, lnum):
+        """
+        Find the line of the next section, starting at the given position.
+
+        :rtype: The position of that line and the number of the line before.
+        """
+        match = next_section_regex.search(string, pos)
+        end = match.start() if match else len(string)
+        return end, lnum + string[pos:end].count(newline)
+
+    @classmethod
+    def _import_property(cls, cfmg, section, key, value):
+        """
+        Import a property found in the given section. The value can be given
+        as ``bytes``, in which case it is decoded only if imported.
+        """
+        keys = cfmg._keys
+        categories = cfmg._categories
+
+        # Skip the sections not requested silently
+        if section in cfmg._skipped:
+            return
+
+        # Consider only the sections and keys in the specification
+        if section not in categories or key not in keys:
+            log.error('Ignoring "{}" in [{}].'.format(key, section))
+            return
+
+        # Check if key belongs to the section we are in
+        if keys[key].category != section:
+            msg = (
+                'Property "{}" should belong to section "[{}]", '
+                'found in "[{}]" instead.'.format(
+                    key, keys[key].category, section
+                )
+            )
+            if not cfmg._safe:
+                raise SyntaxError(msg)
+            log.error(msg)
+            return
+
+        # Everything ok, try to set the value of the property
+        try:
+            if isinstance(value, bytes):
+                value = value.decode('utf-8')
+            cfmg.set(key, value.strip())
+        except Exception as e:
+            if not cfmg._safe:
+                raise e
+            log.error(format_exc())
 
     @classmethod
     def do_export(cls, cfmg):
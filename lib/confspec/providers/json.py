@@ -23,7 +23,10 @@ from __future__ import absolute_import, division, print_function
 
 import logging as log
 from traceback import format_exc
-from json import loads, dumps
+from re import compile as regex
+from io import StringIO
+from codecs import getincrementaldecoder
+from json import loads, dumps, JSONDecoder
 
 from . import FormatProvider, providers
 
@@ -38,17 +41,46 @@ class JSONFormatProvider(FormatProvider):
     This provider uses Python's json module.
     """
 
+    chunk_size = 64 * 1024
+    """
+    Number of characters read from the stream at a time by
+    :meth:`do_import_stream`.
+    """
+
+    extensions = ('.json', )
+
+    _compiled_sniff_regex = regex(br'\s*{\s*["}]')
+
+    @classmethod
+    def sniff(cls, head):
+        """
+        Detect an object with a double quoted key (or empty) at the beginning.
+
+        See :meth:`FormatProvider.sniff`.
+        """
+        return cls._compiled_sniff_regex.match(head) is not None
+
     @classmethod
     def do_import(cls, cfmg, string):
         """
         JSON parser implementation.
 
+        If the configuration manager skips some categories the document is
+        imported with the incremental parser, that jumps over them. See
+        :meth:`do_import_stream`.
+
         See :meth:`FormatProvider.do_import`.
         """
+        if cfmg._skipped and not isinstance(string, bytes):
+            cls.do_import_stream(cfmg, StringIO(string))
+            return
+        cls._import_document(cfmg, string)
 
-        keys = cfmg._keys
-        categories = cfmg._categories
-
+    @classmethod
+    def _import_document(cls, cfmg, string):
+        """
+        Parse a whole JSON document and import it.
+        """
         # Parse JSON
         try:
             as_dict = loads(string)
@@ -67,54 +99,57 @@ class JSONFormatProvider(FormatProvider):
             return
 
         # Iterate categories
-        for category, options in as_dict.items():
-
-            # Check datatype
-            if type(options) != dict:
-                if not cfmg._safe:
-                    raise SyntaxError(
-                        'Malformed category "{}".'.format(category)
-                    )
-                log.error(
-                    'Ignoring malformed category "{}".'.format(category)
-                )
-                continue
+        cls._import_categories(cfmg, as_dict)
 
-            # Consider only the categories included in the specification
-            if category not in categories:
-                log.error(
-                    'Ignoring unknown category "{}".'.format(category)
-                )
-                continue
+    @classmethod
+    def do_import_stream(cls, cfmg, stream):
+        """
+        Incremental JSON parser implementation.
 
-            # Iterate options
-            for key, value in options.items():
+        Categories are decoded one at a time using
+        :py:meth:`json.JSONDecoder.raw_decode` over a buffer filled from the
+        stream, and each one is imported as soon as it is decoded. Memory usage
+        is bounded by the size of the largest category, not by the size of the
+        whole document. Categories skipped by the configuration manager are
+        scanned over without being decoded.
 
-                # Consider only known keys
-                if key not in keys:
-                    log.error('Ignoring unknown key "{}".'.format(key))
-                    continue
+        Note that, unlike :meth:`do_import`, categories found before a parse
+        error are imported.
 
-                # Check if key belongs to the category we are in
-                if keys[key].category != category:
-                    msg = (
-                        'Key "{}" should belong to category "{}", '
-                        'found in "{}" instead.'.format(
-                            key, keys[key].category, category
-                        )
-                    )
-                    if not cfmg._safe:
-                        raise SyntaxError(msg)
-                    log.error(msg)
-                    continue
+        See :meth:`FormatProvider.do_import_stream`.
+        """
+        reader = _JSONStreamReader(stream, cls.chunk_size)
+
+        # Let the regular parser handle (and report) anything but an object
+        if reader.peek() != '{':
+            cls._import_document(cfmg, reader.remainder())
+            return
 
-                # Everything ok, try to set the value of the option
-                try:
-                    cfmg.set(key, value)
-                except Exception as e:
-                    if not cfmg._safe:
-                        raise e
-                    log.error(format_exc())
+        try:
+            skip = cfmg._skipped.__contains__
+            for category, options in reader.members(skip):
+                cls._import_category(cfmg, category, options)
+        except Exception as e:
+            if not cfmg._safe:
+                raise e
+            log.error(format_exc())
+
+    @classmethod
+    def do_import_buffer(cls, cfmg, buf):
+        """
+        Incremental JSON parser implementation over a bytes-like buffer.
+
+        The buffer is decoded as UTF-8 one chunk at a time, as the
+        incremental parser consumes it, instead of being copied and decoded
+        as a whole. See :meth:`do_import_stream`.
+
+        See :meth:`FormatProvider.do_import_buffer`.
+        """
+        stream = _BufferStream(buf)
+        try:
+            cls.do_import_stream(cfmg, stream)
+        finally:
+            stream.close()
 
     @classmethod
     def do_export(cls, cfmg):
@@ -130,7 +165,7 @@ class JSONFormatProvider(FormatProvider):
         # Create dictionary
         as_dict = {
             cat: {
-                opt.key: opt.repr(opt._value) for opt in categories[cat]
+                opt.key: opt._export() for opt in categories[cat]
             } for cat in categories
         }
 
@@ -149,4 +184,193 @@ class JSONFormatProvider(FormatProvider):
 
         return output
 
+
+class _BufferStream(object):
+    """
+    Read-only text stream over a bytes-like buffer, decoded as UTF-8
+    incrementally from views of the buffer, without copying it.
+    """
+
+    def __init__(self, buf):
+        self._view = memoryview(buf)
+        self._pos = 0
+        self._decoder = getincrementaldecoder('utf-8')()
+
+    def read(self, size=-1):
+        """
+        Read and decode the next ``size`` bytes of the buffer, or all of them
+        if ``size`` is negative. At least one character is returned unless
+        the buffer is exhausted.
+        """
+        view = self._view
+        while True:
+            start = self._pos
+            end = len(view) if size < 0 else min(start + size, len(view))
+            self._pos = end
+            final = end == len(view)
+            text = self._decoder.decode(view[start:end], final)
+            if text or final:
+                return text
+
+    def close(self):
+        """
+        Release the view of the buffer, so the buffer can be closed.
+        """
+        self._view.release()
+
+
+class _JSONStreamReader(object):
+    """
+    Buffered reader that decodes the members of a top-level JSON object one at
+    a time from a file-like object.
+    """
+
+    _whitespace = regex(r'[ \t\n\r]*')
+    _tokens = regex(r'"(?:[^"\\]|\\.)*(?P<end>")?|[{}\[\]]')
+
+    def __init__(self, stream, chunk_size):
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._decoder = JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._offset = 0
+        self._eof = False
+
+    def _fill(self):
+        """
+        Read more data from the stream, dropping the consumed part of the
+        buffer. The amount read grows with the pending data so values larger
+        than a chunk are decoded in amortized linear time.
+        """
+        if self._eof:
+            return False
+
+        pending = self._buffer[self._pos:]
+        chunk = self._stream.read(max(self._chunk_size, len(pending)))
+        if not chunk:
+            self._eof = True
+            return False
+
+        self._offset += self._pos
+        self._buffer = pending + chunk
+        self._pos = 0
+        return True
+
+    def _error(self, msg):
+        return ValueError(
+            '{} at char {}.'.format(msg, self._offset + self._pos)
+        )
+
+    def peek(self):
+        """
+        Skip whitespace and return the next character, or an empty string if
+        the stream is exhausted.
+        """
+        while True:
+            self._pos = self._whitespace.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ''
+
+    def decode(self):
+        """
+        Decode the next JSON value in the stream.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(
+                    self._buffer, self._pos
+                )
+            except ValueError:
+                if self._fill():
+                    continue
+                raise
+
+            # A value ending at the buffer boundary could be truncated
+            if end == len(self._buffer) and self._fill():
+                continue
+
+            self._pos = end
+            return value
+
+    def skip(self):
+        """
+        Skip the next JSON value in the stream. Objects and arrays are
+        scanned over by matching their brackets, without decoding them.
+        """
+        if self.peek() not in ('{', '['):
+            self.decode()
+            return
+
+        depth = 0
+        while True:
+            resume = len(self._buffer)
+            for match in self._tokens.finditer(self._buffer, self._pos):
+                token = match.group()
+                if token[0] == '"':
+                    # Resume from strings truncated at the buffer boundary
+                    if match.group('end') is None:
+                        resume = match.start()
+                        break
+                elif token in ('{', '['):
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        self._pos = match.end()
+                        return
+
+            self._pos = resume
+            if not self._fill():
+                raise self._error('Unterminated value')
+
+    def remainder(self):
+        """
+        Return the unconsumed data of the stream.
+        """
+        return self._buffer[self._pos:] + self._stream.read()
+
+    def members(self, skip=None):
+        """
+        Iterate the ``(key, value)`` members of the top-level object.
+
+        :param skip: Predicate that, given a key, tells if its member must be
+         skipped instead of decoded and returned.
+        :type skip: callable or None
+        """
+        if self.peek() != '{':
+            raise self._error('Expecting object')
+        self._pos += 1
+
+        if self.peek() == '}':
+            self._pos += 1
+        else:
+            while True:
+                if self.peek() != '"':
+                    raise self._error('Expecting property name')
+                key = self.decode()
+
+                if self.peek() != ':':
+                    raise self._error('Expecting \':\' delimiter')
+                self._pos += 1
+
+                if skip is not None and skip(key):
+                    self.skip()
+                else:
+                    yield key, self.decode()
+
+                delimiter = self.peek()
+                self._pos += 1
+                if delimiter == '}':
+                    break
+                if delimiter != ',':
+                    raise self._error('Expecting \',\' delimiter')
+
+        if self.peek():
+            raise self._error('Extra data')
+
+
 providers['json'] = JSONFormatProvider
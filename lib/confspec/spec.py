@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2014 Carlos Jenkins <carlos@jenkins.co.cr>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Module for declarative configuration specifications.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+from copy import copy
+
+from .manager import ConfigMg
+from .options import ConfigOpt
+
+
+__all__ = ['Spec', 'get_manager']
+
+
+class _OptionDescriptor(object):
+    """
+    Descriptor that gives access to the value of an option of a :class:`Spec`
+    instance by the index of the option in the compiled specification.
+    """
+
+    __slots__ = ('_index', '_key')
+
+    def __init__(self, index, key):
+        self._index = index
+        self._key = key
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return owner._spec[self._index]
+
+        # Values pending to be parsed and keys of skipped categories are
+        # handled by the manager
+        option = instance._options[self._index]
+        if option._pending or instance._cfmg._partial:
+            return instance._cfmg.get(self._key)
+        return option._value
+
+    def __set__(self, instance, value):
+        instance._cfmg.set(self._key, value)
+
+    def __delete__(self, instance):
+        raise TypeError('Cannot delete configuration keys.')
+
+
+class SpecMeta(type):
+    """
+    Metaclass that compiles the options declared in the body of a
+    :class:`Spec` subclass.
+
+    The options, including the ones inherited from base specifications, are
+    collected in definition order into the ``_spec`` tuple and replaced by
+    descriptors that access them by index. Instances are slotted, so they
+    don't have a ``__dict__``. Options cannot be named as the slots of the
+    instances nor shadow other attributes of the base classes.
+    """
+
+    # Names of the slots of Spec instances and the compiled specification
+    reserved = ('_cfmg', '_options', '_spec')
+
+    @staticmethod
+    def _shadows(bases, attr):
+        """
+        Whether the given attribute name is an attribute of the given bases
+        other than an inherited option.
+        """
+        for base in bases:
+            for cls in base.__mro__:
+                if attr in cls.__dict__:
+                    return not isinstance(
+                        cls.__dict__[attr], _OptionDescriptor
+                    )
+        return False
+
+    def __new__(mcs, name, bases, namespace):
+        # Collect options from the base specifications
+        spec = []
+        for base in reversed(bases):
+            for option in getattr(base, '_spec', ()):
+                if option.key not in [opt.key for opt in spec]:
+                    spec.append(option)
+
+        # Collect options declared in this class, overriding inherited ones
+        namespace = namespace.copy()
+        for attr, option in list(namespace.items()):
+            if not isinstance(option, ConfigOpt):
+                continue
+
+            if attr in mcs.reserved or mcs._shadows(bases, attr):
+                raise AttributeError(
+                    'Option "{}" shadows an attribute of {}.'.format(
+                        attr, name
+                    )
+                )
+
+            if option.key is None:
+                option.key = attr
+            elif option.key != attr:
+                raise AttributeError(
+                    'Option "{}" is declared with key "{}".'.format(
+                        attr, option.key
+                    )
+                )
+
+            keys = [opt.key for opt in spec]
+            if attr in keys:
+                spec[keys.index(attr)] = option
+            else:
+                spec.append(option)
+
+        # Replace options with descriptors
+        for index, option in enumerate(spec):
+            namespace[option.key] = _OptionDescriptor(index, option.key)
+
+        namespace['_spec'] = tuple(spec)
+        namespace.setdefault('__slots__', ())
+        return super(SpecMeta, mcs).__new__(mcs, name, bases, namespace)
+
+
+_SpecBase = SpecMeta(str('_SpecBase'), (object, ), {'__slots__': ()})
+
+
+class Spec(_SpecBase):
+    """
+    Base class of declarative configuration specifications.
+
+    Options are declared as class attributes, using the attribute name as key:
+
+    .. code:: python
+
+       class AppConf(Spec):
+           port = ConfigInt(default=8080, category='net')
+           host = ConfigString(default='"localhost"', category='net')
+
+       conf = AppConf(files=['~/.app.conf'])
+       conf.port = 9090
+
+    The class body is compiled once, when the class is created. Each instance
+    holds a copy of the options of the class, handled by its own
+    configuration manager, each copy with its own cache. Reading an option
+    returns its value directly, unless the value is pending in lazy mode or
+    the manager handles only some categories, in which case it goes through
+    :meth:`ConfigMg.get <confspec.manager.ConfigMg.get>` so it is resolved
+    and reported as the manager does. Setting it goes through
+    :meth:`ConfigMg.set <confspec.manager.ConfigMg.set>` so it is validated,
+    written back and notified. Use :func:`get_manager` to get the
+    configuration manager of an instance.
+
+    :param kwargs: Arguments of the configuration manager, see
+     :class:`confspec.manager.ConfigMg`.
+    """
+
+    __slots__ = ('_options', '_cfmg')
+
+    def __init__(self, **kwargs):
+        self._options = [copy(option) for option in self._spec]
+        self._cfmg = ConfigMg(self._options, **kwargs)
+
+    def __repr__(self):
+        return repr(self._cfmg)
+
+    def __str__(self):
+        return repr(self)
+
+
+def get_manager(conf):
+    """
+    Return the configuration manager of a :class:`Spec` instance.
+
+    :param Spec conf: A configuration specification instance.
+    :rtype: :class:`confspec.manager.ConfigMg`
+    """
+    return conf._cfmg
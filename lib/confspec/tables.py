@@ -0,0 +1,414 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2014 Carlos Jenkins <carlos@jenkins.co.cr>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Module for lookup tables of :class:`confspec.options.ConfigMap`.
+
+Tables are read-only mappings that can also find the key of a given value.
+Besides the in-memory :class:`DictTable`, large tables can be kept outside
+the process in a sorted text file or in a SQLite database, in which case
+entries are looked up lazily and only the most recently used ones are kept in
+memory.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import re
+from threading import Lock
+from os.path import abspath, isfile
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+from .utils import LRUCache
+
+
+__all__ = [
+    'Table', 'DictTable', 'CachedTable', 'SortedFileTable', 'SQLiteTable',
+]
+
+
+_missing = object()
+_not_found = object()
+
+_identifier = re.compile(r'^[_a-zA-Z][_a-zA-Z0-9]*$')
+
+
+class Table(Mapping):
+    """
+    Base class for lookup tables.
+
+    A table is a read-only :py:class:`collections.abc.Mapping` that also
+    supports reverse lookups, that is, finding the key of a given value. See
+    :meth:`key_of`.
+    """
+
+    __slots__ = ()
+
+    def key_of(self, value):
+        """
+        Return the key associated with the given value.
+
+        This default implementation scans the whole table. Subclasses should
+        override it with a faster lookup when possible.
+
+        :param value: A value of the table.
+        :rtype: The first key found whose value is equal to the given one.
+        :raises KeyError: If the value is not in the table.
+        """
+        for key, item in self.items():
+            if item == value:
+                return key
+        raise KeyError(value)
+
+
+class DictTable(Table):
+    """
+    In-memory table with a reverse index.
+
+    >>> from confspec.tables import DictTable
+    >>> table = DictTable({'one': 1, 'two': 2})
+    >>> table['two']
+    2
+    >>> table.key_of(2)
+    'two'
+
+    The reverse index is built once at creation, so reverse lookups of
+    hashable values take constant time. Unhashable values are found by
+    scanning the table.
+
+    :param dict mapping: Mapping or iterable of ``(key, value)`` pairs.
+    """
+
+    __slots__ = ('_data', '_reverse')
+
+    def __init__(self, mapping):
+        self._data = dict(mapping)
+        self._reverse = {}
+        for key, value in self._data.items():
+            try:
+                self._reverse.setdefault(value, key)
+            except TypeError:
+                pass
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __getstate__(self):
+        return (self._data, )
+
+    def __setstate__(self, state):
+        self.__init__(state[0])
+
+    def key_of(self, value):
+        """
+        Override of :meth:`Table.key_of` that uses the reverse index.
+        """
+        try:
+            return self._reverse[value]
+        except KeyError:
+            raise KeyError(value)
+        except TypeError:
+            return super(DictTable, self).key_of(value)
+
+
+class CachedTable(Table):
+    """
+    Base class for tables stored outside the process.
+
+    Lookups, including the ones of keys not found, are kept in a bounded
+    :class:`confspec.utils.LRUCache` so the table is never fully loaded in
+    memory. Subclasses must implement :meth:`_lookup`, ``__iter__`` and
+    ``__len__``.
+
+    :param int cache_size: Maximum number of lookups to keep in memory.
+    """
+
+    def __init__(self, cache_size=1024):
+        self._cache = LRUCache(cache_size)
+
+    def __getitem__(self, key):
+        cache = self._cache
+        value = cache.get(key, _missing)
+        if value is _missing:
+            try:
+                value = self._lookup(key)
+            except KeyError:
+                value = _not_found
+            cache[key] = value
+        if value is _not_found:
+            raise KeyError(key)
+        return value
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_cache'] = self._cache.maxsize
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._cache = LRUCache(state['_cache'])
+
+    def _lookup(self, key):
+        """
+        Lookup the value of the given key in the backing store.
+
+        :param key: Key to lookup.
+        :raises KeyError: If the key is not in the table.
+        """
+        raise NotImplementedError()
+
+    def cache_info(self):
+        """
+        Return the lookup cache statistics.
+
+        :rtype: A :class:`confspec.utils.CacheInfo`.
+        """
+        return self._cache.info()
+
+    def clear_cache(self):
+        """
+        Forget all cached lookups, for example after the backing store
+        changed.
+        """
+        self._cache.clear()
+
+
+class SortedFileTable(CachedTable):
+    """
+    Table stored in a text file sorted by key.
+
+    Each line of the file holds a key and its value separated by
+    ``separator``. Lines must be sorted by the encoded bytes of the keys, as
+    ``LC_ALL=C sort`` does. The file is memory mapped on the first lookup and
+    keys are found using a binary search, so only the touched pages are read.
+    Keys and values are strings.
+
+    Reverse lookups scan the whole file.
+
+    :param str path: Path to the table file.
+    :param str separator: Separator between key and value.
+    :param str encoding: Encoding of the file.
+    :param int cache_size: Maximum number of lookups to keep in memory.
+    """
+
+    def __init__(
+            self, path, separator='\t', encoding='utf-8', cache_size=1024):
+        self._path = abspath(path)
+        self._separator = separator.encode(encoding)
+        self._encoding = encoding
+        self._map = None
+        self._length = None
+        super(SortedFileTable, self).__init__(cache_size=cache_size)
+
+    def __getstate__(self):
+        state = super(SortedFileTable, self).__getstate__()
+        state['_map'] = None
+        return state
+
+    def _data(self):
+        """
+        Return the memory map of the table file, mapping it if required.
+        """
+        if self._map is None:
+            import mmap
+
+            with open(self._path, 'rb') as fd:
+                try:
+                    self._map = mmap.mmap(
+                        fd.fileno(), 0, access=mmap.ACCESS_READ
+                    )
+                except ValueError:
+                    # Empty files cannot be mapped
+                    self._map = b''
+        return self._map
+
+    def _lines(self):
+        """
+        Iterate over the ``(key, value)`` pairs of the table file as bytes.
+        """
+        data = self._data()
+        start = 0
+        size = len(data)
+        while start < size:
+            end = data.find(b'\n', start)
+            if end == -1:
+                end = size
+            line = data[start:end].rstrip(b'\r')
+            if line:
+                key, _, value = line.partition(self._separator)
+                yield key, value
+            start = end + 1
+
+    def _lookup(self, key):
+        """
+        Override of :meth:`CachedTable._lookup` that performs a binary search
+        over the lines of the table file.
+        """
+        data = self._data()
+        target = key.encode(self._encoding)
+        separator = self._separator
+
+        low, high = 0, len(data)
+        while low < high:
+            middle = (low + high) // 2
+            start = data.rfind(b'\n', 0, middle) + 1
+            end = data.find(b'\n', start)
+            if end == -1:
+                end = len(data)
+            line = data[start:end].rstrip(b'\r')
+            current, _, value = line.partition(separator)
+            if current < target:
+                low = end + 1
+            elif current > target:
+                high = start
+            else:
+                return value.decode(self._encoding)
+        raise KeyError(key)
+
+    def __iter__(self):
+        for key, _ in self._lines():
+            yield key.decode(self._encoding)
+
+    def __len__(self):
+        if self._length is None:
+            self._length = sum(1 for _ in self._lines())
+        return self._length
+
+    def key_of(self, value):
+        """
+        Override of :meth:`Table.key_of` that scans the table file.
+        """
+        target = value.encode(self._encoding)
+        for key, current in self._lines():
+            if current == target:
+                return key.decode(self._encoding)
+        raise KeyError(value)
+
+    def clear_cache(self):
+        """
+        Override of :meth:`CachedTable.clear_cache` that also unmaps the table
+        file so changes to it are seen by following lookups.
+        """
+        super(SortedFileTable, self).clear_cache()
+        if self._map:
+            self._map.close()
+        self._map = None
+        self._length = None
+
+
+class SQLiteTable(CachedTable):
+    """
+    Table stored in a SQLite database.
+
+    The database is opened read-only on the first lookup. Both the forward
+    and the reverse lookups are a single query, so they are fast as long as
+    the key and value columns are indexed.
+
+    :param str path: Path to the SQLite database.
+    :param str table: Name of the table in the database.
+    :param str key_column: Name of the column holding the keys.
+    :param str value_column: Name of the column holding the values.
+    :param int cache_size: Maximum number of lookups to keep in memory.
+    """
+
+    def __init__(
+            self, path, table='mapping', key_column='key',
+            value_column='value', cache_size=1024):
+        for name in (table, key_column, value_column):
+            if not _identifier.match(name):
+                raise ValueError('Invalid SQL identifier <{}>.'.format(name))
+        self._path = abspath(path)
+        self._queries = {
+            'lookup': 'SELECT {v} FROM {t} WHERE {k} = ? LIMIT 1',
+            'reverse': 'SELECT {k} FROM {t} WHERE {v} = ? LIMIT 1',
+            'keys': 'SELECT {k} FROM {t}',
+            'count': 'SELECT COUNT(*) FROM {t}',
+        }
+        for query, sql in self._queries.items():
+            self._queries[query] = sql.format(
+                t=table, k=key_column, v=value_column
+            )
+        self._connection = None
+        self._lock = Lock()
+        super(SQLiteTable, self).__init__(cache_size=cache_size)
+
+    def __getstate__(self):
+        state = super(SQLiteTable, self).__getstate__()
+        state['_connection'] = None
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        super(SQLiteTable, self).__setstate__(state)
+        self._lock = Lock()
+
+    def _query(self, query, *parameters):
+        """
+        Execute the given query and return all the resulting rows.
+        """
+        with self._lock:
+            if self._connection is None:
+                import sqlite3
+
+                # Connecting would create a missing database
+                if not isfile(self._path):
+                    raise IOError(
+                        'No such database <{}>.'.format(self._path)
+                    )
+                self._connection = sqlite3.connect(
+                    self._path, check_same_thread=False
+                )
+                self._connection.execute('PRAGMA query_only = ON')
+            return self._connection.execute(
+                self._queries[query], parameters
+            ).fetchall()
+
+    def _lookup(self, key):
+        """
+        Override of :meth:`CachedTable._lookup` that queries the database.
+        """
+        rows = self._query('lookup', key)
+        if not rows:
+            raise KeyError(key)
+        return rows[0][0]
+
+    def __iter__(self):
+        return (row[0] for row in self._query('keys'))
+
+    def __len__(self):
+        return self._query('count')[0][0]
+
+    def key_of(self, value):
+        """
+        Override of :meth:`Table.key_of` that queries the database.
+        """
+        rows = self._query('reverse', value)
+        if not rows:
+            raise KeyError(value)
+        return rows[0][0]
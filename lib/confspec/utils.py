@@ -21,8 +21,40 @@ Module for utility functions.
 
 from __future__ import absolute_import, division, print_function
 
+import errno
+from os import stat
+from stat import S_ISREG, S_ISDIR
+from threading import Event, Lock, Thread
+from collections import OrderedDict, namedtuple
+from os.path import isfile, splitext
 
-__all__ = ['first_line']
+try:
+    from queue import Queue
+except ImportError:
+    from Queue import Queue
+
+try:
+    from time import monotonic
+except ImportError:
+    from time import time as monotonic
+
+
+__all__ = [
+    'first_line', 'compressions', 'detect_compression', 'open_file',
+    'CacheInfo', 'LRUCache', 'FrozenDict', 'StatCache', 'stat_cache',
+    'cached_exists', 'cached_isfile', 'cached_isdir',
+]
+
+
+compressions = {
+    'gzip': (('.gz', '.gzip'), b'\x1f\x8b'),
+    'xz': (('.xz', ), b'\xfd7zXZ\x00'),
+    'zstd': (('.zst', '.zstd'), b'\x28\xb5\x2f\xfd'),
+}
+"""
+Supported compression formats, as a mapping of the compression name to a
+tuple with the file name extensions and the magic bytes of the format.
+"""
 
 
 def first_line(text):
@@ -45,3 +77,431 @@ def first_line(text):
     :rtype: The first line in the text.
     """
     return text.strip().split('\n')[0].strip()
+
+
+def detect_compression(path):
+    """
+    Detect the compression format of a file.
+
+    The compression is detected from the file name extension or, if the file
+    exists, from the magic bytes at its beginning.
+
+    >>> from confspec.utils import detect_compression
+    >>> detect_compression('/etc/myapp.json.gz')
+    'gzip'
+    >>> detect_compression('/etc/myapp.json') is None
+    True
+
+    :param str path: Path to the file.
+    :rtype: The name of the compression format (see :data:`compressions`), or
+     ``None`` if the file is not compressed.
+    """
+    extension = splitext(path)[1].lower()
+    for name, (extensions, magic) in compressions.items():
+        if extension in extensions:
+            return name
+
+    if isfile(path):
+        with open(path, 'rb') as f:
+            head = f.read(8)
+        for name, (extensions, magic) in compressions.items():
+            if head.startswith(magic):
+                return name
+
+    return None
+
+
+def open_file(path, mode='r', compression=None):
+    """
+    Open a file, transparently compressing or decompressing it.
+
+    Compression modules are imported on demand. ``gzip`` and ``xz`` use
+    Python's :py:mod:`gzip` and :py:mod:`lzma` modules. ``zstd`` uses the
+    :py:mod:`compression.zstd` module (Python 3.14) or the ``zstandard``
+    package if available.
+
+    :param str path: Path to the file.
+    :param str mode: Mode to open the file with, as in :py:func:`open`.
+    :param compression: Name of the compression format of the file (see
+     :data:`compressions`), or ``None`` to open it as a regular file.
+    :type compression: str or None
+    :rtype: A file-like object.
+    """
+    if compression is None:
+        return open(path, mode)
+
+    # Compressed files are opened in binary mode by default
+    if 'b' not in mode and 't' not in mode:
+        mode += 't'
+
+    if compression == 'gzip':
+        import gzip
+        return gzip.open(path, mode)
+
+    if compression == 'xz':
+        import lzma
+        return lzma.open(path, mode)
+
+    if compression == 'zstd':
+        try:
+            from compression import zstd
+        except ImportError:
+            try:
+                import zstandard as zstd
+            except ImportError:
+                raise ImportError(
+                    'zstd compression requires Python 3.14 or the '
+                    'zstandard package.'
+                )
+        return zstd.open(path, mode)
+
+    raise ValueError('Unknown compression <{}>.'.format(compression))
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+"""
+Statistics of a :class:`LRUCache`, as :py:func:`functools.lru_cache` reports
+them.
+"""
+
+
+class LRUCache(object):
+    """
+    Bounded mapping that discards the least recently used entries.
+
+    >>> from confspec.utils import LRUCache
+    >>> cache = LRUCache(2)
+    >>> cache['a'] = 1
+    >>> cache['b'] = 2
+    >>> cache.get('a')
+    1
+    >>> cache['c'] = 3
+    >>> cache.get('b') is None
+    True
+    >>> cache.info()
+    CacheInfo(hits=1, misses=1, maxsize=2, currsize=2)
+
+    :param int maxsize: Maximum number of entries.
+    """
+
+    __slots__ = ('maxsize', 'hits', 'misses', '_data')
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def get(self, key, default=None):
+        """
+        Return the value of the given key, marking it as the most recently
+        used, or ``default`` if not found.
+        """
+        data = self._data
+        try:
+            value = data.pop(key)
+        except KeyError:
+            self.misses += 1
+            return default
+        data[key] = value
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key, value):
+        data = self._data
+        data.pop(key, None)
+        data[key] = value
+        if len(data) > self.maxsize:
+            data.popitem(last=False)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        """
+        Remove all entries and reset the statistics.
+        """
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        """
+        Return the statistics of the cache.
+
+        :rtype: :data:`CacheInfo`
+        """
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self))
+
+
+class FrozenDict(dict):
+    """
+    Read-only dictionary.
+
+    Only the methods that would change the dictionary are overridden, to
+    raise :py:exc:`TypeError`, so lookups are as fast as in a regular
+    ``dict``.
+
+    >>> from confspec.utils import FrozenDict
+    >>> frozen = FrozenDict({'a': 1})
+    >>> frozen['a']
+    1
+    >>> frozen['b'] = 2
+    Traceback (most recent call last):
+        ...
+    TypeError: FrozenDict is read-only.
+    """
+
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError('{} is read-only.'.format(type(self).__name__))
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return type(self), (dict(self), )
+
+    def __hash__(self):
+        return hash(frozenset(self.items()))
+
+    def __repr__(self):
+        return '{}({})'.format(type(self).__name__, dict.__repr__(self))
+
+
+_missing = object()
+
+
+class _StatTask(object):
+    """
+    Stat of a path queued to the workers of a :class:`StatCache`.
+    """
+
+    __slots__ = ('path', 'done', 'result')
+
+    def __init__(self, path):
+        self.path = path
+        self.done = Event()
+        self.result = None
+
+
+class StatCache(object):
+    """
+    Thread safe cache of :py:func:`os.stat` results that expire after ``ttl``
+    seconds.
+
+    Single stats run in the calling thread unless a ``timeout`` is set. In
+    that case, and for :meth:`prefetch`, stats run in a bounded pool of
+    daemon worker threads, and a stat that does not complete in time, for
+    example on a hung network mount, fails with an :py:exc:`IOError` instead
+    of blocking the caller. Timeouts are cached as well, so following checks
+    of the same path fail fast until the entry expires, and a path whose stat
+    is still in progress is never queued again. Paths not found are never
+    served from the cache, as they may be created at any time.
+
+    >>> from confspec.utils import StatCache
+    >>> cache = StatCache(ttl=60)
+    >>> cache.stat('/') is not None
+    True
+    >>> cache.stat('/no/such/path') is None
+    True
+
+    :param float ttl: Seconds a result is considered valid.
+    :param int maxsize: Maximum number of paths to remember.
+    :param float timeout: Seconds to wait for a stat, or ``None`` to wait
+     forever.
+    :param int workers: Maximum number of worker threads.
+    """
+
+    def __init__(self, ttl=2.0, maxsize=4096, timeout=None, workers=8):
+        self.ttl = ttl
+        self.timeout = timeout
+        self.workers = workers
+        self._entries = LRUCache(maxsize)
+        self._lock = Lock()
+        self._tasks = Queue()
+        self._pending = {}
+        self._threads = 0
+        self._idle = 0
+
+    @staticmethod
+    def _stat(path):
+        """
+        Stat given path, returning ``None`` if it is not accessible.
+        """
+        try:
+            return stat(path)
+        except (OSError, ValueError):
+            return None
+
+    def _lookup(self, path):
+        """
+        Return the cached result of given path, or a sentinel if not cached
+        or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(path)
+        # Paths not found are checked again, as they may be created anytime
+        if entry is None or entry[1] is None or entry[0] < monotonic():
+            return _missing
+        return entry[1]
+
+    def _store(self, path, result):
+        """
+        Cache the result of given path. Must be called with the lock held.
+        """
+        self._entries[path] = (monotonic() + self.ttl, result)
+
+    def _work(self):
+        """
+        Loop of the worker threads, which stat the queued paths and cache the
+        results, even the ones that arrive after their callers timed out.
+        """
+        while True:
+            with self._lock:
+                self._idle += 1
+            task = self._tasks.get()
+            with self._lock:
+                self._idle -= 1
+            result = self._stat(task.path)
+            with self._lock:
+                task.result = result
+                self._store(task.path, result)
+                del self._pending[task.path]
+                task.done.set()
+
+    def _submit(self, path):
+        """
+        Queue a stat of given path, unless one is already in progress, and
+        start a worker if none is idle and the pool is not full.
+
+        :rtype: The :class:`_StatTask` of the path.
+        """
+        with self._lock:
+            task = self._pending.get(path)
+            if task is not None:
+                return task
+
+            task = self._pending[path] = _StatTask(path)
+            self._tasks.put(task)
+            if self._idle < self._tasks.qsize() and \
+                    self._threads < self.workers:
+                self._threads += 1
+                thread = Thread(target=self._work)
+                thread.daemon = True
+                thread.start()
+        return task
+
+    def _collect(self, tasks):
+        """
+        Wait for the given tasks, all of them bounded by ``timeout``.
+
+        :rtype: A dictionary mapping each path to its stat result, or to an
+         :py:exc:`IOError` if it could not be completed in time.
+        """
+        deadline = None
+        if self.timeout is not None:
+            deadline = monotonic() + self.timeout
+
+        results = {}
+        for task in tasks:
+            timeout = None
+            if deadline is not None:
+                timeout = max(deadline - monotonic(), 0)
+            if task.done.wait(timeout):
+                results[task.path] = task.result
+                continue
+
+            error = IOError(
+                errno.ETIMEDOUT, 'Timed out checking path', task.path
+            )
+            with self._lock:
+                if not task.done.is_set():
+                    self._store(task.path, error)
+            results[task.path] = task.result if task.done.is_set() else error
+        return results
+
+    def stat(self, path):
+        """
+        Return the :py:func:`os.stat` result of given path.
+
+        :param str path: Path to stat.
+        :rtype: A :py:class:`os.stat_result` or ``None`` if the path is not
+         accessible.
+        :raises IOError: If the stat timed out.
+        """
+        result = self._lookup(path)
+        if result is _missing:
+            if self.timeout is None:
+                result = self._stat(path)
+                with self._lock:
+                    self._store(path, result)
+            else:
+                result = self._collect([self._submit(path)])[path]
+        if isinstance(result, IOError):
+            raise result
+        return result
+
+    def prefetch(self, paths):
+        """
+        Stat given paths concurrently in the worker threads and cache the
+        results, so following :meth:`stat` calls are served from the cache.
+
+        The whole batch is bounded by ``timeout``. Paths not checked in time
+        are cached as timed out.
+
+        :param paths: Iterable of paths.
+        """
+        tasks = [
+            self._submit(path)
+            for path in set(paths) if self._lookup(path) is _missing
+        ]
+        if tasks:
+            self._collect(tasks)
+
+    def clear(self):
+        """
+        Forget all cached results.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+stat_cache = StatCache()
+"""
+Shared :class:`StatCache` used by :func:`cached_exists`,
+:func:`cached_isfile` and :func:`cached_isdir`.
+"""
+
+
+def cached_exists(path):
+    """
+    Same as :py:func:`os.path.exists` but using :data:`stat_cache`.
+
+    :raises IOError: If the check timed out.
+    """
+    return stat_cache.stat(path) is not None
+
+
+def cached_isfile(path):
+    """
+    Same as :py:func:`os.path.isfile` but using :data:`stat_cache`.
+
+    :raises IOError: If the check timed out.
+    """
+    result = stat_cache.stat(path)
+    return result is not None and S_ISREG(result.st_mode)
+
+
+def cached_isdir(path):
+    """
+    Same as :py:func:`os.path.isdir` but using :data:`stat_cache`.
+
+    :raises IOError: If the check timed out.
+    """
+    result = stat_cache.stat(path)
+    return result is not None and S_ISDIR(result.st_mode)
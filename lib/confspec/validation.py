@@ -21,6 +21,650 @@ Module for validation functions.
 
 from __future__ import absolute_import, division, print_function
 
+import sys
+
+
+# -----------------------------------------------------------------------------
+# Validator objects
+# -----------------------------------------------------------------------------
+
+class Validator(object):
+    """
+    Base class of introspectable validator objects.
+
+    A validator is called with a value and returns whether the value is
+    valid. The arguments a validator was created with are kept as attributes
+    named after the ``fields`` of its class. At creation, each validator
+    compiles a plain function that performs the check, which is what
+    :func:`compile_validators` fuses. Validators can be pickled.
+
+    >>> from confspec.validation import in_range
+    >>> f = in_range(0, 10)
+    >>> f
+    Bounds(lower=0, upper=10, lower_inclusive=True, upper_inclusive=True)
+    >>> f.lower, f.upper
+    (0, 10)
+    """
+
+    __slots__ = ('_test', )
+
+    fields = ()
+    """Names of the attributes that define the validator."""
+
+    cost = 10
+    """
+    Relative cost of the check, used by :func:`compile_validators` to run
+    cheap checks first.
+    """
+
+    def __init__(self):
+        self._test = self._compile()
+
+    def _compile(self):
+        """
+        Return a plain function that performs the check of this validator.
+        """
+        raise NotImplementedError()
+
+    def _vectorize(self):
+        """
+        Return a function that performs the check of this validator on all
+        the elements of a NumPy array at once and returns whether all of
+        them are valid, or ``None`` if the check cannot be vectorized.
+        """
+        return None
+
+    def __call__(self, value):
+        return self._test(value)
+
+    def __reduce__(self):
+        """
+        Pickle the validator as its class and the values of its ``fields``,
+        which are the positional arguments of the constructor. The check is
+        compiled again when unpickled.
+        """
+        return type(self), tuple(getattr(self, field) for field in self.fields)
+
+    def __repr__(self):
+        return '{}({})'.format(
+            type(self).__name__,
+            ', '.join(
+                '{}={!r}'.format(field, getattr(self, field))
+                for field in self.fields
+            )
+        )
+
+
+class Bounds(Validator):
+    """
+    Validate that a number is within the given bounds.
+
+    >>> from confspec.validation import Bounds
+    >>> f = Bounds(lower=0, upper=10, upper_inclusive=False)
+    >>> f(0), f(10)
+    (True, False)
+    >>> f.merge(Bounds(lower=5, lower_inclusive=False))
+    Bounds(lower=5, upper=10, lower_inclusive=False, upper_inclusive=False)
+
+    :param lower: The lower bound, or ``None`` for no lower bound.
+    :param upper: The upper bound, or ``None`` for no upper bound.
+    :param bool lower_inclusive: The lower bound is a valid value.
+    :param bool upper_inclusive: The upper bound is a valid value.
+    """
+
+    __slots__ = ('lower', 'upper', 'lower_inclusive', 'upper_inclusive')
+    fields = __slots__
+    cost = 1
+
+    def __init__(
+            self, lower=None, upper=None,
+            lower_inclusive=True, upper_inclusive=True):
+        self.lower = lower
+        self.upper = upper
+        self.lower_inclusive = lower_inclusive
+        self.upper_inclusive = upper_inclusive
+        super(Bounds, self).__init__()
+
+    def _compile(self):
+        lower = self.lower
+        upper = self.upper
+
+        if lower is None and upper is None:
+            return lambda num: True
+
+        if upper is None:
+            if self.lower_inclusive:
+                return lambda num: num >= lower
+            return lambda num: num > lower
+
+        if lower is None:
+            if self.upper_inclusive:
+                return lambda num: num <= upper
+            return lambda num: num < upper
+
+        if self.lower_inclusive and self.upper_inclusive:
+            return lambda num: lower <= num <= upper
+        if self.lower_inclusive:
+            return lambda num: lower <= num < upper
+        if self.upper_inclusive:
+            return lambda num: lower < num <= upper
+        return lambda num: lower < num < upper
+
+    def _vectorize(self):
+        lower = self.lower
+        upper = self.upper
+
+        tests = []
+        if lower is not None:
+            if self.lower_inclusive:
+                tests.append(lambda nums: (nums >= lower).all())
+            else:
+                tests.append(lambda nums: (nums > lower).all())
+        if upper is not None:
+            if self.upper_inclusive:
+                tests.append(lambda nums: (nums <= upper).all())
+            else:
+                tests.append(lambda nums: (nums < upper).all())
+
+        return lambda nums: all(bool(test(nums)) for test in tests)
+
+    def merge(self, other):
+        """
+        Return the bounds that a number must be within to be within both
+        these bounds and the given ones.
+
+        :param Bounds other: Other bounds.
+        :rtype: A new :class:`Bounds` validator.
+        """
+        lower, lower_inclusive = _tighter(
+            (self.lower, self.lower_inclusive),
+            (other.lower, other.lower_inclusive),
+            max
+        )
+        upper, upper_inclusive = _tighter(
+            (self.upper, self.upper_inclusive),
+            (other.upper, other.upper_inclusive),
+            min
+        )
+        return Bounds(lower, upper, lower_inclusive, upper_inclusive)
+
+
+def _tighter(bound, other, choose):
+    """
+    Return the tighter of two ``(value, inclusive)`` bounds, given the
+    function that chooses the tighter value.
+    """
+    if bound[0] is None:
+        return other
+    if other[0] is None or bound[0] == other[0]:
+        return bound[0], bound[1] and other[1]
+    if choose(bound[0], other[0]) == bound[0]:
+        return bound
+    return other
+
+
+class Modulo(Validator):
+    """
+    Validate that a number divided by the given divisor leaves the given
+    remainder.
+
+    :param divisor: The divisor.
+    :type divisor: int or float
+    :param remainder: The expected remainder.
+    :type remainder: int or float
+    """
+
+    __slots__ = ('divisor', 'remainder')
+    fields = __slots__
+    cost = 2
+
+    def __init__(self, divisor, remainder=0):
+        self.divisor = divisor
+        self.remainder = remainder
+        super(Modulo, self).__init__()
+
+    def _compile(self):
+        divisor = self.divisor
+        remainder = self.remainder
+        return lambda num: (num % divisor) == remainder
+
+    def _vectorize(self):
+        divisor = self.divisor
+        remainder = self.remainder
+        return lambda nums: bool(((nums % divisor) == remainder).all())
+
+
+class Length(Validator):
+    """
+    Validate that the length of a collection is within the given bounds.
+
+    :param int minimum: The minimum length.
+    :param maximum: The maximum length, or ``None`` for no maximum.
+    :type maximum: int or None
+    """
+
+    __slots__ = ('minimum', 'maximum')
+    fields = __slots__
+    cost = 1
+
+    def __init__(self, minimum=0, maximum=None):
+        self.minimum = minimum
+        self.maximum = maximum
+        super(Length, self).__init__()
+
+    def _compile(self):
+        minimum = self.minimum
+        maximum = self.maximum
+        if maximum is None:
+            return lambda elements: len(elements) >= minimum
+        return lambda elements: minimum <= len(elements) <= maximum
+
+    def merge(self, other):
+        """
+        Return the length bounds of both these bounds and the given ones.
+
+        :param Length other: Other length bounds.
+        :rtype: A new :class:`Length` validator.
+        """
+        maximum = self.maximum
+        if maximum is None or \
+                (other.maximum is not None and other.maximum < maximum):
+            maximum = other.maximum
+        return Length(max(self.minimum, other.minimum), maximum)
+
+
+class OneOf(Validator):
+    """
+    Validate that a value is member of the given options.
+
+    Membership is checked against a :py:class:`frozenset` of the options, and
+    only falls back to comparing against each option if the options or the
+    value are unhashable. The options are copied into a tuple when the
+    validator is created, so later changes to the given options have no
+    effect.
+
+    >>> from confspec.validation import OneOf
+    >>> f = OneOf(['foo', 'bar', ['ham']])
+    >>> f('bar'), f(['ham']), f('spam')
+    (True, True, False)
+    >>> f = OneOf(['foo', 'bar'])
+    >>> f(['foo'])
+    False
+
+    :param options: The options that the value can be.
+    """
+
+    __slots__ = ('options', )
+    fields = __slots__
+    cost = 2
+
+    def __init__(self, options):
+        self.options = tuple(options)
+        super(OneOf, self).__init__()
+
+    def _compile(self):
+        options = self.options
+        try:
+            members = frozenset(options)
+        except TypeError:
+            return lambda item: item in options
+
+        def test(item):
+            try:
+                return item in members
+            except TypeError:
+                return item in options
+        return test
+
+
+class SubsetOf(Validator):
+    """
+    Validate that a set is subset of the given main set.
+
+    :param set main: The main set.
+    """
+
+    __slots__ = ('main', )
+    fields = __slots__
+    cost = 5
+
+    def __init__(self, main):
+        self.main = main
+        super(SubsetOf, self).__init__()
+
+    def _compile(self):
+        main = self.main
+        return lambda sub: sub <= main
+
+
+class SupersetOf(Validator):
+    """
+    Validate that a set is superset of the given subset.
+
+    :param set sub: The subset.
+    """
+
+    __slots__ = ('sub', )
+    fields = __slots__
+    cost = 5
+
+    def __init__(self, sub):
+        self.sub = sub
+        super(SupersetOf, self).__init__()
+
+    def _compile(self):
+        sub = frozenset(self.sub)
+        return lambda main: sub <= main
+
+
+class DisjointFrom(Validator):
+    """
+    Validate that a collection has no elements in common with the given one.
+
+    :param other: The other collection.
+    """
+
+    __slots__ = ('other', )
+    fields = __slots__
+    cost = 5
+
+    def __init__(self, other):
+        self.other = other
+        super(DisjointFrom, self).__init__()
+
+    def _compile(self):
+        other = frozenset(self.other)
+        return lambda elements: other.isdisjoint(elements)
+
+
+class HasKeys(Validator):
+    """
+    Validate that a mapping has all the given keys.
+
+    :param keys: The keys the mapping must have.
+    """
+
+    __slots__ = ('keys', )
+    fields = __slots__
+    cost = 5
+
+    def __init__(self, keys):
+        self.keys = keys
+        super(HasKeys, self).__init__()
+
+    def _compile(self):
+        keys = tuple(self.keys)
+        return lambda mapping: all(key in mapping for key in keys)
+
+
+class AllValidateTo(Validator):
+    """
+    Validate that all elements of a collection pass the given validation.
+
+    If all the given validators can be vectorized, as :class:`Bounds` and
+    :class:`Modulo`, the elements of NumPy arrays are checked at once.
+
+    :param func: A validator function, or a list of them, that each element
+     must pass. See :func:`compile_validators`.
+    """
+
+    __slots__ = ('func', )
+    fields = __slots__
+    cost = 20
+
+    def __init__(self, func):
+        self.func = func
+        super(AllValidateTo, self).__init__()
+
+    def _compile(self):
+        func = compile_validators(self.func)
+        if func is None:
+            return lambda elements: True
+
+        vectorized = _vectorize(self.func)
+        if vectorized is None:
+            return lambda elements: all(map(func, elements))
+
+        def test(elements):
+            if _is_ndarray(elements):
+                return vectorized(elements)
+            return all(map(func, elements))
+        return test
+
+
+class AllValuesValidateTo(Validator):
+    """
+    Validate that all values of a mapping pass the given validation.
+
+    :param func: A validator function, or a list of them, that each value
+     must pass. See :func:`compile_validators`.
+    """
+
+    __slots__ = ('func', )
+    fields = __slots__
+    cost = 20
+
+    def __init__(self, func):
+        self.func = func
+        super(AllValuesValidateTo, self).__init__()
+
+    def _compile(self):
+        func = compile_validators(self.func)
+        if func is None:
+            return lambda mapping: True
+        return lambda mapping: all(map(func, mapping.values()))
+
+
+def _is_ndarray(value):
+    """
+    Check if the given value is a NumPy array, without importing NumPy.
+    """
+    numpy = sys.modules.get('numpy')
+    return numpy is not None and isinstance(value, numpy.ndarray)
+
+
+def _vectorize(validators):
+    """
+    Vectorize a validator function, or a list of them, into a single function
+    that checks all the elements of a NumPy array at once, or return ``None``
+    if any of them cannot be vectorized.
+    """
+    if hasattr(validators, '__call__'):
+        validators = [validators]
+
+    tests = []
+    for validator in validators:
+        if not isinstance(validator, Validator):
+            return None
+        test = validator._vectorize()
+        if test is None:
+            return None
+        tests.append(test)
+
+    if len(tests) == 1:
+        test, = tests
+
+        def validator(value):
+            try:
+                return test(value)
+            except TypeError:
+                return False
+        return validator
+    return lambda nums: all(test(nums) for test in tests)
+
+
+class _StringValidator(Validator):
+    """
+    Base class of the validators that compare strings, optionally ignoring
+    case.
+    """
+
+    __slots__ = ('ignore_case', )
+    cost = 3
+
+    def __init__(self, ignore_case=False):
+        self.ignore_case = ignore_case
+        super(_StringValidator, self).__init__()
+
+    def _compile(self):
+        test = self._compile_case(self.ignore_case)
+        if self.ignore_case:
+            return lambda string: test(string.lower())
+        return test
+
+    def _compile_case(self, ignore_case):
+        """
+        Return a function that performs the check on a string, lower case if
+        ``ignore_case``.
+        """
+        raise NotImplementedError()
+
+
+class HasSubstring(_StringValidator):
+    """
+    Validate that a string is a substring of the given string.
+
+    :param str string: Main string to compare against.
+    :param bool ignore_case: Ignore case when comparing.
+    """
+
+    __slots__ = ('string', )
+    fields = ('string', 'ignore_case')
+
+    def __init__(self, string, ignore_case=False):
+        self.string = string
+        super(HasSubstring, self).__init__(ignore_case)
+
+    def _compile_case(self, ignore_case):
+        string = self.string.lower() if ignore_case else self.string
+        return lambda substring: substring in string
+
+
+class StartsWith(_StringValidator):
+    """
+    Validate that a string has the given prefix.
+
+    :param str prefix: The prefix to verify.
+    :param bool ignore_case: Ignore case when comparing.
+    """
+
+    __slots__ = ('prefix', )
+    fields = ('prefix', 'ignore_case')
+
+    def __init__(self, prefix, ignore_case=False):
+        self.prefix = prefix
+        super(StartsWith, self).__init__(ignore_case)
+
+    def _compile_case(self, ignore_case):
+        prefix = self.prefix.lower() if ignore_case else self.prefix
+        return lambda string: string.startswith(prefix)
+
+
+class EndsWith(_StringValidator):
+    """
+    Validate that a string has the given suffix.
+
+    :param str suffix: The suffix to verify.
+    :param bool ignore_case: Ignore case when comparing.
+    """
+
+    __slots__ = ('suffix', )
+    fields = ('suffix', 'ignore_case')
+
+    def __init__(self, suffix, ignore_case=False):
+        self.suffix = suffix
+        super(EndsWith, self).__init__(ignore_case)
+
+    def _compile_case(self, ignore_case):
+        suffix = self.suffix.lower() if ignore_case else self.suffix
+        return lambda string: string.endswith(suffix)
+
+
+def compile_validators(validators):
+    """
+    Compile a validator function, or a list of them, into a single function.
+
+    :class:`Bounds` and :class:`Length` validators are merged into one, and
+    the validators are ordered by their :attr:`Validator.cost`, placing
+    plain functions last in the given order. A value that makes a check fail
+    with :py:exc:`TypeError` is considered invalid, as the checks that would
+    have rejected it first could have been reordered. This is done for single
+    checks too, so a value of the wrong type is rejected the same way no
+    matter how many validators are given.
+
+    >>> from confspec.validation import compile_validators, in_range
+    >>> f = compile_validators([
+    ...     lambda num: num != 7, in_range(0, 10), greater_than(5)
+    ... ])
+    >>> [num for num in range(12) if f(num)]
+    [6, 8, 9, 10]
+    >>> f('7')
+    False
+    >>> compile_validators(in_range(0, 10))('7')
+    False
+
+    :param validators: A validator function, a list of them or ``None``.
+    :type validators: function, list of functions or None
+    :rtype: A validator function, or ``None`` if there is nothing to
+     validate.
+    """
+    if validators is None:
+        return None
+    if hasattr(validators, '__call__'):
+        validators = [validators]
+
+    # Merge bounds
+    merged = []
+    for validator in validators:
+        if isinstance(validator, (Bounds, Length)):
+            for index, other in enumerate(merged):
+                if type(other) is type(validator):
+                    merged[index] = other.merge(validator)
+                    break
+            else:
+                merged.append(validator)
+        else:
+            merged.append(validator)
+
+    # Order cheap checks first, the sort is stable
+    merged.sort(key=lambda validator: getattr(validator, 'cost', 100))
+    tests = tuple(
+        validator._test if isinstance(validator, Validator) else validator
+        for validator in merged
+    )
+
+    if not tests:
+        return None
+    if len(tests) == 1:
+        test, = tests
+
+        def validator(value):
+            try:
+                return test(value)
+            except TypeError:
+                return False
+        return validator
+
+    if len(tests) == 2:
+        first, second = tests
+
+        def validator(value):
+            try:
+                return bool(first(value) and second(value))
+            except TypeError:
+                return False
+        return validator
+
+    def validator(value):
+        try:
+            for test in tests:
+                if not test(value):
+                    return False
+        except TypeError:
+            return False
+        return True
+    return validator
+
 
 # -----------------------------------------------------------------------------
 # Integer and float validation
@@ -41,11 +685,9 @@ def positive():
     >>> f(45.5)
     True
 
-    :rtype: A validator function.
+    :rtype: A :class:`Bounds` validator.
     """
-    def validator(num):
-        return num > 0
-    return validator
+    return Bounds(lower=0, lower_inclusive=False)
 
 
 def negative():
@@ -63,11 +705,9 @@ def negative():
     >>> f(45.5)
     False
 
-    :rtype: A validator function.
+    :rtype: A :class:`Bounds` validator.
     """
-    def validator(num):
-        return num < 0
-    return validator
+    return Bounds(upper=0, upper_inclusive=False)
 
 
 def greater_than(lower):
@@ -88,11 +728,9 @@ def greater_than(lower):
 
     :param lower: The lower bound to compare against.
     :type lower: int or float
-    :rtype: A validator function.
+    :rtype: A :class:`Bounds` validator.
     """
-    def validator(num):
-        return num > lower
-    return validator
+    return Bounds(lower=lower, lower_inclusive=False)
 
 
 def greater_than_eq(lower):
@@ -114,11 +752,9 @@ def greater_than_eq(lower):
 
     :param lower: The lower bound to compare against.
     :type lower: int or float
-    :rtype: A validator function.
+    :rtype: A :class:`Bounds` validator.
     """
-    def validator(num):
-        return num >= lower
-    return validator
+    return Bounds(lower=lower)
 
 
 def lower_than(upper):
@@ -139,11 +775,9 @@ def lower_than(upper):
 
     :param upper: The upper bound to compare against.
     :type upper: int or float
-    :rtype: A validator function.
+    :rtype: A :class:`Bounds` validator.
     """
-    def validator(num):
-        return num < upper
-    return validator
+    return Bounds(upper=upper, upper_inclusive=False)
 
 
 def lower_than_eq(upper):
@@ -164,11 +798,9 @@ def lower_than_eq(upper):
 
     :param upper: The upper bound to compare against.
     :type upper: int or float
-    :rtype: A validator function.
+    :rtype: A :class:`Bounds` validator.
     """
-    def validator(num):
-        return num <= upper
-    return validator
+    return Bounds(upper=upper)
 
 
 def in_range(bottom, top):
@@ -193,13 +825,9 @@ def in_range(bottom, top):
     :type bottom: int or float
     :param top: top interval delimiter.
     :type top: int or float
-    :rtype: A validator function.
+    :rtype: A :class:`Bounds` validator.
     """
-    def validator(num):
-        if bottom <= num <= top:
-            return True
-        return False
-    return validator
+    return Bounds(lower=bottom, upper=top)
 
 
 def multiple_of(multi):
@@ -223,11 +851,9 @@ def multiple_of(multi):
 
     :param multi: Multiple to check against.
     :type multi: int or float
-    :rtype: A validator function.
+    :rtype: A :class:`Modulo` validator.
     """
-    def validator(num):
-        return (num % multi) == 0
-    return validator
+    return Modulo(multi)
 
 
 def is_even():
@@ -248,11 +874,9 @@ def is_even():
     >>> f(2.0)
     True
 
-    :rtype: A validator function.
+    :rtype: A :class:`Modulo` validator.
     """
-    def validator(num):
-        return (num % 2) == 0
-    return validator
+    return Modulo(2)
 
 
 def is_odd():
@@ -273,11 +897,9 @@ def is_odd():
     >>> f(2.0)
     False
 
-    :rtype: A validator function.
+    :rtype: A :class:`Modulo` validator.
     """
-    def validator(num):
-        return (num % 2) == 1
-    return validator
+    return Modulo(2, 1)
 
 
 # -----------------------------------------------------------------------------
@@ -300,11 +922,9 @@ def is_one_of(options):
     True
 
     :param list options: The options that the attribute can be.
-    :rtype: A validator function.
+    :rtype: A :class:`OneOf` validator.
     """
-    def validator(item):
-        return item in options
-    return validator
+    return OneOf(options)
 
 
 def is_subset_of(main):
@@ -320,11 +940,60 @@ def is_subset_of(main):
     False
 
     :param set main: The main set to compare to.
-    :rtype: A validator function.
+    :rtype: A :class:`SubsetOf` validator.
     """
-    def validator(sub):
-        return sub <= main
-    return validator
+    return SubsetOf(main)
+
+
+def is_superset_of(sub):
+    """
+    Validate that the given set is superset of the given subset.
+
+    >>> f = is_superset_of(['a', 'b'])
+    >>> f(frozenset(['a', 'b', 'c']))
+    True
+    >>> f(frozenset(['a', 'c']))
+    False
+
+    :param sub: The subset to compare to.
+    :type sub: set or list
+    :rtype: A :class:`SupersetOf` validator.
+    """
+    return SupersetOf(sub)
+
+
+def is_disjoint_from(other):
+    """
+    Validate that the given collection has no elements in common with the
+    other given collection.
+
+    >>> f = is_disjoint_from(['root', 'admin'])
+    >>> f(frozenset(['alice', 'bob']))
+    True
+    >>> f(['alice', 'root'])
+    False
+
+    :param other: The other collection.
+    :type other: set or list
+    :rtype: A :class:`DisjointFrom` validator.
+    """
+    return DisjointFrom(other)
+
+
+def has_keys(keys):
+    """
+    Validate that the given mapping has all the given keys.
+
+    >>> f = has_keys(['host', 'port'])
+    >>> f({'host': 'localhost', 'port': 80, 'user': 'admin'})
+    True
+    >>> f({'host': 'localhost'})
+    False
+
+    :param list keys: The keys the mapping must have.
+    :rtype: A :class:`HasKeys` validator.
+    """
+    return HasKeys(keys)
 
 
 def all_validate_to(func):
@@ -347,11 +1016,28 @@ def all_validate_to(func):
 
     :param function func: A validator function to be used to valid each one of
      the elements in the list.
-    :rtype: A validator function.
+    :rtype: A :class:`AllValidateTo` validator.
     """
-    def validator(elements):
-        return all(map(func, elements))
-    return validator
+    return AllValidateTo(func)
+
+
+def all_values_validate_to(func):
+    """
+    Validate that all values in the given mapping pass the validation of the
+    given validator function. Use :func:`all_validate_to` to validate the
+    keys.
+
+    >>> f = all_values_validate_to(in_range(0, 1))
+    >>> f({'a': 0.5, 'b': 1})
+    True
+    >>> f({'a': 0.5, 'b': 2})
+    False
+
+    :param function func: A validator function to be used to valid each one of
+     the values in the mapping.
+    :rtype: A :class:`AllValuesValidateTo` validator.
+    """
+    return AllValuesValidateTo(func)
 
 
 def empty():
@@ -364,11 +1050,9 @@ def empty():
     >>> f([1, 2])
     False
 
-    :rtype: A validator function.
+    :rtype: A :class:`Length` validator.
     """
-    def validator(elements):
-        return len(elements) == 0
-    return validator
+    return Length(maximum=0)
 
 
 def non_empty():
@@ -381,11 +1065,9 @@ def non_empty():
     >>> f([1, 2])
     True
 
-    :rtype: A validator function.
+    :rtype: A :class:`Length` validator.
     """
-    def validator(elements):
-        return len(elements) > 0
-    return validator
+    return Length(minimum=1)
 
 
 # -----------------------------------------------------------------------------
@@ -407,11 +1089,9 @@ def has_substring(string):
     False
 
     :param str string: Main string to compare against.
-    :rtype: A validator function.
+    :rtype: A :class:`HasSubstring` validator.
     """
-    def validator(substring):
-        return substring in string
-    return validator
+    return HasSubstring(string)
 
 
 def has_substring_igncase(string):
@@ -430,13 +1110,9 @@ def has_substring_igncase(string):
     False
 
     :param str string: Main string to compare against.
-    :rtype: A validator function.
+    :rtype: A :class:`HasSubstring` validator.
     """
-    string = string.lower()
-
-    def validator(substring):
-        return substring.lower() in string
-    return validator
+    return HasSubstring(string, ignore_case=True)
 
 
 def startswith(prefix):
@@ -456,11 +1132,9 @@ def startswith(prefix):
     False
 
     :param str prefix: The prefix to verify.
-    :rtype: A validator function.
+    :rtype: A :class:`StartsWith` validator.
     """
-    def validator(string):
-        return string.startswith(prefix)
-    return validator
+    return StartsWith(prefix)
 
 
 def startswith_igncase(prefix):
@@ -480,13 +1154,9 @@ def startswith_igncase(prefix):
     False
 
     :param str prefix: The prefix to verify.
-    :rtype: A validator function.
+    :rtype: A :class:`StartsWith` validator.
     """
-    prefix = prefix.lower()
-
-    def validator(string):
-        return string.lower().startswith(prefix)
-    return validator
+    return StartsWith(prefix, ignore_case=True)
 
 
 def endswith(suffix):
@@ -502,11 +1172,9 @@ def endswith(suffix):
     False
 
     :param str suffix: The suffix to verify.
-    :rtype: A validator function.
+    :rtype: A :class:`EndsWith` validator.
     """
-    def validator(string):
-        return string.endswith(suffix)
-    return validator
+    return EndsWith(suffix)
 
 
 def endswith_igncase(suffix):
@@ -522,16 +1190,27 @@ def endswith_igncase(suffix):
     False
 
     :param str suffix: The suffix to verify.
-    :rtype: A validator function.
+    :rtype: A :class:`EndsWith` validator.
     """
-    suffix = suffix.lower()
-
-    def validator(string):
-        return string.lower().endswith(suffix)
-    return validator
+    return EndsWith(suffix, ignore_case=True)
 
 
 __all__ = [
+    'Validator',
+    'Bounds',
+    'Modulo',
+    'Length',
+    'OneOf',
+    'SubsetOf',
+    'SupersetOf',
+    'DisjointFrom',
+    'HasKeys',
+    'AllValidateTo',
+    'AllValuesValidateTo',
+    'HasSubstring',
+    'StartsWith',
+    'EndsWith',
+    'compile_validators',
     'positive',
     'negative',
     'greater_than',
@@ -544,7 +1223,11 @@ __all__ = [
     'is_odd',
     'is_one_of',
     'is_subset_of',
+    'is_superset_of',
+    'is_disjoint_from',
+    'has_keys',
     'all_validate_to',
+    'all_values_validate_to',
     'empty',
     'non_empty',
     'has_substring',
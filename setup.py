@@ -27,6 +27,9 @@ setup(
         'confspec.providers',
     ],
     package_dir={'': 'lib'},
+    extras_require={
+        'numpy': ['numpy'],
+    },
 
     # Extra metadata
     author='Carlos Jenkins',
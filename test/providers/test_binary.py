@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2014 Carlos Jenkins <carlos@jenkins.co.cr>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Test confspec.providers.binary module.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+from datetime import datetime, date, time
+
+from pytest import raises
+
+from confspec.manager import ConfigMg
+from confspec.options import (
+    ConfigString, ConfigLine, ConfigHexadecimal, ConfigDateTime, ConfigDate,
+    ConfigTime, ConfigColor, ConfigMap, ConfigListString, ConfigListFloat,
+    ConfigListDate
+)
+from confspec.providers.binary import BinaryFormatProvider
+
+from ..options import spec
+
+
+def make_spec():
+    return [
+        ConfigString(key='name', default='"Jöhn, \\"Doe\\""'),
+        ConfigLine(key='line', default='A line'),
+        ConfigHexadecimal(key='hex', default=-0xFFFFFFFFFFFFFFFFFF),
+        ConfigDateTime(key='dt', default='2014-09-30T17:40:20'),
+        ConfigDate(key='d', default='2014-09-30', category='time'),
+        ConfigTime(key='t', default='17:40:20', category='time'),
+        ConfigColor(key='color', default='#FF0010', category='misc'),
+        ConfigMap(key='map', default='b', table={'a': 1, 'b': 2},
+                  category='misc'),
+        ConfigListString(key='strs', default=['"a, b"', '""'],
+                         category='lists'),
+        ConfigListFloat(key='floats', default=[1.5, -2.25e10],
+                        category='lists'),
+        ConfigListDate(key='dates', default=['2014-09-30'],
+                       category='lists'),
+    ]
+
+
+def test_BinaryFormatProvider():
+
+    mgr = ConfigMg(spec)
+    output = BinaryFormatProvider.do_export(mgr)
+    assert output.startswith(BinaryFormatProvider.magic)
+
+    # Round trip
+    src = ConfigMg(make_spec())
+    src.set('dt', datetime(2000, 1, 2, 3, 4, 5))
+    encoded = src.do_export(format='binary')
+
+    dst = ConfigMg(make_spec())
+    dst.set('name', '"Other"')
+    dst.set('hex', 0)
+    dst.set('d', date(2001, 1, 1))
+    dst.set('t', time(1, 1, 1))
+    dst.set('color', '#000000')
+    dst.set('map', 'a')
+    dst.set('strs', [])
+    dst.set('floats', [])
+    dst.set('dates', [])
+    dst.do_import(encoded, format='binary')
+
+    for opt in make_spec():
+        assert dst.get(opt.key) == src.get(opt.key)
+    assert dst.do_export(format='ini') == src.do_export(format='ini')
+    assert dst.do_export(format='binary') == encoded
+
+    # Check bad input (default safe=True)
+    other = ConfigMg(make_spec()[:-1]).do_export(format='binary')
+    bad_inputs = [
+        # Not a binary configuration
+        (b'[general]\nfoo = 1', ValueError),
+        # Truncated
+        (encoded[:-3], ValueError),
+        # Different specification
+        (other, SyntaxError),
+    ]
+    for bad, exc in bad_inputs:
+        BinaryFormatProvider.do_import(dst, bad)
+
+    # Check bad input (safe=False)
+    dst._safe = False
+    for bad, exc in bad_inputs:
+        with raises(exc):
+            BinaryFormatProvider.do_import(dst, bad)
+
+
+def test_BinaryFormatProvider_timezones():
+    from datetime import timedelta, timezone
+
+    tz = timezone(timedelta(hours=-6, minutes=-30))
+    values = {
+        'dt': datetime(2000, 1, 2, 3, 4, 5, 6, tzinfo=tz),
+        't': time(17, 40, 20, tzinfo=timezone.utc),
+    }
+
+    src = ConfigMg(make_spec())
+    for key, value in values.items():
+        src.set(key, value)
+    encoded = src.do_export(format='binary')
+
+    dst = ConfigMg(make_spec(), safe=False)
+    dst.do_import(encoded, format='binary')
+    for key, value in values.items():
+        assert dst.get(key) == value
+        assert dst.get(key).utcoffset() == value.utcoffset()
+
+    # Naive values stay naive
+    src.set('dt', datetime(2000, 1, 2, 3, 4, 5))
+    dst.do_import(src.do_export(format='binary'), format='binary')
+    assert dst.get('dt').tzinfo is None
+
+
+def test_BinaryFormatProvider_files(tmpdir):
+
+    fn = str(tmpdir.join('conf.bin'))
+    mgr = ConfigMg(make_spec(), files=[fn], format='binary', safe=False)
+    mgr.set('hex', 0x10)
+
+    other = ConfigMg(make_spec(), files=[fn], format='binary', safe=False)
+    assert other.get('hex') == 0x10
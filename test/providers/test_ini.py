@@ -74,3 +74,18 @@ def test_INIFormatProvider():
         if exc is not None:
             with raises(exc):
                 INIFormatProvider.do_import(mgr, bad)
+
+
+def test_INIFormatProvider_buffer():
+
+    mgr = ConfigMg(spec)
+    buf = input_str.replace('\n', '\r\n').encode('utf-8')
+    INIFormatProvider.do_import_buffer(mgr, memoryview(buf))
+    assert INIFormatProvider.do_export(mgr) == input_str
+
+    # Check bad input (safe=False)
+    mgr._safe = False
+    for bad, exc in bad_inputs:
+        if exc is not None:
+            with raises(exc):
+                INIFormatProvider.do_import_buffer(mgr, bad.encode('utf-8'))
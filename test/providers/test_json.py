@@ -21,6 +21,8 @@ Test confspec.providers.json module.
 
 from __future__ import absolute_import, division, print_function
 
+from io import StringIO
+
 from pytest import raises
 
 from confspec.manager import ConfigMg
@@ -86,3 +88,86 @@ def test_JSONFormatProvider():
         if exc is not None:
             with raises(exc):
                 JSONFormatProvider.do_import(mgr, bad)
+
+
+def test_JSONFormatProvider_stream():
+
+    mgr = ConfigMg(spec)
+
+    # Use a tiny chunk size so values are split across reads
+    chunk_size = JSONFormatProvider.chunk_size
+    JSONFormatProvider.chunk_size = 3
+    try:
+        JSONFormatProvider.do_import_stream(mgr, StringIO(input_str))
+        output_str = JSONFormatProvider.do_export(mgr)
+        assert input_str.strip() == output_str.strip()
+
+        # Check bad input (default safe=True)
+        mgr._safe = True
+        for bad, exc in bad_inputs:
+            JSONFormatProvider.do_import_stream(mgr, StringIO(bad))
+
+        # Check bad input (safe=False)
+        mgr._safe = False
+        for bad, exc in bad_inputs:
+            if exc is not None:
+                with raises(exc):
+                    JSONFormatProvider.do_import_stream(mgr, StringIO(bad))
+
+        # Truncated and trailing data
+        for bad in [input_str[:-10], input_str + '{}', '{"a": {} "b": {}}']:
+            with raises(ValueError):
+                JSONFormatProvider.do_import_stream(mgr, StringIO(bad))
+    finally:
+        JSONFormatProvider.chunk_size = chunk_size
+
+
+def test_JSONFormatProvider_buffer():
+
+    from confspec.options import ConfigString, ConfigListString
+
+    def make_manager():
+        return ConfigMg([
+            ConfigString(key='name', default='""', category='person'),
+            ConfigListString(key='langs', default=[], category='skills'),
+        ], safe=False)
+
+    document = (
+        '{"person": {"name": "\\"J\u00f6hn \u2603\\""}, '
+        '"skills": {"langs": ["\'C\'", "\'\U0001F40D\'"]}}'
+    ).encode('utf-8')
+
+    chunk_size = JSONFormatProvider.chunk_size
+    try:
+        for size in [1, 2, 3, 1024]:
+            JSONFormatProvider.chunk_size = size
+            for buf in [document, bytearray(document), memoryview(document)]:
+                mgr = make_manager()
+                JSONFormatProvider.do_import_buffer(mgr, buf)
+                assert mgr.get('name') == 'J\u00f6hn \u2603'
+                assert mgr.get('langs') == ['C', '\U0001F40D']
+
+            with raises(ValueError):
+                JSONFormatProvider.do_import_buffer(
+                    make_manager(), document[:-10]
+                )
+            with raises(UnicodeDecodeError):
+                JSONFormatProvider.do_import_buffer(
+                    make_manager(), document[:-3] + b'\xff"]}}'
+                )
+    finally:
+        JSONFormatProvider.chunk_size = chunk_size
+
+
+def test_JSONStreamReader_skip():
+
+    from confspec.providers.json import _JSONStreamReader
+
+    document = (
+        '{"a": {"b": ["}", "\\\\", "\\"]"], "c": {}}, "d": 1, '
+        '"e": [[{"f": "{["}]], "g": true}'
+    )
+    for chunk_size in [1, 2, 3, 7, 1024]:
+        reader = _JSONStreamReader(StringIO(document), chunk_size)
+        members = list(reader.members(lambda key: key in ('a', 'e')))
+        assert members == [('d', 1), ('g', True)]
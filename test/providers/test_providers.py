@@ -23,7 +23,8 @@ from __future__ import absolute_import, division, print_function
 
 from pytest import raises
 
-from confspec.providers import FormatProvider
+from confspec.providers import FormatProvider, ProviderRegistry
+from confspec.providers.ini import INIFormatProvider
 
 
 def test_FormatProvider():
@@ -32,3 +33,25 @@ def test_FormatProvider():
         FormatProvider.do_import(None, None)
     with raises(NotImplementedError):
         FormatProvider.do_export(None)
+
+
+def test_ProviderRegistry():
+
+    registry = ProviderRegistry({
+        'ini': 'confspec.providers.ini:INIFormatProvider',
+        'missing': 'confspec.providers.missing:MissingFormatProvider',
+    })
+    assert 'ini' in registry
+    assert registry['ini'] is INIFormatProvider
+    assert 'foo' not in registry
+    with raises(KeyError):
+        registry['foo']
+    with raises(ImportError):
+        registry['missing']
+
+    registry.register('foo', 'confspec.providers.ini:INIFormatProvider')
+    assert registry['foo'] is INIFormatProvider
+    assert 'foo' in list(registry)
+
+    del registry['foo']
+    assert 'foo' not in registry
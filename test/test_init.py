@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2014 Carlos Jenkins <carlos@jenkins.co.cr>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Test confspec package namespace.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import sys
+from os.path import dirname, abspath, join
+from subprocess import check_call
+
+import confspec
+from confspec import manager, options, spec, validation
+
+
+def test_lazy_attributes():
+
+    public = set(manager.__all__) | set(options.__all__) | \
+        set(spec.__all__) | set(validation.__all__)
+    assert set(confspec.__all__) == public
+
+    for name in confspec.__all__:
+        module = confspec._lazy_attributes[name]
+        assert getattr(confspec, name) is getattr(
+            sys.modules['confspec.' + module], name
+        )
+
+
+def test_lazy_import():
+
+    lib = join(dirname(dirname(abspath(__file__))), 'lib')
+    check_call([sys.executable, '-c', (
+        'import sys; sys.path.insert(0, {!r}); import confspec; '
+        'assert "confspec.options" not in sys.modules; '
+        'assert "confspec.providers" not in sys.modules; '
+        'confspec.ConfigMg; '
+        'assert "confspec.providers.json" not in sys.modules'
+    ).format(lib)])
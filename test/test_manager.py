@@ -20,3 +20,369 @@ Test confspec.manager module.
 """
 
 from __future__ import absolute_import, division, print_function
+
+from pytest import raises
+
+from confspec.manager import ConfigMg
+from confspec.options import ConfigString, ConfigInt, ConfigListString
+from confspec.options import ConfigColor
+from confspec.validation import in_range
+
+
+def make_spec():
+    return [
+        ConfigString(key='name', default='"Unknown"', category='person'),
+        ConfigInt(
+            key='age', default=18, validator=in_range(0, 110),
+            category='person'
+        ),
+        ConfigListString(key='langs', default=[], category='skills'),
+        ConfigColor(key='color', default='#000000', category='skills'),
+    ]
+
+
+def test_import_mapping():
+
+    mgr = ConfigMg(make_spec())
+    mgr.import_mapping({
+        'person': {'name': 'John "Doe"', 'age': 30},
+        'skills': {'langs': ['C', 'Python'], 'color': (255, 0, 16)},
+    })
+    assert mgr.get('name') == 'John "Doe"'
+    assert mgr.get('age') == 30
+    assert mgr.get('langs') == ['C', 'Python']
+    assert mgr.get('color') == (255, 0, 16)
+
+    # Values are exported the same way as parsed ones
+    other = ConfigMg(make_spec())
+    other.do_import(mgr.do_export(format='dict'), format='dict')
+    for key in ['name', 'age', 'langs', 'color']:
+        assert other.get(key) == mgr.get(key)
+
+    # Check bad input (default safe=True)
+    mgr.import_mapping(100)
+    mgr.import_mapping({'person': {'age': 200}})
+    assert mgr.get('age') == 30
+
+    # Check bad input (safe=False)
+    mgr.enable_safe(False)
+    with raises(TypeError):
+        mgr.import_mapping(100)
+    with raises(ValueError):
+        mgr.import_mapping({'person': {'age': 200}})
+    with raises(ValueError):
+        mgr.import_mapping({'skills': {'color': (256, 0, 0)}})
+    with raises(SyntaxError):
+        mgr.import_mapping({'skills': {'age': 20}})
+
+
+def test_autodetect(tmpdir):
+
+    system = tmpdir.join('app.json')
+    system.write('{"person": {"age": 20, "name": "\'System\'"}}')
+    sniffed = tmpdir.join('app')
+    sniffed.write('{\'person\': {\'age\': 30}}')
+    user = tmpdir.join('user.ini')
+
+    mgr = ConfigMg(
+        make_spec(), files=[str(system), str(sniffed), str(user)],
+        autodetect=True, safe=False
+    )
+    assert mgr.get('name') == 'System'
+    assert mgr.get('age') == 30
+    assert mgr.file_format(str(system)) == 'json'
+    assert mgr.file_format(str(sniffed)) == 'dict'
+
+    # User file was created in its own format
+    assert mgr.file_format(str(user)) == 'ini'
+    assert user.read().startswith('[person]')
+    mgr.set('age', 40)
+    assert 'age = 40' in user.read()
+
+    # Undetectable files use the default format
+    assert mgr.file_format(str(tmpdir.join('missing'))) == 'ini'
+    assert ConfigMg(
+        make_spec(), files=[str(system)], load=False
+    ).file_format(str(system)) == 'ini'
+
+
+def test_compression(tmpdir):
+
+    import gzip
+    import lzma
+
+    system = str(tmpdir.join('app.json.gz'))
+    with gzip.open(system, 'wt') as f:
+        f.write('{"person": {"age": 20}}')
+    sniffed = str(tmpdir.join('app'))
+    with lzma.open(sniffed, 'wt') as f:
+        f.write('[person]\nname = "Sniffed"\n')
+    user = str(tmpdir.join('user.ini.xz'))
+
+    for stream in [False, True]:
+        mgr = ConfigMg(
+            make_spec(), files=[system, sniffed, user],
+            autodetect=True, safe=False, stream=stream
+        )
+        assert mgr.file_compression(system) == 'gzip'
+        assert mgr.file_format(system) == 'json'
+        assert mgr.file_compression(sniffed) == 'xz'
+        assert mgr.file_format(sniffed) == 'ini'
+        assert mgr.get('age') == 20
+        assert mgr.get('name') == 'Sniffed'
+
+    # User file is written compressed
+    mgr.set('age', 40)
+    with lzma.open(user, 'rt') as f:
+        assert 'age = 40' in f.read()
+    assert ConfigMg(make_spec(), files=[user]).get('age') == 40
+
+
+def test_mmap(tmpdir):
+
+    system = tmpdir.join('app.ini')
+    system.write_binary(
+        u'[person]\n; Comment\nname = "Ñandú"\nage = 30\n'.encode('utf-8')
+    )
+    empty = tmpdir.join('empty.ini')
+    empty.write_binary(b'')
+
+    mgr = ConfigMg(
+        make_spec(), files=[str(system), str(empty)],
+        autodetect=True, mmap=True, safe=False
+    )
+    assert mgr.get('name') == u'Ñandú'
+    assert mgr.get('age') == 30
+
+    # Bytes-like objects are imported as buffers too
+    mgr.do_import(bytearray(b'[skills]\nlangs = ["C", "Python"]\n'))
+    assert mgr.get('langs') == ['C', 'Python']
+
+
+def test_categories(tmpdir):
+
+    # Skipped categories are neither parsed nor validated
+    ini = tmpdir.join('app.ini')
+    ini.write(
+        '[skills]\nlangs = ["C"]\nthis is garbage\n'
+        '  [person]\nage = 30\n[skills]\ncolor = bad\n'
+    )
+    json = tmpdir.join('app.json')
+    json.write(
+        '{"skills": {"langs": ["{", "\\\\\\"["], "color": [{}]}, '
+        '"person": {"name": "\\"Jane\\""}}'
+    )
+
+    for mmap in [False, True]:
+        for stream in [False, True]:
+            mgr = ConfigMg(
+                make_spec(), files=[str(ini), str(json)], autodetect=True,
+                safe=False, stream=stream, mmap=mmap, categories=['person']
+            )
+            assert list(mgr._categories) == ['person']
+            assert mgr.get('age') == 30
+            assert mgr.get('name') == 'Jane'
+            assert 'skills' not in mgr.do_export()
+
+    # Keys of skipped categories cannot be read nor set
+    proxy = mgr.get_proxy()
+    assert proxy.age == 30
+    with raises(KeyError) as e:
+        mgr.get('langs')
+    assert 'skills' in str(e.value)
+    with raises(KeyError):
+        proxy.color
+    with raises(KeyError):
+        mgr.set('langs', ['Go'])
+    with raises(KeyError):
+        proxy.langs = ['Go']
+    with raises(KeyError):
+        mgr.append('langs', 'Go')
+
+    # Partial managers don't create nor save files
+    user = tmpdir.join('user.ini')
+    mgr = ConfigMg(
+        make_spec(), files=[str(user)], safe=False, categories=['person']
+    )
+    assert not user.exists()
+    mgr.set('age', 40)
+    assert not user.exists()
+    with raises(Exception):
+        mgr.save()
+
+    with raises(AttributeError):
+        ConfigMg(make_spec(), categories=['unknown'])
+
+    # Filter a single load
+    mgr = ConfigMg(make_spec(), files=[str(ini)], load=False, safe=False)
+    mgr.load(categories=['person'])
+    assert mgr.get('age') == 30
+    assert mgr._skipped == frozenset()
+    with raises(SyntaxError):
+        mgr.load()
+
+
+def test_lazy():
+
+    conf = '[person]\nname = "Lazy"\nage = 200\n[skills]\nlangs = ["C"]\n'
+
+    mgr = ConfigMg(make_spec(), lazy=True, safe=False)
+    mgr.do_import(conf)
+    options = mgr._keys
+    assert options['name']._pending and options['age']._pending
+    assert mgr.get('name') == 'Lazy'
+    assert not options['name']._pending
+
+    # Invalid values are reported on first access, previous value is kept
+    with raises(ValueError):
+        mgr.get('age')
+    assert mgr.get('age') == 18
+
+    # Setting a value discards the pending one
+    mgr.do_import(conf)
+    mgr.set('age', '20')
+    assert mgr.get('age') == 20
+
+    # Validate all pending values at once
+    mgr.do_import(conf)
+    with raises(ValueError):
+        mgr.validate_all()
+    mgr.enable_safe(True)
+    mgr.do_import(conf)
+    assert not mgr.validate_all()
+    assert mgr.get('langs') == ['C']
+    assert mgr.validate_all()
+
+    # Values with listeners are parsed right away when notifying
+    changes = []
+    mgr.enable_notify(True)
+    mgr.register_listener(lambda *args: changes.append(args), 'name')
+    mgr.do_import('[person]\nname = "Eager"\n')
+    assert not options['name']._pending
+    assert changes == [('name', 'Lazy', '"Eager"')]
+
+
+def test_pickle():
+
+    from pickle import dumps, loads
+
+    mgr = ConfigMg(make_spec(), lazy=True, safe=False)
+    mgr.register_listener(lambda *args: None, 'age')
+    mgr.set('name', '"Pickled"')
+    mgr.do_import('[person]\nage = 30\n')
+
+    for protocol in range(2, 5):
+        other = loads(dumps(mgr, protocol))
+        assert other._listeners == {}
+        assert other._keys['age']._pending
+        assert other.get('age') == 30
+        assert other.get('name') == 'Pickled'
+        assert other.get_proxy().color == (0, 0, 0)
+        assert other._keys['age'] is other._spec[1]
+
+        # Validators are restored
+        with raises(ValueError):
+            other.set('age', '200')
+
+
+def test_delta_listeners():
+
+    mgr = ConfigMg(make_spec(), notify=True, safe=False)
+    changes = []
+    deltas = []
+    mgr.register_listener(lambda *args: changes.append(args), 'langs')
+    mgr.register_listener(
+        lambda *args: deltas.append(args), 'langs', delta=True
+    )
+
+    mgr.extend('langs', ['Python', 'C'])
+    mgr.append('langs', 'Go')
+    mgr.remove('langs', 'C')
+    mgr.set('langs', "['Rust']")
+    assert changes[1] == ('langs', ['Python', 'C'], ['Python', 'C', 'Go'])
+    assert deltas == [
+        ('langs', ['Python', 'C'], []),
+        ('langs', ['Go'], []),
+        ('langs', [], ['C']),
+        ('langs', ['Rust'], ['Python', 'Go']),
+    ]
+
+
+def test_external_lists(tmpdir):
+
+    langs = tmpdir.join('langs.txt')
+    langs.write("'Python'\n'C'\n")
+    user = tmpdir.join('user.ini')
+    user.write('[skills]\nlangs = @{}\n'.format(langs))
+
+    mgr = ConfigMg(make_spec(), files=[str(user)], safe=False)
+    option = mgr._keys['langs']
+    assert option._pending
+
+    # Side file is read on first access and not written if unchanged
+    mgr.set('age', 40)
+    assert 'langs = @{}'.format(langs) in user.read()
+    assert option._pending
+
+    # Side file is written when the list changes
+    mgr.append('langs', 'Go')
+    assert langs.read() == "'Python'\n'C'\n'Go'\n"
+    assert mgr.do_export(format='json').count('@') == 1
+
+    other = ConfigMg(make_spec(), files=[str(user)], safe=False)
+    assert other.get('langs') == ['Python', 'C', 'Go']
+
+    # Setting a reference defers reading and validating the side file
+    tmpdir.join('bad.txt').write("'Rust'\n'unterminated\n")
+    mgr.set('langs', '@{}'.format(tmpdir.join('bad.txt')))
+    assert option._pending
+    with raises(Exception):
+        mgr.validate_all()
+    assert mgr.get('langs') == ['Python', 'C', 'Go']
+    assert mgr.do_export(format='json').count(str(langs)) == 1
+
+    # Unless there are listeners to notify with the list
+    notified = []
+    mgr.enable_notify(True)
+    mgr.register_listener(lambda *args: notified.append(args), 'langs')
+    rust = tmpdir.join('rust.txt')
+    rust.write("'Rust'\n")
+    mgr.set('langs', '@{}'.format(rust))
+    assert notified[-1] == ('langs', ['Python', 'C', 'Go'], ['Rust'])
+    with raises(Exception):
+        mgr.set('langs', '@{}'.format(tmpdir.join('bad.txt')))
+    assert mgr.get('langs') == ['Rust']
+
+    # Inline lists stop referencing the side file
+    mgr.set('langs', "['Go', 'C']")
+    mgr.append('langs', 'Rust')
+    assert rust.read() == "'Rust'\n"
+    assert '@' not in user.read()
+
+    # Side files referenced by other files of the stack are never written
+    system = tmpdir.join('system.ini')
+    system.write('[skills]\nlangs = @{}\n'.format(rust))
+    user.remove()
+    mgr = ConfigMg(
+        make_spec(), files=[str(system), str(user)], safe=False
+    )
+    mgr.append('langs', 'Go')
+    assert rust.read() == "'Rust'\n"
+    assert '@' not in user.read()
+    other = ConfigMg(
+        make_spec(), files=[str(system), str(user)], safe=False
+    )
+    assert other.get('langs') == ['Rust', 'Go']
+
+    # Relative references are relative to the file they are imported from
+    conf = tmpdir.mkdir('conf')
+    conf.join('langs.txt').write("'Lua'\n")
+    conf.join('user.ini').write('[skills]\nlangs = @langs.txt\n')
+    with tmpdir.mkdir('elsewhere').as_cwd():
+        mgr = ConfigMg(
+            make_spec(), files=[str(conf.join('user.ini'))], safe=False
+        )
+        assert mgr.get('langs') == ['Lua']
+        mgr.append('langs', 'Go')
+    assert conf.join('langs.txt').read() == "'Lua'\n'Go'\n"
+    assert 'langs = @langs.txt' in conf.join('user.ini').read()
@@ -21,7 +21,7 @@ Test confspec.options module.
 
 from __future__ import absolute_import, division, print_function
 
-from pytest import raises
+from pytest import raises, importorskip
 
 from .options import options
 
@@ -31,13 +31,411 @@ from .options import options
 # -----------------------------------------------------------------------------
 
 def test_ConfigOpt():
-    # FIXME IMPLEMENT
-    pass
+    from confspec.options import ConfigInt
+    from confspec.validation import in_range
+
+    # Keys and categories must be valid identifiers
+    for invalid in ['', '1key', 'class', 'the key', 1]:
+        with raises(ValueError):
+            ConfigInt(key=invalid)
+        with raises(ValueError):
+            ConfigInt(key='key', category=invalid)
+
+    # Defaults are validated on first access when deferred
+    opt = ConfigInt(
+        key='key', default=200, validator=in_range(0, 100),
+        defer_default=True
+    )
+    assert opt._pending
+    with raises(ValueError):
+        opt.value
+    opt.value = '0x10'
+    assert opt.value == 16
+
+    # Values of the wrong type are invalid, however many validators there are
+    from confspec.options import ConfigListInt
+    for validator in [in_range(0, 10), [in_range(0, 10), bool]]:
+        opt = ConfigListInt(key='key', default=[])
+        opt.validator = validator
+        with raises(ValueError):
+            opt.value = '[1]'
+
+    # Lists of validators cannot be changed in place, only replaced
+    opt = ConfigInt(key='key', default=1, validator=[in_range(0, 10)])
+    assert isinstance(opt.validator, tuple)
+    with raises(AttributeError):
+        opt.validator.append(in_range(2, 10))
+    opt.validator = list(opt.validator) + [in_range(2, 10)]
+    with raises(ValueError):
+        opt.value = 1
+
+
+def test_ConfigOpt_cache():
+    from confspec.options import (
+        ConfigInt, ConfigListInt, ConfigSetInt, ConfigFile
+    )
+    from confspec.validation import in_range
+
+    opt = ConfigInt(key='key', default=1, cache_size=2)
+    assert opt.cache_info() == (0, 1, 2, 1)
+    for raw in ['10', '10', '20', '10']:
+        opt.value = raw
+    assert opt.value == 10
+    assert opt.cache_info() == (2, 3, 2, 2)
+
+    # Changing the validator invalidates the cache
+    opt.validator = in_range(0, 5)
+    with raises(ValueError):
+        opt.value = '10'
+    assert opt.value == 10
+    assert opt.cache_info() == (0, 1, 2, 0)
+
+    # Unhashable values are not cached
+    opt = ConfigSetInt(key='key', default=[1], cache_size=2)
+    opt.value = [1, 2]
+    assert opt.value == {1, 2}
+    assert opt.cache_info() == (0, 0, 2, 0)
+    opt.value = '[1, 2]'
+    assert opt.cache_info() == (0, 1, 2, 1)
+
+    # Mutable values are not cached, as they would be shared
+    opt = ConfigListInt(key='key', default=[1], cache_size=4)
+    assert opt.cache_info() is None
+    opt.value = '[1, 2]'
+    opt.value.append(99)
+    opt.value = '[3]'
+    opt.value = '[1, 2]'
+    assert opt.value == [1, 2]
+
+    # Options that depend on the outside world are not cached
+    assert ConfigFile(
+        key='key', default=__file__, cache_size=8
+    ).cache_info() is None
+
+
+def test_ConfigOpt_pickle():
+    from pickle import dumps, loads
+    from confspec.options import (
+        ConfigLine, ConfigFile, ConfigClass, ConfigListColor, ConfigListInt
+    )
+    from confspec.validation import (
+        startswith_igncase, is_one_of, all_validate_to, in_range, non_empty
+    )
+
+    spec = [
+        ConfigLine(
+            key='line', default='Line\nOther', comment='Comment.',
+            validator=[startswith_igncase('l'), non_empty()]
+        ),
+        ConfigFile(key='path', default=__file__),
+        ConfigClass(
+            key='cls', default='int', classes=[int, float],
+            validator=is_one_of([('int', int)])
+        ),
+        ConfigListColor(key='colors', default='[#FF0000]', cache_size=4),
+        ConfigListInt(
+            key='ints', default=[1, 2],
+            validator=all_validate_to([in_range(0, 10), in_range(1, 20)])
+        ),
+    ]
+    for opt in spec:
+        other = loads(dumps(opt))
+        assert type(other) is type(opt)
+        assert other.key == opt.key
+        assert other.comment == opt.comment
+        assert repr(other) == repr(opt)
+        assert repr(other.validator) == repr(opt.validator)
+
+    with raises(ValueError):
+        loads(dumps(spec[4])).value = '[0]'
 
 
 def test_ConfigList():
-    # FIXME IMPLEMENT
-    pass
+    from confspec.options import ConfigListString, ConfigListInt
+
+    opt = ConfigListString(key='key', default=[])
+    opt.value = '''[ "a, b", '[c]', "d\\"e,", 'f(' ]'''
+    assert opt.value == ['a, b', '[c]', 'd"e,', 'f(']
+    opt.value = repr(opt)
+    assert opt.value == ['a, b', '[c]', 'd"e,', 'f(']
+
+    opt = ConfigListInt(key='key', default='[ 1,2 , 0x3 ]')
+    assert opt.value == [1, 2, 3]
+    for invalid in ['[1, 2', '[(1, 2]', '[1, 2)]', '[1, , 2]']:
+        with raises(ValueError):
+            opt.value = invalid
+
+    # Deferring keeps the radix of the elements
+    opt.defer('[0x10]', '/tmp')
+    assert opt.value == [16]
+
+
+def test_ConfigList_mutation():
+    from confspec.options import ConfigListInt
+    from confspec.validation import all_validate_to, non_empty
+
+    calls = []
+
+    def positive(num):
+        calls.append(num)
+        return num > 0
+
+    opt = ConfigListInt(
+        key='key', default=[1, 2],
+        validator=[all_validate_to(positive), non_empty()]
+    )
+    del calls[:]
+
+    value = opt.value
+    assert opt.append(3) == [3]
+    assert opt.extend([4, '0x5']) == [4, 5]
+    assert opt.value == [1, 2, 3, 4, 5]
+    assert value == [1, 2]
+    assert calls == [3, 4, 5]
+
+    with raises(ValueError):
+        opt.append(-1)
+    assert opt.remove(1) == [1]
+    assert opt.value == [2, 3, 4, 5]
+    with raises(ValueError):
+        opt.remove(1)
+
+    opt = ConfigListInt(key='key', default=[1], validator=non_empty())
+    with raises(ValueError):
+        opt.remove(1)
+    assert opt.value == [1]
+
+
+def test_ConfigSet():
+    from confspec.options import ConfigSetInt
+    from confspec.validation import is_superset_of
+
+    opt = ConfigSetInt(
+        key='key', default='[3, 1, 0x3]', validator=is_superset_of([1])
+    )
+    assert opt.value == frozenset([1, 3])
+    assert repr(opt) == '[1, 3]'
+    opt.value = set([2, 1])
+    assert opt.value == frozenset([1, 2])
+
+    assert opt.extend([2, 5]) == frozenset([5])
+    assert opt.remove(2) == frozenset([2])
+    assert opt.value == frozenset([1, 5])
+    for invalid in ['[2, 3]', set([2])]:
+        with raises(ValueError):
+            opt.value = invalid
+    with raises(ValueError):
+        opt.remove(1)
+
+
+def test_ConfigDict():
+    from confspec.options import ConfigDictInt
+    from confspec.validation import has_keys
+
+    opt = ConfigDictInt(
+        key='key', default="{'http': 80, https: 0x1BB, 'a:b, c': 1}",
+        validator=has_keys(['http'])
+    )
+    assert opt.value == {'http': 80, 'https': 443, 'a:b, c': 1}
+    assert repr(opt) == "{'a:b, c': 1, 'http': 80, 'https': 443}"
+    opt.value = repr(opt)
+    assert opt.value['https'] == 443
+    with raises(TypeError):
+        opt.value['http'] = 8080
+    for invalid in ['{http: x}', '{http}', '[1]', {'https': 443}]:
+        with raises(ValueError):
+            opt.value = invalid
+
+    opt = ConfigDictInt(key='key', default={'1': 2}, key_type=int)
+    assert opt.value == {1: 2}
+    assert opt.repr(opt.value) == {'1': 2}
+
+
+def array_roundtrips(float_cls, **others):
+    """
+    Export a manager of an array of floats of the given class and of empty
+    arrays of the other given classes, by key, in all formats, and yield the
+    manager each export is imported into.
+    """
+    from confspec.manager import ConfigMg
+
+    def make_manager(floats):
+        return ConfigMg(
+            [float_cls(key='floats', default=floats)] +
+            [cls(key=key, default=[]) for key, cls in sorted(others.items())]
+        )
+
+    for format in ['ini', 'json', 'binary']:
+        cfmg = make_manager([])
+        cfmg.do_import(
+            make_manager([0.5, 1]).do_export(format=format), format=format
+        )
+        yield cfmg
+
+
+def test_ConfigArray(monkeypatch):
+    from array import array
+    from confspec.options import ConfigArrayInt, ConfigArrayFloat
+    from confspec.validation import all_validate_to, positive
+
+    opt = ConfigArrayInt(
+        key='ints', default='[ 1,2 , 0x3 ]',
+        validator=all_validate_to(positive())
+    )
+    assert opt.value == array('q', [1, 2, 3])
+    opt.value = [4, 5]
+    assert opt.value == array('q', [4, 5])
+    assert repr(opt) == '[4, 5]'
+    for invalid in ['[1, 2', '[1, x]', '[1, -2]', [1, 'x']]:
+        with raises(ValueError):
+            opt.value = invalid
+
+    opt = ConfigArrayInt(key='bytes', default=[], typecode='B', sformat='{:x}')
+    with raises(ValueError):
+        opt.value = '[1, 256]'
+    opt.value = array('B', [10, 255])
+    assert repr(opt) == '[a, ff]'
+
+    opt = ConfigArrayFloat(key='floats', default=[0.5, 1])
+    assert opt.value == array('d', [0.5, 1.0])
+
+    # Decimal lists are converted at once, others one element at a time
+    opt = ConfigArrayInt(key='ints', default=[])
+    with monkeypatch.context() as patch:
+        patch.setattr(ConfigArrayInt, '_parse_elements', None)
+        opt.value = '[1, -2, 30, 0]'
+        assert opt.value == array('q', [1, -2, 30, 0])
+        opt.value = '[1, 0x3, -0o7, 0b1]'
+        assert opt.value == array('q', [1, 3, -7, 1])
+    with raises(ValueError):
+        opt.value = '[1, 010]'
+    opt = ConfigArrayInt(key='ints', default=[], base=10)
+    with raises(ValueError):
+        opt.value = '[1, 0x3]'
+
+    # Arrays are exported and imported as lists
+    for cfmg in array_roundtrips(ConfigArrayFloat, ints=ConfigArrayInt):
+        assert cfmg.get('floats') == array('d', [0.5, 1.0])
+
+
+def test_ConfigNDArray(monkeypatch):
+    numpy = importorskip('numpy')
+    from confspec.options import (
+        ConfigNDArrayInt, ConfigNDArrayFloat, ConfigNDArrayColor
+    )
+    from confspec.validation import all_validate_to, in_range
+
+    opt = ConfigNDArrayInt(
+        key='ints', default='[ 1,2 , 0x3 ]',
+        validator=all_validate_to(in_range(0, 10))
+    )
+    assert opt.value.tolist() == [1, 2, 3]
+    opt.value = numpy.arange(10)
+    assert repr(opt) == '[0, 1, 2, 3, 4, 5, 6, 7, 8, 9]'
+    for invalid in ['[1, 2', '[1, x]', '[1, 11]', [1, 2 ** 70]]:
+        with raises(ValueError):
+            opt.value = invalid
+
+    # Decimal lists are converted at once, others one element at a time
+    opt = ConfigNDArrayInt(key='ints', default=[])
+    with monkeypatch.context() as patch:
+        patch.setattr(ConfigNDArrayInt, '_parse_elements', None)
+        opt.value = '[1, -2, 30, 0]'
+        assert opt.value.tolist() == [1, -2, 30, 0]
+        opt.value = '[1, 0x3, -0o7, 0b1]'
+        assert opt.value.tolist() == [1, 3, -7, 1]
+    with raises(ValueError):
+        opt.value = '[1, 010]'
+
+    opt = ConfigNDArrayInt(key='bytes', default=[], dtype='uint8')
+    opt.value = '[1, 255]'
+    assert opt.value.dtype == numpy.uint8
+    with raises(ValueError):
+        opt.value = '[1, 256]'
+
+    opt = ConfigNDArrayColor(key='colors', default='[#FF0000, 00ff10]')
+    assert opt.value.tolist() == [[255, 0, 0], [0, 255, 16]]
+    assert repr(opt) == '[#FF0000, #00FF10]'
+    for invalid in ['[#FF00]', '[#FF000G]', [(1, 2)], [(0, 0, 256)]]:
+        with raises(ValueError):
+            opt.value = invalid
+
+    # Arrays are exported and imported as lists
+    for cfmg in array_roundtrips(
+            ConfigNDArrayFloat, ints=ConfigNDArrayInt,
+            colors=ConfigNDArrayColor):
+        assert cfmg.get('floats').tolist() == [0.5, 1.0]
+        assert cfmg.get('colors').shape == (0, 3)
+
+
+def test_ConfigNDArrayFile(tmpdir):
+    numpy = importorskip('numpy')
+    from pickle import dumps, loads
+    from confspec.manager import ConfigMg
+    from confspec.options import ConfigNDArrayFile
+
+    table = tmpdir.join('table.npy')
+    numpy.save(str(table), numpy.zeros((4, 3), dtype='float32'))
+    raw = tmpdir.join('table.bin')
+    numpy.arange(10, dtype='int16').tofile(str(raw))
+
+    opt = ConfigNDArrayFile(
+        key='table', default=str(table), dtype='float32', shape=(None, 3)
+    )
+    assert opt.value.shape == (4, 3)
+    assert not opt.value.flags.writeable
+    assert repr(opt) == str(table)
+
+    # Raw files are mapped with the given dtype and shape
+    assert ConfigNDArrayFile(
+        key='raw', default=str(raw), dtype='int16', shape=(None, 2)
+    ).value.tolist() == [[0, 1], [2, 3], [4, 5], [6, 7], [8, 9]]
+    for kwargs in [{}, {'dtype': 'int16', 'shape': (3, )},
+                   {'dtype': 'int16', 'shape': (None, 3)}]:
+        with raises(ValueError):
+            ConfigNDArrayFile(key='raw', default=str(raw), **kwargs)
+
+    # Changed files are mapped again on reload only, invalid ones are not
+    assert not opt.reload()
+    replacement = tmpdir.join('replacement.npy')
+    numpy.save(str(replacement), numpy.ones((2, 3), dtype='float32'))
+    replacement.rename(table)
+    assert opt.value.shape == (4, 3)
+    assert opt.reload()
+    assert opt.value.shape == (2, 3)
+
+    numpy.save(str(replacement), numpy.ones((2, 4), dtype='float32'))
+    replacement.rename(table)
+    with raises(ValueError):
+        opt.reload()
+    assert opt.value.shape == (2, 3)
+    with raises(ValueError):
+        opt.value = str(table)
+
+    # The manager notifies the listeners of the arrays reloaded
+    numpy.save(str(table), numpy.ones((2, 3), dtype='float32'))
+    cfmg = ConfigMg([ConfigNDArrayFile(
+        key='table', default=str(table), dtype='float32', shape=(None, 3)
+    )], notify=True)
+    notified = []
+    cfmg.register_listener(
+        lambda key, old, new: notified.append((old.shape, new.shape)), 'table'
+    )
+    assert cfmg.reload() and notified == []
+    numpy.save(str(replacement), numpy.ones((6, 3), dtype='float32'))
+    replacement.rename(table)
+    assert cfmg.reload()
+    assert notified == [((2, 3), (6, 3))]
+    numpy.save(str(replacement), numpy.ones((6, 4), dtype='float32'))
+    replacement.rename(table)
+    assert not cfmg.reload()
+    assert cfmg.get('table').shape == (6, 3)
+
+    # Only the path is pickled
+    numpy.save(str(replacement), numpy.ones((5, 3), dtype='float32'))
+    replacement.rename(table)
+    assert len(dumps(opt)) < 1000
+    assert loads(dumps(opt)).value.shape == (5, 3)
 
 
 # -----------------------------------------------------------------------------
@@ -45,8 +443,24 @@ def test_ConfigList():
 # -----------------------------------------------------------------------------
 
 def test_ConfigString():
-    # FIXME IMPLEMENT
-    pass
+    from confspec.options import ConfigString
+
+    opt = ConfigString(key='string', default="'simple'")
+    assert opt.value == 'simple'
+
+    # Values not handled by the fast path
+    for value, expected in [
+            ('"it\'s"', "it's"),
+            ("'tab\\tescaped'", 'tab\tescaped'),
+            ("u'prefixed'", 'prefixed'),
+            ("'''triple'''", 'triple'),
+            ("'implicit' ' concatenation'", 'implicit concatenation')]:
+        opt.value = value
+        assert opt.value == expected
+
+    for invalid in ["'unterminated", "'line\nbreak'", "'a' + 'b'"]:
+        with raises(Exception):
+            opt.value = invalid
 
 
 def test_ConfigText():
@@ -158,33 +572,164 @@ def test_ConfigFloat():
 
 
 def test_ConfigDateTime():
-    # FIXME IMPLEMENT
-    pass
+    from datetime import datetime
+    from confspec.options import ConfigDateTime
+
+    opt = ConfigDateTime(key='datetime', default='2014-06-30T23:59:58')
+    assert opt.value == datetime(2014, 6, 30, 23, 59, 58)
+    assert repr(opt) == '2014-06-30T23:59:58'
+
+    # Values outside the fast path are still parsed by strptime
+    opt.value = '2014-6-3T1:2:3'
+    assert opt.value == datetime(2014, 6, 3, 1, 2, 3)
+    for invalid in ['2014-06-31T00:00:00', '2014-06-30 00:00:00',
+                    '2014-06-30T00:00:00.5', '2014-06-30']:
+        with raises(ValueError):
+            opt.value = invalid
+
+    opt = ConfigDateTime(
+        key='datetime', default='30/06/2014 23:59', tformat='%d/%m/%Y %H:%M'
+    )
+    assert opt.value == datetime(2014, 6, 30, 23, 59)
+    with raises(ValueError):
+        opt.value = '2014-06-30T23:59:58'
 
 
 def test_ConfigDate():
-    # FIXME IMPLEMENT
-    pass
+    from datetime import date
+    from confspec.options import ConfigDate
+
+    opt = ConfigDate(key='date', default='2014-06-30')
+    assert opt.value == date(2014, 6, 30)
+    opt.value = '2014-6-3'
+    assert opt.value == date(2014, 6, 3)
+    for invalid in ['2014-02-30', '20140630', '2014-06-30T00:00:00']:
+        with raises(ValueError):
+            opt.value = invalid
 
 
 def test_ConfigTime():
-    # FIXME IMPLEMENT
-    pass
+    from datetime import time
+    from confspec.options import ConfigTime
+
+    opt = ConfigTime(key='time', default='23:59:58')
+    assert opt.value == time(23, 59, 58)
+    opt.value = '1:2:3'
+    assert opt.value == time(1, 2, 3)
+    for invalid in ['24:00:00', '23:59', '23:59:58.5', '235958']:
+        with raises(ValueError):
+            opt.value = invalid
 
 
 def test_ConfigMap():
-    # FIXME IMPLEMENT
-    pass
+    from confspec.options import ConfigMap
+    from confspec.tables import DictTable
+
+    opt = ConfigMap(key='map', default='a', table={'a': 1, 'b': 2})
+    assert opt.value == 1
+    opt.value = 'b'
+    assert opt.value == 2
+    assert repr(opt) == 'b'
+    with raises(ValueError):
+        opt.value = 'c'
+
+    # Values can only be coerced from a table with a reverse index
+    with raises(ValueError):
+        opt.coerce(2)
+    opt = ConfigMap(key='map', default='a', table=DictTable({'a': 1, 'b': 2}))
+    assert opt.coerce('b') == ('b', 2)
+    assert opt.coerce(2) == ('b', 2)
+    with raises(ValueError):
+        opt.coerce(3)
 
 
 def test_ConfigClass():
-    # FIXME IMPLEMENT
-    pass
+    from ast import literal_eval
+    from confspec.manager import ConfigMg
+    from confspec.options import ConfigClass, ConfigListClass
+
+    class First(object):
+        pass
+
+    class Second(object):
+        pass
+
+    cfgmg = ConfigMg([
+        ConfigClass(key='cls', default='First', classes=[First, Second]),
+        ConfigListClass(
+            key='classes', default='[]', classes=[First, Second]
+        ),
+    ])
+    assert cfgmg.get('cls') is First
+    cfgmg.import_mapping({
+        'general': {'cls': Second, 'classes': [Second, 'First']},
+    })
+    assert cfgmg.get('cls') is Second
+    assert cfgmg.get('classes') == [('Second', Second), ('First', First)]
+    assert literal_eval(cfgmg.do_export('dict')) == {
+        'general': {'cls': 'Second', 'classes': ['Second', 'First']},
+    }
+
+
+def test_ConfigPath(tmpdir, monkeypatch):
+    from time import sleep
+    from os.path import isdir
+    from confspec.utils import StatCache, stat_cache
+    from confspec.utils import cached_exists, cached_isfile, cached_isdir
+    from confspec.options import ConfigPath, ConfigFile, ConfigDir
+
+    tmpdir.join('file').write('')
+    path = str(tmpdir)
+    stat_cache.clear()
+
+    opt = ConfigFile(key='file', default=path + '/file')
+    assert opt.value == path + '/file'
+    ConfigDir(key='dir', default=path)
+    with raises(ValueError):
+        ConfigFile(key='file', default=path)
+    with raises(ValueError):
+        ConfigDir(key='dir', default=path + '/file')
+
+    # Existing paths are cached when opted in
+    opt = ConfigFile(
+        key='file', default=path + '/file', checker=cached_isfile
+    )
+    tmpdir.join('file').remove()
+    opt.value = path + '/file'
+    stat_cache.clear()
+    with raises(ValueError):
+        opt.value = path + '/file'
+
+    # Paths not found are not cached, so they can be created right away
+    for checker in [isdir, cached_isdir]:
+        created = tmpdir.join('created_{}'.format(checker.__name__))
+        opt = ConfigDir(key='dir', default=path, checker=checker)
+        with raises(ValueError):
+            opt.value = str(created)
+        created.mkdir()
+        opt.value = str(created)
+
+    # A hung check becomes a parsing error
+    monkeypatch.setattr(stat_cache, 'timeout', 0.05)
+    monkeypatch.setattr(stat_cache, '_stat', lambda path: sleep(1))
+    with raises(ValueError):
+        ConfigPath(
+            key='path', default=path + '/hung', checker=cached_exists
+        )
+    stat_cache.clear()
 
+    # Without timeout stats run inline, and a hung path is never queued twice
+    cache = StatCache()
+    assert cache.stat(path) is not None
+    assert cache._threads == 0
 
-def test_ConfigPath():
-    # FIXME IMPLEMENT
-    pass
+    cache = StatCache(timeout=0.05)
+    cache._stat = lambda path: sleep(0.5)
+    for _ in range(3):
+        with raises(IOError):
+            cache.stat(path + '/hung')
+        cache.clear()
+    assert cache._threads == 1
 
 
 def test_ConfigFile():
@@ -281,9 +826,27 @@ def test_ConfigListClass():
     pass
 
 
-def test_ConfigListPath():
-    # FIXME IMPLEMENT
-    pass
+def test_ConfigListPath(tmpdir):
+    from confspec.utils import stat_cache, cached_isfile
+    from confspec.options import ConfigListFile
+
+    paths = [str(tmpdir.join(str(i))) for i in range(20)]
+    for path in paths:
+        with open(path, 'w'):
+            pass
+    stat_cache.clear()
+
+    # All elements are checked in a single concurrent batch
+    opt = ConfigListFile(key='files', default='[]', checker=cached_isfile)
+    opt.value = '[{}]'.format(', '.join(paths))
+    assert opt.value == paths
+    assert stat_cache._entries.info().currsize == len(paths)
+
+    with raises(ValueError):
+        opt.value = '[{}, {}]'.format(paths[0], tmpdir.join('missing'))
+    with raises(ValueError):
+        opt.value = '[{}]'.format(tmpdir)
+    stat_cache.clear()
 
 
 def test_ConfigListFile():
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2014 Carlos Jenkins <carlos@jenkins.co.cr>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Test confspec.spec module.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+from pytest import raises
+
+from confspec.spec import Spec, SpecMeta, get_manager
+from confspec.manager import ConfigMg
+from confspec.options import ConfigInt, ConfigString, ConfigListString
+from confspec.validation import in_range
+
+
+class AppConf(Spec):
+    port = ConfigInt(
+        default=8080, validator=in_range(1, 65535), category='net'
+    )
+    host = ConfigString(default='"localhost"', category='net')
+
+
+class PluginConf(AppConf):
+    port = ConfigInt(default=9090, category='net')
+    plugins = ConfigListString(default=[], category='plugins')
+
+
+def test_Spec(tmpdir):
+
+    # Compiled specification
+    assert [opt.key for opt in AppConf._spec] == ['port', 'host']
+    assert [opt.key for opt in PluginConf._spec] == ['port', 'host', 'plugins']
+    assert AppConf.port is AppConf._spec[0]
+    assert PluginConf.port.value == 9090
+
+    # Instances have their own options and configuration manager
+    user = tmpdir.join('app.ini')
+    conf = AppConf(files=[str(user)], safe=False)
+    other = AppConf()
+    assert not hasattr(conf, '__dict__')
+    assert conf.port == 8080
+
+    conf.port = '443'
+    assert conf.port == 443
+    assert other.port == 8080
+    assert AppConf.port.value == 8080
+    assert 'port = 443' in user.read()
+    assert get_manager(conf).get('port') == 443
+
+    with raises(ValueError):
+        conf.port = '0'
+    with raises(AttributeError):
+        conf.unknown = 1
+    with raises(TypeError):
+        del conf.port
+
+    # Keys must match the attribute names
+    with raises(AttributeError):
+        class BadConf(Spec):
+            port = ConfigInt(key='other', default=1)
+
+    # Options cannot shadow the slots nor other attributes of Spec
+    for name in ['_cfmg', '_options', '_spec', '__init__', '__repr__']:
+        with raises(AttributeError):
+            SpecMeta(str('BadConf'), (Spec, ), {name: ConfigInt(default=1)})
+
+    # Options without key cannot be managed
+    with raises(AttributeError):
+        ConfigMg([ConfigInt(default=1)])
+
+
+def test_Spec_options(tmpdir):
+
+    class CachedConf(Spec):
+        port = ConfigInt(default=8080, cache_size=4, category='net')
+
+    # Each instance has its own cache
+    conf = CachedConf()
+    other = CachedConf()
+    conf.port = '443'
+    assert conf._options[0].cache_info().currsize == 1
+    assert other._options[0].cache_info().currsize == 0
+
+    # Pending values are resolved and reported by the manager
+    user = tmpdir.join('app.ini')
+    user.write('[net]\nport = 0\n')
+    conf = AppConf(files=[str(user)], lazy=True)
+    assert conf.port == 8080
+    conf = AppConf(files=[str(user)], lazy=True, safe=False)
+    with raises(ValueError):
+        conf.port
+    user.write('[net]\nport = 80\n')
+    conf = AppConf(files=[str(user)], lazy=True)
+    assert conf._options[0]._pending
+    assert conf.port == 80
+    assert not conf._options[0]._pending
+
+    # And so are the keys of the categories not handled
+    conf = PluginConf(categories=['plugins'])
+    assert conf.plugins == []
+    with raises(KeyError):
+        conf.port
+
+
+def test_Spec_pickle():
+
+    from pickle import dumps, loads
+
+    conf = PluginConf()
+    conf.plugins = '["spam", "eggs"]'
+    other = loads(dumps(conf))
+    assert other.plugins == ['spam', 'eggs']
+    assert other._options[0] is get_manager(other)._keys['port']
+    other.port = '10'
+    assert conf.port == 9090
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2014 Carlos Jenkins <carlos@jenkins.co.cr>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Test confspec.tables module.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import sqlite3
+from pickle import dumps, loads
+
+from pytest import raises
+
+
+def test_SortedFileTable(tmpdir):
+    from confspec.tables import SortedFileTable
+
+    path = tmpdir.join('table.tsv')
+    path.write('\n'.join(
+        '{:04d}\tvalue{}'.format(i, i) for i in range(1000)
+    ) + '\n')
+    table = SortedFileTable(str(path), cache_size=8)
+
+    assert table['0000'] == 'value0'
+    assert table['0500'] == 'value500'
+    assert table['0999'] == 'value999'
+    for missing in ['', '-1', '0500x', '1000']:
+        assert missing not in table
+        with raises(KeyError):
+            table[missing]
+    assert len(table) == 1000
+    assert list(table)[:2] == ['0000', '0001']
+    assert table.key_of('value42') == '0042'
+    with raises(KeyError):
+        table.key_of('value1000')
+
+    # Lookups are bounded by the cache
+    for i in range(100):
+        table['{:04d}'.format(i)]
+    assert table.cache_info().currsize == 8
+
+    # Changes are seen after clearing the cache
+    path.write('a\t1\nb\t2\n')
+    table.clear_cache()
+    assert table['b'] == '2'
+    assert len(table) == 2
+
+    table = loads(dumps(table))
+    assert table['a'] == '1'
+
+    # Empty table
+    path.write('')
+    table.clear_cache()
+    assert 'a' not in table
+    assert len(table) == 0
+
+
+def test_SQLiteTable(tmpdir):
+    from confspec.tables import SQLiteTable
+
+    path = str(tmpdir.join('table.db'))
+    with raises(ValueError):
+        SQLiteTable(path, table='mapping; DROP TABLE mapping')
+
+    table = SQLiteTable(path, table='colors')
+    with raises(IOError):
+        table['red']
+
+    connection = sqlite3.connect(path)
+    connection.execute(
+        'CREATE TABLE colors (key TEXT PRIMARY KEY, value TEXT UNIQUE)'
+    )
+    connection.executemany(
+        'INSERT INTO colors VALUES (?, ?)',
+        [('red', '#ff0000'), ('green', '#00ff00'), ('blue', '#0000ff')]
+    )
+    connection.commit()
+    connection.close()
+
+    assert table['red'] == '#ff0000'
+    assert 'yellow' not in table
+    assert len(table) == 3
+    assert sorted(table) == ['blue', 'green', 'red']
+    assert table.key_of('#0000ff') == 'blue'
+    with raises(KeyError):
+        table.key_of('#ffff00')
+
+    table['red']
+    assert table.cache_info().hits == 1
+
+    table = loads(dumps(table))
+    assert table['green'] == '#00ff00'